@@ -0,0 +1,426 @@
+import logging
+import operator
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Tuple
+from openpyxl import load_workbook
+from supplier_data_standardization.utils import iter_excel_chunks, validate_quantity_column, create_dimension_column, \
+    drop_repeated_headers
+from supplier_data_standardization.units import convert_weight_to_kg
+
+# Comparison operators that adapter filters may use, as (column, operator, value) tuples
+FILTER_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def normalize_column_name(name) -> str:
+    """
+    Normalizes a column name so headers match regardless of case and stray whitespace.
+
+    Parameters:
+    name: The column name as it appears in the workbook.
+
+    Returns:
+    str: The stripped, lower-cased column name.
+    """
+    return str(name).strip().lower()
+
+
+@dataclass(frozen=True)
+class SourceAdapter:
+    """
+    Declarative description of how a supplier workbook maps onto the standardized columns.
+
+    Attributes:
+    name (str): The registry key of the adapter.
+    file_name (str): The workbook in the data directory.
+    columns (Dict[str, str]): Mapping of workbook header to standardized column. Headers are matched
+    ignoring case and surrounding whitespace, and only these columns are parsed.
+    output_columns (List[str]): The standardized columns to return, in order.
+    sheet_names (Optional[List[str]]): The sheets to read. Defaults to the first sheet.
+    all_sheets (bool): Whether to discover and read every sheet that shares the layout instead of `sheet_names`.
+    sheet_column (Optional[str]): If set, each row is tagged with its sheet of origin in this column.
+    header_row (int): The row (0-based) holding the column headers.
+    dtype (Optional[dict]): Column dtypes passed to the reader, keyed by workbook header.
+    repeated_header_column (Optional[str]): The standardized column whose value repeats its header on
+    header rows repeated inside the sheet. Those rows and the row before them are removed.
+    unit_column (Optional[str]): The standardized column holding the weight unit. If set, `weight` is
+    converted to kilograms and rows with unknown units are dropped.
+    dimension_columns (Optional[Tuple[str, str]]): The standardized thickness and width columns
+    combined into DIMENSION.
+    filters (List[Tuple[str, str, object]]): Row filters as (column, operator, value) tuples.
+    dropna (bool): Whether to drop rows with missing values in the output columns.
+    validate_quantity (bool): Whether to validate the quantity column.
+    version (int): The version of the adapter. Bump it whenever the adapter changes, so frames cached
+    with the previous version are rebuilt.
+    """
+    name: str
+    file_name: str
+    columns: Dict[str, str]
+    output_columns: List[str]
+    sheet_names: Optional[List[str]] = None
+    all_sheets: bool = False
+    sheet_column: Optional[str] = None
+    header_row: int = 0
+    dtype: Optional[dict] = None
+    repeated_header_column: Optional[str] = None
+    unit_column: Optional[str] = None
+    dimension_columns: Optional[Tuple[str, str]] = None
+    filters: List[Tuple[str, str, object]] = field(default_factory=list)
+    dropna: bool = False
+    validate_quantity: bool = False
+    version: int = 1
+
+
+class TransformPlan:
+    """
+    A source adapter compiled into reader arguments and a single transform over the parsed rows.
+    """
+
+    def __init__(self, adapter: SourceAdapter):
+        for column, op, _ in adapter.filters:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Unknown filter operator '{op}' on column '{column}' in adapter {adapter.name}")
+
+        self.adapter = adapter
+        self.renames = {normalize_column_name(source): target for source, target in adapter.columns.items()}
+        self.sheet_names = adapter.sheet_names or [0]
+
+    def usecols(self, name) -> bool:
+        """
+        Tells the reader whether to parse a column, so unmapped columns are never parsed.
+
+        Parameters:
+        name: The column header as it appears in the workbook.
+
+        Returns:
+        bool: Whether the column is mapped by the adapter.
+        """
+        return normalize_column_name(name) in self.renames
+
+    def read(self, file_path: str, sheet_name=0, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Reads the mapped columns of one sheet of the workbook.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+        sheet_name: The name (or position 0 for the first sheet) of the sheet to read.
+        chunk_size (Optional[int]): If set, the sheet is streamed in chunks of this many rows.
+
+        Returns:
+        Iterator[pd.DataFrame]: The raw frame (or chunks) with its workbook headers.
+        """
+        if chunk_size:
+            yield from iter_excel_chunks(file_path, sheet_name=sheet_name or None, chunk_size=chunk_size,
+                                         dtype=self.adapter.dtype, skiprows=self.adapter.header_row,
+                                         usecols=self.usecols)
+        else:
+            yield pd.read_excel(file_path, sheet_name=sheet_name, header=self.adapter.header_row,
+                                usecols=self.usecols, dtype=self.adapter.dtype)
+
+    def rename(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Renames the workbook headers of a raw frame to the standardized columns.
+
+        Parameters:
+        df (pd.DataFrame): The raw frame as read by `read`.
+
+        Returns:
+        pd.DataFrame: The renamed frame.
+        """
+        return df.rename(columns=lambda name: self.renames[normalize_column_name(name)])
+
+    def transform(self, df: pd.DataFrame, next_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Applies the adapter to a raw frame (or chunk).
+
+        Parameters:
+        df (pd.DataFrame): The raw frame as read by `read`.
+        next_df (Optional[pd.DataFrame]): The next raw chunk of the same sheet, if any. A repeated header
+        opening it also removes the last row of this chunk.
+
+        Returns:
+        pd.DataFrame: The standardized rows.
+        """
+        adapter = self.adapter
+        df = self.rename(df)
+
+        if adapter.repeated_header_column:
+            # Remove the repeated headers and the row before them in one pass
+            column = adapter.repeated_header_column
+            header = next(source for source, target in adapter.columns.items() if target == column)
+            next_df = self.rename(next_df.iloc[:1]) if next_df is not None else None
+            df = drop_repeated_headers(df, column, header=header, next_df=next_df).dropna(how='all')
+
+        if adapter.unit_column:
+            # Convert the whole weight column to kilograms and drop the rows whose unit is unknown
+            df = df.copy()
+            df['weight'], unknown_units = convert_weight_to_kg(df, weight_col='weight', unit_col=adapter.unit_column)
+            df = df[~unknown_units]
+
+        if adapter.dimension_columns:
+            thickness_col, width_col = adapter.dimension_columns
+            df = create_dimension_column(df.copy(), thickness_col=thickness_col, width_col=width_col)
+
+        for column, op, value in adapter.filters:
+            df = df[FILTER_OPERATORS[op](df[column], value)]
+
+        df = df[adapter.output_columns]
+
+        if adapter.dropna:
+            df = df.dropna()
+
+        if adapter.validate_quantity:
+            df = validate_quantity_column(df)
+
+        return df
+
+    def discover_sheets(self, file_path: str) -> List[str]:
+        """
+        Finds the sheets of the workbook that share the adapter's layout, i.e. whose header row
+        holds every mapped column.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+
+        Returns:
+        List[str]: The names of the matching sheets, in workbook order.
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet_names = []
+            for worksheet in workbook.worksheets:
+                row_number = self.adapter.header_row + 1
+                header_row = next(worksheet.iter_rows(min_row=row_number, max_row=row_number, values_only=True), ())
+                headers = {normalize_column_name(name) for name in header_row if name is not None}
+                if set(self.renames) <= headers:
+                    sheet_names.append(worksheet.title)
+                else:
+                    logging.info(f"Sheet '{worksheet.title}' of {file_path} does not match adapter "
+                                 f"{self.adapter.name}, skipping it.")
+            return sheet_names
+        finally:
+            workbook.close()
+
+    def iter_sheet(self, file_path: str, sheet_name=0, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Reads one sheet of the workbook and applies the adapter to it, frame by frame (or chunk by chunk).
+        With a chunk size, at most two raw chunks of the sheet are held in memory at a time.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+        sheet_name: The name (or position 0 for the first sheet) of the sheet to read.
+        chunk_size (Optional[int]): If set, the sheet is streamed in chunks of this many rows.
+
+        Returns:
+        Iterator[pd.DataFrame]: The standardized rows of the sheet, chunk by chunk.
+        """
+        # Chunks are transformed one behind the reader, so each can see the first row of the next
+        previous = None
+        for df in self.read(file_path, sheet_name, chunk_size):
+            if previous is not None:
+                yield self.tag_sheet(self.transform(previous, df), sheet_name)
+            previous = df
+        if previous is not None:
+            yield self.tag_sheet(self.transform(previous), sheet_name)
+
+    def tag_sheet(self, df: pd.DataFrame, sheet_name) -> pd.DataFrame:
+        """
+        Tags the rows of a sheet with the sheet's name, if the adapter has a sheet column.
+
+        Parameters:
+        df (pd.DataFrame): The standardized rows.
+        sheet_name: The name of the sheet they come from.
+
+        Returns:
+        pd.DataFrame: The tagged rows.
+        """
+        if self.adapter.sheet_column:
+            df = df.assign(**{self.adapter.sheet_column: sheet_name})
+        return df
+
+    def empty_frame(self) -> pd.DataFrame:
+        """
+        Builds a frame with the adapter's output columns and no rows.
+
+        Returns:
+        pd.DataFrame: The empty frame.
+        """
+        columns = self.adapter.output_columns + ([self.adapter.sheet_column] if self.adapter.sheet_column else [])
+        return pd.DataFrame(columns=columns)
+
+    def run_sheet(self, file_path: str, sheet_name=0, chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """
+        Reads one sheet of the workbook and applies the adapter to it. The standardized rows of the
+        whole sheet are returned as one frame; use `iter_sheet` to keep memory bounded.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+        sheet_name: The name (or position 0 for the first sheet) of the sheet to read.
+        chunk_size (Optional[int]): If set, the sheet is streamed in chunks of this many rows.
+
+        Returns:
+        pd.DataFrame: The standardized rows of the sheet.
+        """
+        frames = list(self.iter_sheet(file_path, sheet_name, chunk_size))
+        return pd.concat(frames) if frames else self.tag_sheet(self.empty_frame(), sheet_name)
+
+    def sheets(self, file_path: str) -> list:
+        """
+        Lists the sheets of the workbook the adapter reads.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+
+        Returns:
+        list: The sheet names (or position 0 for the first sheet).
+        """
+        return self.discover_sheets(file_path) if self.adapter.all_sheets else self.sheet_names
+
+    def iter_run(self, file_path: str, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Reads the workbook and applies the adapter to each of its sheets in turn, chunk by chunk.
+        With a chunk size, memory stays bounded by the chunk size whatever the size of the workbook.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+        chunk_size (Optional[int]): If set, each sheet is streamed in chunks of this many rows.
+
+        Returns:
+        Iterator[pd.DataFrame]: The standardized rows of all sheets, in sheet order, chunk by chunk.
+        """
+        for sheet_name in self.sheets(file_path):
+            yield from self.iter_sheet(file_path, sheet_name, chunk_size)
+
+    def run(self, file_path: str, chunk_size: Optional[int] = None, workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Reads the workbook and applies the adapter to each of its sheets. The standardized rows of
+        the whole workbook are returned as one frame, so memory grows with the workbook even when it
+        is read in chunks; use `iter_run` to keep it bounded.
+
+        Parameters:
+        file_path (str): The path to the workbook.
+        chunk_size (Optional[int]): If set, each sheet is streamed in chunks of this many rows.
+        workers (Optional[int]): If greater than 1, sheets are processed in parallel by up to this many
+        worker processes.
+
+        Returns:
+        pd.DataFrame: The standardized rows of all sheets, in sheet order.
+        """
+        sheet_names = self.sheets(file_path)
+
+        if workers is None or workers <= 1 or len(sheet_names) <= 1:
+            frames = [self.run_sheet(file_path, sheet_name, chunk_size) for sheet_name in sheet_names]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(sheet_names))) as executor:
+                frames = list(executor.map(self.run_sheet, repeat(file_path), sheet_names, repeat(chunk_size)))
+
+        if not frames:
+            return self.empty_frame()
+        return pd.concat(frames, ignore_index=True)
+
+
+def compile_adapter(adapter: SourceAdapter) -> TransformPlan:
+    """
+    Compiles a source adapter into a transform plan.
+
+    Parameters:
+    adapter (SourceAdapter): The adapter to compile.
+
+    Returns:
+    TransformPlan: The compiled plan.
+    """
+    return TransformPlan(adapter)
+
+
+# Registry of the known supplier adapters, keyed by adapter name
+ADAPTERS: Dict[str, SourceAdapter] = {}
+
+
+def register_adapter(adapter: SourceAdapter) -> SourceAdapter:
+    """
+    Adds an adapter to the registry, replacing any adapter of the same name.
+
+    Parameters:
+    adapter (SourceAdapter): The adapter to register.
+
+    Returns:
+    SourceAdapter: The registered adapter.
+    """
+    compile_adapter(adapter)  # Fail early on an invalid adapter
+    ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+def get_adapter(name: str) -> SourceAdapter:
+    """
+    Looks up a registered adapter.
+
+    Parameters:
+    name (str): The name of the adapter.
+
+    Returns:
+    SourceAdapter: The registered adapter.
+    """
+    if name not in ADAPTERS:
+        raise KeyError(f"No adapter registered under '{name}'. Known adapters: {sorted(ADAPTERS)}")
+    return ADAPTERS[name]
+
+
+register_adapter(SourceAdapter(
+    name='source1',
+    file_name='source1.xlsx',
+    columns={
+        'Quality/Choice': 'MATERIAL_GRADE',
+        'Grade': 'MATERIAL_NAME',
+        'Finish': 'COATING_TYPE',
+        'Gross weight (kg)': 'weight',
+        'Thickness (mm)': 'Thickness',
+        'Width (mm)': 'Width',
+    },
+    # Pin the dimension dtypes so every chunk formats DIMENSION the same way
+    dtype={'Thickness (mm)': 'float64', 'Width (mm)': 'float64'},
+    dimension_columns=('Thickness', 'Width'),
+    output_columns=['MATERIAL_GRADE', 'MATERIAL_NAME', 'COATING_TYPE', 'DIMENSION', 'weight'],
+    dropna=True,
+))
+
+register_adapter(SourceAdapter(
+    name='source2',
+    file_name='source2.xlsx',
+    all_sheets=True,
+    sheet_column='sheet',
+    header_row=1,
+    columns={
+        'Material': 'material',
+        'Article ID': 'article id',
+        'Weight': 'weight',
+        'Quantity': 'quantity',
+    },
+    repeated_header_column='article id',
+    output_columns=['material', 'article id', 'weight', 'quantity'],
+    validate_quantity=True,
+))
+
+register_adapter(SourceAdapter(
+    name='source3',
+    file_name='source3.xlsx',
+    columns={
+        'Numéro de': 'quantity',
+        'Article': 'article id',
+        'Matériel Desc#': 'material',
+        'Unité': 'Unit',
+        'Libre': 'weight',
+    },
+    unit_column='Unit',
+    filters=[('weight', '>', 0)],
+    output_columns=['material', 'weight', 'article id', 'quantity'],
+))
@@ -0,0 +1,180 @@
+import re
+import sys
+import time
+import logging
+import argparse
+import spacy
+import pandas as pd
+from spacy.language import Language
+from spacy.matcher import Matcher
+from typing import Callable, Dict, List, Optional
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.ner_model import preprocess_dimensions, preprocess_dimensions_series, MERGE_PATTERNS
+
+
+def legacy_preprocess_dimensions(text: str) -> str:
+    """
+    The original regex chain of `preprocess_dimensions`, kept as the reference its output is checked
+    against and the baseline of the benchmark.
+
+    Parameters:
+    text (str): The text to preprocess.
+
+    Returns:
+    str: The preprocessed text.
+    """
+    text = re.sub(r'(\d+,\d+)\s*\*\s*(\d+)', r'\1*\2', text)
+    text = re.sub(r'(\d+)\s*\*\s*(\d+)', r'\1*\2', text)
+    text = re.sub(r'(\d+,\d+)\s*x\s*(\d+,\d+)\s*x\s*(\d+,\d+)\s*(mm|cm|m|kg|g)?', r'\1x\2x\3\4', text)
+    text = re.sub(r'(\d+,\d+|\d+)\s*x\s*(\d+,\d+|\d+)\s*(mm|cm|m|kg|g)?', r'\1x\2\3', text)
+    text = re.sub(r'(\d+,\d+|\d+)\s*x\s*(\d+,\d+)', r'\1x\2', text)
+    text = re.sub(r'(\d+,\d+|\d+)\s*\*\s*(\d+)\s*(mm|cm|m|kg|g)?', r'\1*\2\3', text)
+    text = re.sub(r'(\d+,\d+|\d+)\s*\*\s*(\d+)', r'\1*\2', text)
+    text = re.sub(r'(\d+,\d+|\d+)\s*(mm|cm|m|kg|g)', r'\1\2', text)
+    text = re.sub(r'(\d)\s+(?=mm|cm|m)', r'\1', text)
+    text = re.sub(r'(\d+x\d+)(\s*)([A-Za-z])', r'\1 \3', text)
+    return text.replace('*', 'x')
+
+
+@Language.component("legacy_merge_hyphenated_words")
+def legacy_merge_hyphenated_words(doc: spacy.tokens.Doc) -> spacy.tokens.Doc:
+    """
+    The original merge_hyphenated_words component, which builds its matcher for every document, kept
+    as the baseline of the benchmark.
+
+    Parameters:
+    doc (spacy.tokens.Doc): The document to process.
+
+    Returns:
+    spacy.tokens.Doc: The processed document with merged tokens.
+    """
+    try:
+        matcher = Matcher(doc.vocab)
+        for label, pattern in MERGE_PATTERNS.items():
+            matcher.add(label, [pattern])
+        with doc.retokenize() as retokenizer:
+            for match_id, start, end in matcher(doc):
+                retokenizer.merge(doc[start:end])
+        return doc
+    except Exception as e:
+        logging.error(f"Error merging hyphenated words: {e}")
+        return doc
+
+
+def time_call(function: Callable, repeat: int) -> float:
+    """
+    Measures the best wall-clock time of a call over several repetitions.
+
+    Parameters:
+    function (Callable): The call to time, without arguments.
+    repeat (int): The number of repetitions.
+
+    Returns:
+    float: The fastest time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_preprocess_dimensions(texts: Optional[List[str]] = None, rows: int = 100_000,
+                                    repeat: int = 5) -> Dict[str, float]:
+    """
+    Compares the throughput of the legacy dimension regex chain, `preprocess_dimensions` and
+    `preprocess_dimensions_series` on a column of supplier descriptions.
+
+    Parameters:
+    texts (Optional[List[str]]): The distinct descriptions. Defaults to the training texts.
+    rows (int): The number of rows of the benchmarked column, repeating the descriptions.
+    repeat (int): The number of timed repetitions; the fastest one is reported.
+
+    Returns:
+    Dict[str, float]: The rows per second of each variant.
+    """
+    texts = texts or [text for text, _ in get_training_data()]
+    column = pd.Series((texts * (rows // len(texts) + 1))[:rows])
+
+    if [legacy_preprocess_dimensions(text) for text in texts] != [preprocess_dimensions(text) for text in texts]:
+        raise AssertionError("preprocess_dimensions does not match the legacy regex chain")
+
+    timings = {
+        'legacy': time_call(lambda: [legacy_preprocess_dimensions(text) for text in column], repeat),
+        'compiled': time_call(lambda: [preprocess_dimensions(text) for text in column], repeat),
+        'series': time_call(lambda: preprocess_dimensions_series(column), repeat),
+    }
+    return {name: rows / seconds for name, seconds in timings.items()}
+
+
+def benchmark_merge_hyphenated_words(texts: Optional[List[str]] = None, docs: int = 20_000,
+                                     repeat: int = 5) -> Dict[str, float]:
+    """
+    Compares the throughput of tokenizing and merging with the legacy per-document matcher, the
+    build-once merge_hyphenated_words component and its tokenizer rules mode, and checks that they
+    produce the same tokens.
+
+    Parameters:
+    texts (Optional[List[str]]): The distinct descriptions. Defaults to the preprocessed training texts.
+    docs (int): The number of benchmarked documents, repeating the descriptions.
+    repeat (int): The number of timed repetitions; the fastest one is reported.
+
+    Returns:
+    Dict[str, float]: The documents per second of each variant.
+    """
+    texts = texts or [preprocess_dimensions(text) for text, _ in get_training_data()]
+    texts = (texts * (docs // len(texts) + 1))[:docs]
+
+    pipelines = {}
+    for name, component, config in (('legacy', 'legacy_merge_hyphenated_words', {}),
+                                    ('matcher', 'merge_hyphenated_words', {'mode': 'matcher'}),
+                                    ('tokenizer', 'merge_hyphenated_words', {'mode': 'tokenizer'})):
+        pipelines[name] = spacy.blank("en")
+        pipelines[name].add_pipe(component, config=config)
+
+    tokens = {name: [[token.text for token in doc] for doc in nlp.pipe(texts)] for name, nlp in pipelines.items()}
+    for name in ('matcher', 'tokenizer'):
+        if tokens[name] != tokens['legacy']:
+            raise AssertionError(f"The {name} mode of merge_hyphenated_words does not match the legacy component")
+
+    return {name: docs / time_call(lambda: list(nlp.pipe(texts)), repeat) for name, nlp in pipelines.items()}
+
+
+def print_report(title: str, rates: Dict[str, float], unit: str = 'rows', baseline: str = 'legacy'):
+    """
+    Prints the throughput of each variant and its speedup over the baseline.
+
+    Parameters:
+    title (str): The title of the benchmark.
+    rates (Dict[str, float]): The items per second of each variant.
+    unit (str): The name of the items.
+    baseline (str): The variant the speedups are relative to.
+    """
+    print(title)
+    for name, rate in rates.items():
+        print(f"  {name:<12} {rate:>14,.0f} {unit}/s  {rate / rates[baseline]:>6.1f}x")
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point for the micro-benchmarks.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Run the supplier data micro-benchmarks.")
+    parser.add_argument('--rows', type=int, default=100_000, help="The number of benchmarked rows.")
+    parser.add_argument('--docs', type=int, default=20_000, help="The number of benchmarked documents.")
+    parser.add_argument('--repeat', type=int, default=5, help="The number of timed repetitions.")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print_report(f"preprocess_dimensions, {args.rows} rows",
+                 benchmark_preprocess_dimensions(rows=args.rows, repeat=args.repeat))
+    print_report(f"merge_hyphenated_words, {args.docs} docs",
+                 benchmark_merge_hyphenated_words(docs=args.docs, repeat=args.repeat), unit='docs')
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,217 @@
+import os
+import sys
+import glob
+import hashlib
+import pickle
+import logging
+import argparse
+import pandas as pd
+from typing import List, Optional
+
+# Default upper bound on the total size of the cached frames
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+# Suffix of the cached frame files
+CACHE_SUFFIX = '.pkl'
+
+
+def get_cache_dir() -> str:
+    """
+    Constructs the path of the ingestion cache, a 'cache' directory next to the 'data' directory.
+
+    Returns:
+    str: The path to the cache directory.
+    """
+    return os.path.join(os.path.dirname(os.getcwd()), 'cache')
+
+
+def file_content_hash(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 hash of a file's content, reading it block by block.
+
+    Parameters:
+    file_path (str): The path to the file.
+    block_size (int): The number of bytes read at a time.
+
+    Returns:
+    str: The hex digest of the content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestionCache:
+    """
+    Caches each source's processed frame, keyed by the content hash of its workbook and the version
+    of its adapter, so unchanged workbooks are not parsed again. Frames are stored as pickles, which
+    round-trip every dtype, and the least recently used ones are evicted beyond `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.max_bytes = max_bytes
+
+    def entry_path(self, name: str, version: int, content_hash: str) -> str:
+        """
+        Builds the path of a cache entry.
+
+        Parameters:
+        name (str): The name of the source adapter.
+        version (int): The version of the source adapter.
+        content_hash (str): The content hash of the workbook.
+
+        Returns:
+        str: The path of the cached frame.
+        """
+        return os.path.join(self.cache_dir, f"{name}__v{version}__{content_hash}{CACHE_SUFFIX}")
+
+    def entries(self, name: Optional[str] = None) -> List[str]:
+        """
+        Lists the cached frames, of one source or of all sources.
+
+        Parameters:
+        name (Optional[str]): The name of the source adapter. Defaults to all sources.
+
+        Returns:
+        List[str]: The paths of the cached frames.
+        """
+        pattern = f"{glob.escape(name)}__*{CACHE_SUFFIX}" if name else f"*{CACHE_SUFFIX}"
+        return glob.glob(os.path.join(glob.escape(self.cache_dir), pattern))
+
+    def get(self, name: str, version: int, content_hash: str) -> Optional[pd.DataFrame]:
+        """
+        Looks up the processed frame of a workbook.
+
+        Parameters:
+        name (str): The name of the source adapter.
+        version (int): The version of the source adapter.
+        content_hash (str): The content hash of the workbook, from `file_content_hash`.
+
+        Returns:
+        Optional[pd.DataFrame]: The cached frame, or None if the workbook or the adapter changed.
+        """
+        path = self.entry_path(name, version, content_hash)
+        try:
+            df = pd.read_pickle(path)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError) as e:
+            if os.path.exists(path):
+                logging.warning(f"Discarding unreadable cache entry {path}: {e}")
+                os.remove(path)
+            return None
+
+        os.utime(path)  # Mark the entry as recently used
+        logging.info(f"Cache hit for {name} at {path}.")
+        return df
+
+    def put(self, name: str, version: int, content_hash: str, df: pd.DataFrame) -> str:
+        """
+        Stores the processed frame of a workbook, replacing the older entries of the same source.
+
+        Parameters:
+        name (str): The name of the source adapter.
+        version (int): The version of the source adapter.
+        content_hash (str): The content hash of the workbook, from `file_content_hash`.
+        df (pd.DataFrame): The processed frame.
+
+        Returns:
+        str: The path of the cached frame.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.entry_path(name, version, content_hash)
+
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+        for stale_path in self.entries(name):
+            if stale_path != path:
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    continue  # Already removed by a concurrent process
+
+        self.evict()
+        logging.info(f"Cached {name} at {path}.")
+        return path
+
+    def evict(self) -> List[str]:
+        """
+        Removes the least recently used entries until the cache fits in `max_bytes`.
+
+        Returns:
+        List[str]: The paths of the removed entries.
+        """
+        # Other processes may put or evict entries meanwhile, so any entry can vanish after the listing
+        stats = []
+        for path in self.entries():
+            try:
+                stats.append((os.path.getmtime(path), os.path.getsize(path), path))
+            except FileNotFoundError:
+                continue
+        stats.sort()
+
+        total = sum(size for _, size, _ in stats)
+        evicted = []
+        for _, size, path in stats:
+            if total <= self.max_bytes:
+                break
+            total -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            evicted.append(path)
+        if evicted:
+            logging.info(f"Evicted {len(evicted)} cache entries to stay under {self.max_bytes} bytes.")
+        return evicted
+
+    def invalidate(self, name: Optional[str] = None) -> int:
+        """
+        Removes the cached frames of one source, or of all sources.
+
+        Parameters:
+        name (Optional[str]): The name of the source adapter. Defaults to all sources.
+
+        Returns:
+        int: The number of removed entries.
+        """
+        removed = 0
+        for path in self.entries(name):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        logging.info(f"Invalidated {removed} cache entries for {name or 'all sources'}.")
+        return removed
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point for managing the ingestion cache.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Manage the supplier ingestion cache.")
+    parser.add_argument('--cache-dir', default=None, help="The cache directory. Defaults to ../cache.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    invalidate = commands.add_parser('invalidate', help="Remove cached frames so their sources are rebuilt.")
+    invalidate.add_argument('sources', nargs='*', help="The sources to invalidate. Defaults to all sources.")
+    commands.add_parser('evict', help="Evict least recently used entries beyond the size limit.")
+    args = parser.parse_args(argv)
+
+    cache = IngestionCache(args.cache_dir)
+    if args.command == 'invalidate':
+        removed = sum(cache.invalidate(source) for source in args.sources) if args.sources else cache.invalidate()
+        print(f"Removed {removed} cache entries from {cache.cache_dir}")
+    else:
+        print(f"Evicted {len(cache.evict())} cache entries from {cache.cache_dir}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
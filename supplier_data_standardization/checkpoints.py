@@ -0,0 +1,157 @@
+import os
+import json
+import pickle
+import random
+import shutil
+import logging
+import numpy
+import spacy
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from thinc.api import Optimizer
+
+# Prefix of the directory each epoch's checkpoint is saved to, followed by the zero-padded epoch
+CHECKPOINT_PREFIX = 'epoch_'
+
+# Optimizer attributes holding a value per model parameter, keyed by the parameter's node id and name
+OPTIMIZER_STATE = ('mom1', 'mom2', 'averages', 'nr_update', 'last_seen')
+
+
+def checkpoint_path(checkpoint_dir: str, epoch: int) -> str:
+    """
+    Builds the directory of an epoch's checkpoint.
+
+    Parameters:
+    checkpoint_dir (str): The directory of the checkpoints.
+    epoch (int): The epoch.
+
+    Returns:
+    str: The directory of the checkpoint.
+    """
+    return os.path.join(checkpoint_dir, f"{CHECKPOINT_PREFIX}{epoch:03d}")
+
+
+def _parameter_keys(nlp: spacy.Language) -> Dict[int, Tuple[str, int]]:
+    """
+    Maps the id of every model node of the pipeline to its pipe and position in the model. Node ids
+    are handed out as models are built, so they differ once the pipeline is built again to resume.
+
+    Parameters:
+    nlp (spacy.Language): The pipeline.
+
+    Returns:
+    Dict[int, Tuple[str, int]]: The pipe name and position of each node id.
+    """
+    keys = {}
+    for name, pipe in nlp.pipeline:
+        model = getattr(pipe, 'model', None)
+        if model is not None:
+            for position, node in enumerate(model.walk()):
+                keys[node.id] = (name, position)
+    return keys
+
+
+def save_checkpoint(checkpoint_dir: str, epoch: int, nlp: spacy.Language, optimizer: Optimizer,
+                    state: Dict[str, object]) -> str:
+    """
+    Saves the weights, the optimizer state, the random number generator states and the trainer state
+    after an epoch. The checkpoint is written next to its directory and moved in place when complete,
+    so a job killed while saving leaves the previous checkpoints intact.
+
+    Parameters:
+    checkpoint_dir (str): The directory of the checkpoints.
+    epoch (int): The epoch that just finished.
+    nlp (spacy.Language): The pipeline being trained.
+    optimizer (Optimizer): The optimizer of the training.
+    state (Dict[str, object]): The trainer state, which must be JSON serializable.
+
+    Returns:
+    str: The directory of the checkpoint.
+    """
+    path = checkpoint_path(checkpoint_dir, epoch)
+    partial = path + '.partial'
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+
+    nlp.to_disk(os.path.join(partial, 'model'))
+
+    keys = _parameter_keys(nlp)
+    optimizer_state = {}
+    for attribute in OPTIMIZER_STATE:
+        values = getattr(optimizer, attribute)
+        if values is not None:
+            optimizer_state[attribute] = {(keys[node_id], name): value for (node_id, name), value in values.items()}
+
+    training_state = {'optimizer': optimizer_state, 'random': random.getstate(), 'numpy': numpy.random.get_state()}
+    with open(os.path.join(partial, 'training_state.pkl'), 'wb') as file:
+        pickle.dump(training_state, file)
+    with open(os.path.join(partial, 'state.json'), 'w') as file:
+        json.dump({**state, 'epoch': epoch}, file, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(partial, path)
+    return path
+
+
+def latest_checkpoint(checkpoint_dir: str) -> Optional[str]:
+    """
+    Finds the checkpoint of the last epoch saved completely.
+
+    Parameters:
+    checkpoint_dir (str): The directory of the checkpoints.
+
+    Returns:
+    Optional[str]: The directory of the checkpoint, or None if there is none.
+    """
+    if not os.path.isdir(checkpoint_dir):
+        return None
+    epochs = [name for name in os.listdir(checkpoint_dir)
+              if name.startswith(CHECKPOINT_PREFIX) and name[len(CHECKPOINT_PREFIX):].isdigit()
+              and os.path.exists(os.path.join(checkpoint_dir, name, 'state.json'))]
+    return os.path.join(checkpoint_dir, max(epochs)) if epochs else None
+
+
+def load_checkpoint(path: str, nlp: spacy.Language, optimizer: Optimizer) -> Dict[str, object]:
+    """
+    Restores the weights, the optimizer state and the random number generator states of a checkpoint
+    into a pipeline built and initialized like the one that was saved.
+
+    Parameters:
+    path (str): The directory of the checkpoint.
+    nlp (spacy.Language): The pipeline to load the weights into.
+    optimizer (Optimizer): The optimizer to load the state into.
+
+    Returns:
+    Dict[str, object]: The trainer state saved with the checkpoint.
+    """
+    nlp.from_disk(os.path.join(path, 'model'))
+
+    with open(os.path.join(path, 'training_state.pkl'), 'rb') as file:
+        training_state = pickle.load(file)
+    node_ids = {key: node_id for node_id, key in _parameter_keys(nlp).items()}
+    for attribute, values in training_state['optimizer'].items():
+        restored = {(node_ids[key], name): value for (key, name), value in values.items()}
+        if attribute in ('nr_update', 'last_seen'):
+            restored = defaultdict(int, restored)
+        setattr(optimizer, attribute, restored)
+    random.setstate(training_state['random'])
+    numpy.random.set_state(training_state['numpy'])
+
+    with open(os.path.join(path, 'state.json')) as file:
+        state = json.load(file)
+    logging.info(f"Resumed training from the checkpoint of epoch {state['epoch']} in {path}")
+    return state
+
+
+def prune_checkpoints(checkpoint_dir: str, keep: Tuple[int, ...]) -> None:
+    """
+    Deletes the checkpoints of every epoch but the given ones.
+
+    Parameters:
+    checkpoint_dir (str): The directory of the checkpoints.
+    keep (Tuple[int, ...]): The epochs whose checkpoints are kept.
+    """
+    kept = {os.path.basename(checkpoint_path(checkpoint_dir, epoch)) for epoch in keep}
+    for name in os.listdir(checkpoint_dir):
+        if name.startswith(CHECKPOINT_PREFIX) and name not in kept:
+            shutil.rmtree(os.path.join(checkpoint_dir, name), ignore_errors=True)
@@ -0,0 +1,127 @@
+import time
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Numeric dimension columns, in millimetres, in the order they appear in a dimension string
+DIMENSION_COLUMNS = ['thickness_mm', 'width_mm', 'length_mm']
+
+# Matches "2.23x1075.0", "1,50 x 1350,00 x 2850,00" or "9,99 * 1500": two or three numbers with a dot
+# or a decimal comma, separated by 'x' or '*'. The thickness must not be part of a grade such as "Z140".
+DIMENSION_PATTERN = (r'(?<![\w.,])(\d+(?:[.,]\d+)?)\s*[xX*]\s*(\d+(?:[.,]\d+)?)'
+                     r'(?:\s*[xX*]\s*(\d+(?:[.,]\d+)?))?')
+
+# A range bound: (low, high), either end None for an open range
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def parse_dimensions(text: pd.Series) -> pd.DataFrame:
+    """
+    Parses the first thickness x width [x length] dimension of each string into numbers.
+
+    Parameters:
+    text (pd.Series): The strings to parse, such as the DIMENSION or material column.
+
+    Returns:
+    pd.DataFrame: The thickness_mm, width_mm and length_mm columns as float64, missing where the
+    string has no dimension, with the index of `text`.
+    """
+    parts = text.astype('string').str.extract(DIMENSION_PATTERN)
+    parts.columns = DIMENSION_COLUMNS
+    return parts.apply(lambda column: pd.to_numeric(column.str.replace(',', '.', regex=False))).astype('float64')
+
+
+def add_dimension_columns(df: pd.DataFrame, text_columns=('DIMENSION', 'material')) -> pd.DataFrame:
+    """
+    Adds numeric thickness_mm, width_mm and length_mm columns right after the DIMENSION column, parsed
+    once from the first of `text_columns` that holds a value for each row.
+
+    Parameters:
+    df (pd.DataFrame): The supplier frame.
+    text_columns (Sequence[str]): The columns to parse, in order of preference.
+
+    Returns:
+    pd.DataFrame: A copy of the frame with the numeric dimension columns.
+    """
+    text = pd.Series(pd.NA, index=df.index, dtype='string')
+    for column in text_columns:
+        if column in df:
+            text = text.fillna(df[column].astype('string'))
+
+    dimensions = parse_dimensions(text)
+    logging.info(f"Parsed numeric dimensions for {int(dimensions['thickness_mm'].notna().sum())} "
+                 f"of {len(df)} rows.")
+
+    df = df.drop(columns=[column for column in DIMENSION_COLUMNS if column in df])
+    position = df.columns.get_loc('DIMENSION') + 1 if 'DIMENSION' in df else len(df.columns)
+    for offset, column in enumerate(DIMENSION_COLUMNS):
+        df.insert(position + offset, column, dimensions[column])
+    return df
+
+
+class DimensionIndex:
+    """
+    An in-memory range index over the numeric dimensions of a supplier frame. Rows are sorted by one
+    key column, so a range on that column is two binary searches, and the ranges on the other columns
+    are checked with vectorized comparisons on the matching slice only. Rows without a value in the
+    key column are not indexed.
+    """
+
+    def __init__(self, df: pd.DataFrame, key: str = 'thickness_mm', columns=DIMENSION_COLUMNS):
+        start = time.perf_counter()
+        self.key = key
+        values = df[key].to_numpy(dtype='float64', na_value=np.nan)
+        positions = np.flatnonzero(~np.isnan(values))
+        order = positions[np.argsort(values[positions], kind='stable')]
+
+        self.labels = df.index.to_numpy()[order]
+        self.values: Dict[str, np.ndarray] = {
+            column: df[column].to_numpy(dtype='float64', na_value=np.nan)[order] for column in columns
+        }
+        logging.info(f"Indexed {len(order)} of {len(df)} rows by {key} in {time.perf_counter() - start:.3f}s.")
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def query(self, **ranges: Range) -> np.ndarray:
+        """
+        Finds the rows whose dimensions fall in all of the given inclusive ranges.
+
+        Parameters:
+        ranges (Range): One (low, high) range per indexed column, e.g. thickness_mm=(2.2, 2.3),
+        width_mm=(1000, None). Rows missing a value for a queried column do not match.
+
+        Returns:
+        np.ndarray: The index labels of the matching rows, in key order.
+        """
+        unknown = set(ranges) - set(self.values)
+        if unknown:
+            raise KeyError(f"Columns not indexed: {sorted(unknown)}")
+
+        low, high = ranges.pop(self.key, (None, None))
+        keys = self.values[self.key]
+        start = 0 if low is None else np.searchsorted(keys, low, side='left')
+        stop = len(keys) if high is None else np.searchsorted(keys, high, side='right')
+
+        mask = np.ones(max(stop - start, 0), dtype=bool)
+        for column, (low, high) in ranges.items():
+            values = self.values[column][start:stop]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        return self.labels[start:stop][mask]
+
+    def select(self, df: pd.DataFrame, **ranges: Range) -> pd.DataFrame:
+        """
+        Selects the rows of the indexed frame whose dimensions fall in the given ranges.
+
+        Parameters:
+        df (pd.DataFrame): The frame the index was built from.
+        ranges (Range): The ranges, as for `query`.
+
+        Returns:
+        pd.DataFrame: The matching rows, in key order.
+        """
+        return df.loc[self.query(**ranges)]
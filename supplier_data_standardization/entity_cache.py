@@ -0,0 +1,170 @@
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import weakref
+import spacy
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from supplier_data_standardization.cache import get_cache_dir
+
+# File name of the on-disk entity cache in the cache directory
+ENTITY_CACHE_FILE = 'entities.sqlite'
+
+# Default number of entity records kept in memory
+DEFAULT_MEMORY_ENTRIES = 100_000
+
+# Number of keys looked up in SQLite per query, below its limit on query parameters
+SQLITE_BATCH_SIZE = 500
+
+_fingerprints: 'weakref.WeakKeyDictionary[spacy.Language, str]' = weakref.WeakKeyDictionary()
+
+
+def get_entity_cache_path() -> str:
+    """
+    Constructs the path of the on-disk entity cache, in the ingestion cache directory.
+
+    Returns:
+    str: The path to the SQLite file.
+    """
+    return os.path.join(get_cache_dir(), ENTITY_CACHE_FILE)
+
+
+def model_fingerprint(nlp: spacy.Language) -> str:
+    """
+    Computes the SHA-256 hash of a model's serialized pipeline, once per model object, so entities
+    cached for one model are never served for another. Code updating a model in place must call
+    `forget_model_fingerprint` afterwards.
+
+    Parameters:
+    nlp (spacy.Language): The model.
+
+    Returns:
+    str: The hex digest of the model.
+    """
+    if nlp not in _fingerprints:
+        _fingerprints[nlp] = hashlib.sha256(nlp.to_bytes()).hexdigest()
+    return _fingerprints[nlp]
+
+
+def forget_model_fingerprint(nlp: spacy.Language) -> None:
+    """
+    Drops the stored fingerprint of a model whose weights changed in place, so the next lookup hashes
+    the updated model rather than serving the entities of its earlier weights.
+
+    Parameters:
+    nlp (spacy.Language): The updated model.
+    """
+    _fingerprints.pop(nlp, None)
+
+
+def clear_entity_cache(path: Optional[str] = None) -> bool:
+    """
+    Removes the on-disk entity cache, e.g. after the model was retrained.
+
+    Parameters:
+    path (Optional[str]): The path to the SQLite file. Defaults to `get_entity_cache_path()`.
+
+    Returns:
+    bool: Whether a cache file was removed.
+    """
+    path = path or get_entity_cache_path()
+    if not os.path.exists(path):
+        return False
+    os.remove(path)
+    logging.info(f"Entity cache {path} cleared.")
+    return True
+
+
+class EntityCache:
+    """
+    Caches the entities the NER model extracted from each preprocessed material, keyed by the
+    material and the model fingerprint. Lookups go to an in-memory LRU tier first, then to a SQLite
+    tier that persists between runs.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.path = path or get_entity_cache_path()
+        self.max_memory_entries = max_memory_entries
+        self.memory: 'OrderedDict[Tuple[str, str], Dict[str, str]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entities "
+            "(fingerprint TEXT NOT NULL, text TEXT NOT NULL, entities TEXT NOT NULL, PRIMARY KEY (fingerprint, text))"
+        )
+
+    def remember(self, fingerprint: str, text: str, entities: Dict[str, str]):
+        """
+        Adds a record to the in-memory tier, evicting the least recently used records beyond its size.
+
+        Parameters:
+        fingerprint (str): The model fingerprint.
+        text (str): The preprocessed material.
+        entities (Dict[str, str]): The entities of the material.
+        """
+        self.memory[(fingerprint, text)] = entities
+        self.memory.move_to_end((fingerprint, text))
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def get_many(self, fingerprint: str, texts: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Looks up the entities of several materials.
+
+        Parameters:
+        fingerprint (str): The model fingerprint, from `model_fingerprint`.
+        texts (Iterable[str]): The preprocessed materials.
+
+        Returns:
+        Dict[str, Dict[str, str]]: The entities of the materials found in the cache.
+        """
+        found = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            key = (fingerprint, text)
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                found[text] = self.memory[key]
+            else:
+                missing.append(text)
+
+        for start in range(0, len(missing), SQLITE_BATCH_SIZE):
+            batch = missing[start:start + SQLITE_BATCH_SIZE]
+            rows = self.connection.execute(
+                f"SELECT text, entities FROM entities WHERE fingerprint = ? AND text IN ({','.join('?' * len(batch))})",
+                [fingerprint, *batch],
+            )
+            for text, entities in rows:
+                found[text] = json.loads(entities)
+                self.remember(fingerprint, text, found[text])
+
+        self.hits += len(found)
+        self.misses += sum(text not in found for text in missing)
+        return found
+
+    def put_many(self, fingerprint: str, records: Dict[str, Dict[str, str]]):
+        """
+        Stores the entities of several materials in both tiers.
+
+        Parameters:
+        fingerprint (str): The model fingerprint, from `model_fingerprint`.
+        records (Dict[str, Dict[str, str]]): The entities of each preprocessed material.
+        """
+        for text, entities in records.items():
+            self.remember(fingerprint, text, entities)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entities (fingerprint, text, entities) VALUES (?, ?, ?)",
+                [(fingerprint, text, json.dumps(entities)) for text, entities in records.items()],
+            )
+
+    def close(self):
+        """
+        Closes the connection to the on-disk tier.
+        """
+        self.connection.close()
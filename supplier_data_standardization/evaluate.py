@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import numpy
+import spacy
+import pandas as pd
+from spacy.scorer import Scorer
+from spacy.tokens import DocBin, Span
+from spacy.training.example import Example
+from typing import Dict, List, Optional
+from supplier_data_standardization.utils import get_training_data, setup_logging
+from supplier_data_standardization.cache import file_content_hash, get_cache_dir
+from supplier_data_standardization.models import get_model_dir
+from supplier_data_standardization.incremental import read_labeled_rows
+from supplier_data_standardization.ner_model import DEFAULT_BATCH_SIZE, split_training_data
+
+# Version of the cached gold corpora; corpora cached by an older version are built again
+GOLD_CORPUS_VERSION = 1
+
+# Number of documents each timed pass over the gold corpus processes, repeating its texts as needed,
+# so throughput is measured on more than a handful of descriptions
+DEFAULT_TIMED_DOCS = 5000
+
+# Number of timed passes, of which the fastest is reported
+DEFAULT_REPEAT = 3
+
+# Number of documents processed one at a time to measure the latency percentiles on
+DEFAULT_LATENCY_DOCS = 200
+
+
+def gold_corpus_path(key: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Builds the path of a cached gold corpus.
+
+    Parameters:
+    key (str): The hash of the corpus source and of the tokenizer splitting it.
+    cache_dir (Optional[str]): The cache directory. Defaults to `get_cache_dir()`.
+
+    Returns:
+    str: The path to the DocBin file.
+    """
+    return os.path.join(cache_dir or get_cache_dir(), f"gold_v{GOLD_CORPUS_VERSION}_{key[:16]}.spacy")
+
+
+def tokenizer_fingerprint(nlp: spacy.Language) -> str:
+    """
+    Hashes the tokenizer rules of a pipeline, so pipelines splitting texts alike share their gold corpora.
+
+    Parameters:
+    nlp (spacy.Language): The pipeline.
+
+    Returns:
+    str: The hex digest of the language and the tokenizer rules.
+    """
+    rules = nlp.tokenizer.to_bytes(exclude=['vocab'])
+    return hashlib.sha256(nlp.lang.encode('utf-8') + rules).hexdigest()
+
+
+def build_gold_corpus(data: list, nlp: Optional[spacy.Language] = None) -> DocBin:
+    """
+    Annotates labeled descriptions as documents, labeling their tokens in order like the training does.
+
+    Parameters:
+    data (list): A list of tuples containing text and labels.
+    nlp (Optional[spacy.Language]): The pipeline whose tokenizer splits the texts, which must be the
+    evaluated model's so the gold and predicted tokens line up. Defaults to a blank English pipeline.
+
+    Returns:
+    DocBin: The annotated documents.
+    """
+    nlp = nlp or spacy.blank("en")
+    db = DocBin()
+    for text, labels in data:
+        doc = nlp.make_doc(text)
+        doc.ents = [Span(doc, token.i, token.i + 1, label=label) for token, label in zip(doc, labels)]
+        db.add(doc)
+    return db
+
+
+def load_gold_corpus(path: Optional[str] = None, cache_dir: Optional[str] = None,
+                     nlp: Optional[spacy.Language] = None) -> DocBin:
+    """
+    Loads a gold corpus as annotated documents. The documents are cached as a DocBin keyed by the
+    content hash of the source and the tokenizer that split it, so later evaluations of the same corpus
+    with the same tokenizer skip parsing and annotating it.
+
+    Parameters:
+    path (Optional[str]): A JSON Lines file with a "text" and a "labels" field per line. Defaults to
+    the held-out split of the training data `ner_model.main` trains without.
+    cache_dir (Optional[str]): The cache directory. Defaults to `get_cache_dir()`.
+    nlp (Optional[spacy.Language]): The evaluated model, whose tokenizer splits the texts. Defaults to
+    a blank English pipeline.
+
+    Returns:
+    DocBin: The annotated documents.
+    """
+    nlp = nlp or spacy.blank("en")
+    if path is not None:
+        key = file_content_hash(path)
+    else:
+        data = split_training_data(get_training_data())[1]
+        key = hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+
+    key = hashlib.sha256(f"{key}:{tokenizer_fingerprint(nlp)}".encode('utf-8')).hexdigest()
+    cache_path = gold_corpus_path(key, cache_dir)
+    if os.path.exists(cache_path):
+        return DocBin().from_disk(cache_path)
+
+    db = build_gold_corpus(read_labeled_rows(path) if path is not None else data, nlp)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    db.to_disk(cache_path)
+    logging.info(f"Cached the gold corpus of {len(db)} documents at {cache_path}")
+    return db
+
+
+def label_scores(examples: List[Example]) -> pd.DataFrame:
+    """
+    Scores predicted entities against the gold entities, per label and over all labels.
+
+    Parameters:
+    examples (List[Example]): The examples, with the predicted documents and the gold documents.
+
+    Returns:
+    pd.DataFrame: The precision, recall, F1 and number of gold entities of each label, and of all
+    labels in the last row, labeled 'ALL'.
+    """
+    scores = Scorer.score_spans(examples, "ents")
+    support = pd.Series([ent.label_ for example in examples for ent in example.reference.ents],
+                        dtype=object).value_counts()
+
+    rows = [{'label': label, 'precision': prf['p'], 'recall': prf['r'], 'f1': prf['f'],
+             'support': int(support.get(label, 0))}
+            for label, prf in sorted((scores['ents_per_type'] or {}).items())]
+    rows.append({'label': 'ALL', 'precision': scores['ents_p'] or 0.0, 'recall': scores['ents_r'] or 0.0,
+                 'f1': scores['ents_f'] or 0.0, 'support': int(support.sum())})
+    return pd.DataFrame(rows)
+
+
+def evaluate_model(nlp: spacy.Language, corpus: DocBin, batch_size: int = DEFAULT_BATCH_SIZE,
+                   timed_docs: int = DEFAULT_TIMED_DOCS, repeat: int = DEFAULT_REPEAT,
+                   latency_docs: int = DEFAULT_LATENCY_DOCS) -> Dict[str, object]:
+    """
+    Scores a model on a gold corpus with `nlp.pipe` and measures its speed. Throughput is the fastest
+    of the timed batched passes; the latency is that of processing one document on its own, as the
+    extraction service does.
+
+    Parameters:
+    nlp (spacy.Language): The model.
+    corpus (DocBin): The gold corpus from `load_gold_corpus`, split by this model's tokenizer.
+    batch_size (int): The number of documents the model processes at a time.
+    timed_docs (int): The number of documents of each timed pass.
+    repeat (int): The number of timed passes.
+    latency_docs (int): The number of documents processed one at a time to measure the latency on.
+
+    Returns:
+    Dict[str, object]: The per-label scores from `label_scores`, the documents and tokens per second
+    and the median and 95th percentile latency per document in milliseconds.
+    """
+    gold = list(corpus.get_docs(nlp.vocab))
+    texts = [doc.text for doc in gold]
+    predicted = list(nlp.pipe(texts, batch_size=batch_size))
+    scores = label_scores([Example(doc, reference) for doc, reference in zip(predicted, gold)])
+
+    # Repeat the texts up to the timed documents and count their tokens as the model splits them
+    repeats = max(timed_docs, latency_docs) // len(texts) + 1
+    timed_texts = (texts * repeats)[:timed_docs]
+    timed_tokens = sum(([len(doc) for doc in predicted] * repeats)[:timed_docs])
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in nlp.pipe(timed_texts, batch_size=batch_size):
+            pass
+        best = min(best, time.perf_counter() - start)
+
+    latencies = []
+    for text in (texts * repeats)[:latency_docs]:
+        start = time.perf_counter()
+        nlp(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'labels': scores,
+        'docs': len(texts),
+        'docs_per_sec': len(timed_texts) / best,
+        'tokens_per_sec': timed_tokens / best,
+        'p50_latency_ms': float(numpy.percentile(latencies, 50)),
+        'p95_latency_ms': float(numpy.percentile(latencies, 95)),
+    }
+
+
+def evaluate_models(model_paths: List[str], gold_path: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                    timed_docs: int = DEFAULT_TIMED_DOCS, repeat: int = DEFAULT_REPEAT,
+                    latency_docs: int = DEFAULT_LATENCY_DOCS, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Evaluates saved models on the same gold corpus, split by the tokenizer of each model. Models
+    sharing a tokenizer share the cached corpus.
+
+    Parameters:
+    model_paths (List[str]): The model directories.
+    gold_path (Optional[str]): The gold corpus file, see `load_gold_corpus`.
+    batch_size (int): The number of documents the models process at a time.
+    timed_docs (int): The number of documents of each timed pass.
+    repeat (int): The number of timed passes.
+    latency_docs (int): The number of documents processed one at a time to measure the latency on.
+    cache_dir (Optional[str]): The cache directory of the gold corpus. Defaults to `get_cache_dir()`.
+
+    Returns:
+    pd.DataFrame: One row per model and label with its scores, and the speed of the model repeated
+    on each of its rows.
+    """
+    reports = []
+    for path in model_paths:
+        nlp = spacy.load(path)
+        corpus = load_gold_corpus(gold_path, cache_dir, nlp)
+        result = evaluate_model(nlp, corpus, batch_size=batch_size, timed_docs=timed_docs,
+                                repeat=repeat, latency_docs=latency_docs)
+        report = result.pop('labels')
+        report.insert(0, 'model', path)
+        reports.append(report.assign(**result))
+        logging.info(f"Model {path}: F1 {report['f1'].iloc[-1]:.3f}, {result['docs_per_sec']:,.0f} docs/s, "
+                     f"p95 latency {result['p95_latency_ms']:.2f} ms")
+    return pd.concat(reports, ignore_index=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point that evaluates models on a gold corpus.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Score NER models per label and measure their speed.")
+    parser.add_argument('models', nargs='*', help="The model directories. Defaults to the trained model.")
+    parser.add_argument('--gold', help="A JSON Lines file with a 'text' and a 'labels' field per line. "
+                                       "Defaults to the held-out split of the training data.")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="The number of documents the models process at a time.")
+    parser.add_argument('--timed-docs', type=int, default=DEFAULT_TIMED_DOCS,
+                        help="The number of documents of each timed pass.")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="The number of timed passes.")
+    parser.add_argument('--latency-docs', type=int, default=DEFAULT_LATENCY_DOCS,
+                        help="The number of documents processed one at a time to measure the latency on.")
+    parser.add_argument('--output', help="A CSV file to write the report to.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    report = evaluate_models(args.models or [get_model_dir()], gold_path=args.gold, batch_size=args.batch_size,
+                             timed_docs=args.timed_docs, repeat=args.repeat, latency_docs=args.latency_docs)
+    if args.output:
+        report.to_csv(args.output, index=False)
+
+    for path, rows in report.groupby('model', sort=False):
+        summary = rows.iloc[0]
+        print(f"{path}: {summary['docs']} docs, {summary['docs_per_sec']:,.0f} docs/s, "
+              f"{summary['tokens_per_sec']:,.0f} tokens/s, p50 {summary['p50_latency_ms']:.2f} ms, "
+              f"p95 {summary['p95_latency_ms']:.2f} ms")
+        print(rows[['label', 'precision', 'recall', 'f1', 'support']].to_string(
+            index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
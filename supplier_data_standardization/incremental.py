@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import random
+import logging
+import argparse
+import spacy
+from typing import Dict, List, Optional
+from supplier_data_standardization.utils import get_training_data, setup_logging
+from supplier_data_standardization.models import get_model_dir
+from supplier_data_standardization.entity_cache import clear_entity_cache, forget_model_fingerprint
+from supplier_data_standardization.ner_model import (DEFAULT_BATCH_SIZES, DEFAULT_DEV_FRACTION, DEFAULT_DROPOUT,
+                                                     length_bucketed_batches, make_examples, split_training_data)
+
+# Number of earlier examples mixed in per new example in every fine-tuning epoch, so the model keeps
+# what it learned from them
+DEFAULT_REHEARSAL_RATIO = 2.0
+
+# Number of passes over the new examples
+DEFAULT_FINE_TUNE_EPOCHS = 10
+
+
+def read_labeled_rows(path: str) -> list:
+    """
+    Reads newly labeled descriptions from a JSON Lines file with a "text" and a "labels" field per line,
+    the labels being those of the tokens of the text in order like in `get_training_data`.
+
+    Parameters:
+    path (str): The path to the file.
+
+    Returns:
+    list: A list of tuples containing text and labels.
+    """
+    rows = []
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                row = json.loads(line)
+                rows.append((row['text'], list(row['labels'])))
+    return rows
+
+
+def bump_version(version: str) -> str:
+    """
+    Increments the patch number of a model version such as '0.0.3'.
+
+    Parameters:
+    version (str): The version.
+
+    Returns:
+    str: The next version.
+    """
+    parts = version.split('.')
+    parts[-1] = str(int(parts[-1]) + 1) if parts[-1].isdigit() else '1'
+    return '.'.join(parts)
+
+
+def fine_tune_ner_model(new_data: list, old_data: Optional[list] = None, dev_data: Optional[list] = None,
+                        model_path: Optional[str] = None, output_dir: Optional[str] = None,
+                        rehearsal_ratio: float = DEFAULT_REHEARSAL_RATIO, epochs: int = DEFAULT_FINE_TUNE_EPOCHS,
+                        dropout: float = DEFAULT_DROPOUT, dev_fraction: float = DEFAULT_DEV_FRACTION,
+                        seed: int = 0) -> Dict[str, object]:
+    """
+    Fine-tunes the saved NER model on newly labeled descriptions instead of training it again from
+    scratch. Every epoch mixes a fresh sample of earlier examples in with the new ones (rehearsal).
+    The fine-tuned model is saved as a new version only if its dev F1 is not below the current one.
+
+    Parameters:
+    new_data (list): The newly labeled descriptions, as tuples of text and labels.
+    old_data (Optional[list]): The examples the model was trained on. Defaults to the training data.
+    dev_data (Optional[list]): The examples to compare the models on. Defaults to a held-out share of
+    the earlier examples, which are then not rehearsed.
+    model_path (Optional[str]): The directory of the model to fine-tune. Defaults to `get_model_dir()`.
+    output_dir (Optional[str]): The directory to save the fine-tuned model to. Defaults to the model path.
+    rehearsal_ratio (float): The number of earlier examples rehearsed per new example in every epoch.
+    epochs (int): The number of passes over the new examples.
+    dropout (float): The dropout rate of the updates.
+    dev_fraction (float): The share of the earlier examples held out when no dev examples are given.
+    seed (int): The seed of the split, the rehearsal samples and the training.
+
+    Returns:
+    Dict[str, object]: The dev F1 before and after fine-tuning, whether the model was saved, and its version.
+    """
+    model_path = model_path or get_model_dir()
+    old_data = old_data if old_data is not None else get_training_data()
+    if dev_data is None:
+        old_data, dev_data = split_training_data(old_data, dev_fraction, seed)
+
+    random.seed(seed)
+    spacy.util.fix_random_seed(seed)
+
+    # Load a copy of its own, the model registry's instance keeps serving the current version
+    nlp = spacy.load(model_path)
+    baseline_f1 = nlp.evaluate(make_examples(nlp, dev_data))['ents_f']
+
+    ner = nlp.get_pipe("ner")
+    for _, labels in new_data:
+        for label in labels:
+            if label not in ner.labels:
+                ner.add_label(label)
+
+    new_examples = make_examples(nlp, new_data)
+    old_examples = make_examples(nlp, old_data)
+    rehearsal_size = min(len(old_examples), round(len(new_examples) * rehearsal_ratio))
+    optimizer = nlp.resume_training()
+
+    for epoch in range(epochs):
+        losses = {}
+        examples = new_examples + random.sample(old_examples, rehearsal_size)
+        for batch in length_bucketed_batches(examples, DEFAULT_BATCH_SIZES):
+            nlp.update(batch, sgd=optimizer, drop=dropout, losses=losses)
+        logging.info(f"Fine-tuning iteration {epoch + 1}, Losses: {losses}")
+    forget_model_fingerprint(nlp)
+
+    fine_tuned_f1 = nlp.evaluate(make_examples(nlp, dev_data))['ents_f']
+    report = {'baseline_f1': baseline_f1, 'fine_tuned_f1': fine_tuned_f1, 'new_examples': len(new_examples),
+              'rehearsed_examples': rehearsal_size, 'saved': False, 'version': nlp.meta.get('version')}
+
+    if fine_tuned_f1 < baseline_f1:
+        logging.warning(f"Fine-tuning lowered dev F1 from {baseline_f1:.3f} to {fine_tuned_f1:.3f}, "
+                        f"the model is not saved.")
+        return report
+
+    nlp.meta['version'] = bump_version(nlp.meta.get('version', '0.0.0'))
+    nlp.to_disk(output_dir or model_path)
+    if os.path.abspath(output_dir or model_path) == os.path.abspath(get_model_dir()):
+        # Entities cached for the previous model are stale now
+        clear_entity_cache()
+
+    logging.info(f"Fine-tuned model version {nlp.meta['version']} saved, dev F1 {baseline_f1:.3f} -> "
+                 f"{fine_tuned_f1:.3f}")
+    report.update(saved=True, version=nlp.meta['version'])
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point that fine-tunes the saved model on newly labeled descriptions.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Fine-tune the NER model on newly labeled descriptions.")
+    parser.add_argument('new_data', help="A JSON Lines file with a 'text' and a 'labels' field per line.")
+    parser.add_argument('--model', help="The model directory. Defaults to the trained model.")
+    parser.add_argument('--rehearsal-ratio', type=float, default=DEFAULT_REHEARSAL_RATIO,
+                        help="The number of earlier examples rehearsed per new example.")
+    parser.add_argument('--epochs', type=int, default=DEFAULT_FINE_TUNE_EPOCHS,
+                        help="The number of passes over the new examples.")
+    parser.add_argument('--seed', type=int, default=0, help="The seed of the split and of the training.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    report = fine_tune_ner_model(read_labeled_rows(args.new_data), model_path=args.model,
+                                 rehearsal_ratio=args.rehearsal_ratio, epochs=args.epochs, seed=args.seed)
+    print(report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,132 +1,257 @@
 import os
+import time
+import shutil
 import pandas as pd
 import logging
-from supplier_data_standardization.utils import get_file_path, read_data, setup_logging, clean_headers, \
-    validate_quantity_column
-
-
-def create_dimension_column(dataframe, thickness_col='Thickness', width_col='Width'):
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fnmatch import fnmatch
+from functools import partial
+from itertools import repeat
+from typing import Callable, List, Optional, Sequence, Tuple
+from supplier_data_standardization.utils import get_file_path, setup_logging, create_dimension_column  # noqa: F401
+from supplier_data_standardization.units import WEIGHT_UNITS_TO_KG
+from supplier_data_standardization.adapters import get_adapter, compile_adapter
+from supplier_data_standardization.schema import CANONICAL_SCHEMA, NUMERIC_COLUMNS, apply_canonical_schema
+from supplier_data_standardization.storage import write_parquet_dataset
+from supplier_data_standardization.cache import IngestionCache, file_content_hash
+from supplier_data_standardization.dimensions import add_dimension_columns
+
+# CSV files merge_csv_files skips by default: the outputs main() and the NER step write themselves
+MERGE_EXCLUDE_PATTERNS = ('final_combined_output*.csv',)
+
+# Registered adapters of the sources main() combines, in output order
+SOURCE_ADAPTERS = ['source1', 'source2', 'source3']
+
+
+def process_source(adapter_name: str, file_path: Optional[str] = None, chunk_size: Optional[int] = None,
+                   workers: Optional[int] = None, cache: Optional[IngestionCache] = None) -> pd.DataFrame:
     """
-    Creates a DIMENSION column in the given DataFrame by combining the thickness and width columns.
+    Processes a supplier workbook through its registered source adapter.
 
     Parameters:
-    dataframe (pd.DataFrame): The DataFrame containing the thickness and width columns.
-    thickness_col (str): The name of the thickness column.
-    width_col (str): The name of the width column.
+    adapter_name (str): The name of the registered adapter.
+    file_path (Optional[str]): Path to the workbook. Defaults to the adapter's file in the data directory.
+    chunk_size (Optional[int]): If set, the workbook is streamed in chunks of this many rows
+    instead of being loaded whole.
+    workers (Optional[int]): If greater than 1, the sheets of the workbook are processed in parallel
+    by up to this many worker processes.
+    cache (Optional[IngestionCache]): If set, the processed frame is taken from this cache when neither
+    the workbook nor the adapter changed, and stored in it otherwise.
 
     Returns:
-    pd.DataFrame: The DataFrame with the added DIMENSION column.
+    pd.DataFrame: The filtered and processed DataFrame, or an empty DataFrame if the workbook cannot be read.
     """
-    dataframe['DIMENSION'] = dataframe[thickness_col].astype(str) + 'x' + dataframe[width_col].astype(str)
-    return dataframe
+    adapter = get_adapter(adapter_name)
+    if file_path is None:
+        file_path = get_file_path(adapter.file_name)
+
+    try:
+        content_hash = file_content_hash(file_path) if cache is not None else None
+        if cache is not None:
+            df = cache.get(adapter.name, adapter.version, content_hash)
+            if df is not None:
+                logging.info(f"{adapter.file_name} unchanged, using the cached result.")
+                return df
+
+        df = compile_adapter(adapter).run(file_path, chunk_size=chunk_size, workers=workers)
+    except Exception as e:
+        logging.error(f"Failed to process {adapter.file_name}: {e}")
+        return pd.DataFrame()
 
+    if cache is not None:
+        # A failed cache write only costs the next run a rebuild
+        try:
+            cache.put(adapter.name, adapter.version, content_hash, df)
+        except Exception as e:
+            logging.error(f"Failed to cache {adapter.file_name}: {e}")
 
-def process_source1():
+    logging.info(f"{adapter.file_name} processed successfully.")
+    return df
+
+
+def process_source1(chunk_size: Optional[int] = None, cache: Optional[IngestionCache] = None) -> pd.DataFrame:
     """
     Processes the data from source1.xlsx.
 
+    Parameters:
+    chunk_size (Optional[int]): If set, the workbook is streamed in chunks of this many rows
+    instead of being loaded whole.
+    cache (Optional[IngestionCache]): If set, the result is reused while source1.xlsx is unchanged.
+
     Returns:
     pd.DataFrame: The filtered and processed DataFrame.
     """
-    data1 = read_data('source1.xlsx')
-    if data1 is not None:
-        # Rename columns and process as needed
-        data1 = data1.rename(columns={
-            'Quality/Choice': 'MATERIAL_GRADE',
-            'Grade': 'MATERIAL_NAME',
-            'Finish': 'COATING_TYPE',
-            'Gross weight (kg)': 'weight',
-            'Thickness (mm)': 'Thickness',
-            'Width (mm)': 'Width'
-        })
-
-        data1 = create_dimension_column(data1, thickness_col='Thickness', width_col='Width')
-
-        # Drop original Thickness and Width columns
-        data1 = data1.drop(columns=['Thickness', 'Width'])
-
-        # Select only the required columns
-        data1_filtered = data1[['MATERIAL_GRADE', 'MATERIAL_NAME', 'COATING_TYPE', 'DIMENSION', 'weight']]
-
-        # Drop rows with NaN values
-        data1_filtered = data1_filtered.dropna()
-        logging.info("source1.xlsx processed successfully.")
-        return data1_filtered
-    else:
-        logging.error("Failed to process source1.xlsx.")
-        return pd.DataFrame()
+    return process_source('source1', chunk_size=chunk_size, cache=cache)
 
 
-def process_source2(file_path=None):
+def process_source2(file_path=None, chunk_size: Optional[int] = None, workers: Optional[int] = None,
+                    cache: Optional[IngestionCache] = None):
     """
-    Processes the data from source2.xlsx.
+    Processes the data from every stock sheet of source2.xlsx, tagging each row with its sheet.
 
     Parameters:
     file_path (str): Path to the source2.xlsx file.
+    chunk_size (Optional[int]): If set, each sheet is streamed in chunks of this many rows
+    instead of being loaded whole.
+    workers (Optional[int]): If greater than 1, the sheets are processed in parallel by up to this
+    many worker processes.
+    cache (Optional[IngestionCache]): If set, the result is reused while source2.xlsx is unchanged.
 
     Returns:
     pd.DataFrame: The combined and processed DataFrame.
     """
-    if file_path is None:
-        file_path = get_file_path('source2.xlsx')
+    return process_source('source2', file_path=file_path, chunk_size=chunk_size, workers=workers, cache=cache)
 
-    xls = pd.ExcelFile(file_path)
 
-    df_first_choice = pd.read_excel(xls, 'First choice ')
-    df_second_choice = pd.read_excel(xls, '2nd choice ')
+def process_source3(chunk_size: Optional[int] = None, cache: Optional[IngestionCache] = None) -> pd.DataFrame:
+    """
+    Processes the data from source3.xlsx.
+
+    Parameters:
+    chunk_size (Optional[int]): If set, the workbook is streamed in chunks of this many rows
+    instead of being loaded whole.
+    cache (Optional[IngestionCache]): If set, the result is reused while source3.xlsx is unchanged.
+
+    Returns:
+    pd.DataFrame: The filtered and processed DataFrame.
+    """
+    return process_source('source3', chunk_size=chunk_size, cache=cache)
 
-    # Clean headers in both sheets
-    df_first_choice_cleaned = clean_headers(df_first_choice)
-    df_second_choice_cleaned = clean_headers(df_second_choice)
 
-    # Normalize the case of the columns
-    df_first_choice_cleaned.columns = df_first_choice_cleaned.columns.str.lower()
-    df_second_choice_cleaned.columns = df_second_choice_cleaned.columns.str.lower()
+def finish_combined_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applies the steps that follow combining the sources to a frame (or chunk) of source-tagged rows.
 
-    # Select only the required columns
-    df_first_choice_filtered = df_first_choice_cleaned[['material', 'article id', 'weight', 'quantity']]
-    df_second_choice_filtered = df_second_choice_cleaned[['material', 'article id', 'weight', 'quantity']]
+    Parameters:
+    df (pd.DataFrame): The rows of one or more sources, with their source column.
 
-    # Validate the "quantity" column in both dataframes
-    df_first_choice_filtered = validate_quantity_column(df_first_choice_filtered)
-    df_second_choice_filtered = validate_quantity_column(df_second_choice_filtered)
+    Returns:
+    pd.DataFrame: The rows with the numeric dimension columns and the canonical dtypes.
+    """
+    # Remove any empty rows after merging
+    df = df.dropna(how='all')
 
-    # Combine the two DataFrames based on the columns
-    combined_df_source2 = pd.concat([df_first_choice_filtered, df_second_choice_filtered], ignore_index=True)
+    # Parse numeric thickness, width and length next to the DIMENSION strings, for range lookups
+    df = add_dimension_columns(df)
 
-    return combined_df_source2
+    # Cast the combined columns to the canonical dtypes
+    return apply_canonical_schema(df)
 
 
-def process_source3():
+def combined_columns(adapter_names: Sequence[str]) -> List[str]:
     """
-    Processes the data from source3.xlsx.
+    Lists the columns of the combined output of the sources, in the order combining them in memory
+    gives, so chunks streamed from the sources can be written under one header.
+
+    Parameters:
+    adapter_names (Sequence[str]): The names of the registered adapters, in output order.
 
     Returns:
-    pd.DataFrame: The filtered and processed DataFrame.
+    List[str]: The column names.
     """
-    data3 = read_data('source3.xlsx')
-    if data3 is not None:
-        # Rename the columns
-        data3.columns = ['quantity', 'article id', 'material', 'Unit', 'weight']
+    columns = []
+    for name in adapter_names:
+        plan = compile_adapter(get_adapter(name))
+        columns += list(plan.empty_frame().columns) + ['source']
+    return list(finish_combined_frame(pd.DataFrame(columns=list(dict.fromkeys(columns)))).columns)
 
-        # Apply the conversion function to each row in the dataframe
-        data3['weight'] = data3.apply(convert_to_kg, axis=1)
 
-        # Filter out rows where weight is 0 or less
-        data3 = data3[data3['weight'] > 0]
+def stream_source_to_csv(adapter_name: str, path: str, columns: List[str], chunk_size: int) -> int:
+    """
+    Streams a supplier workbook through its registered source adapter into a CSV file without a
+    header, one finished chunk at a time, so memory stays bounded whatever the size of the workbook.
+    If the workbook cannot be read, the file is left empty, like `process_source` returns no rows.
 
-        # Select only the required columns
-        data3_filtered = data3[['material', 'weight', 'article id', 'quantity']]
-        return data3_filtered
+    Parameters:
+    adapter_name (str): The name of the registered adapter.
+    path (str): The path of the CSV file to write.
+    columns (List[str]): The columns to write, in order, from `combined_columns`.
+    chunk_size (int): The number of workbook rows read at a time.
+
+    Returns:
+    int: The number of rows written.
+    """
+    adapter = get_adapter(adapter_name)
+    rows = 0
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            for chunk in compile_adapter(adapter).iter_run(get_file_path(adapter.file_name), chunk_size=chunk_size):
+                chunk = finish_combined_frame(chunk.assign(source=adapter_name))
+                chunk.reindex(columns=columns).to_csv(file, header=False, index=False)
+                rows += len(chunk)
+    except Exception as e:
+        logging.error(f"Failed to process {adapter.file_name}: {e}")
+        open(path, 'w').close()
+        return 0
+
+    logging.info(f"{adapter.file_name} streamed successfully ({rows} rows).")
+    return rows
+
+
+def stream_sources_to_csv(output_path: str, chunk_size: int, workers: Optional[int] = None,
+                          adapter_names: Sequence[str] = SOURCE_ADAPTERS) -> int:
+    """
+    Writes the combined output of the sources to a CSV file, streaming each workbook chunk by chunk.
+    Each source is written to a part file next to the output, in its own worker process when more
+    than one worker is allowed, and the parts are then appended to the output in source order.
+
+    Parameters:
+    output_path (str): The path of the combined CSV file.
+    chunk_size (int): The number of workbook rows read at a time.
+    workers (Optional[int]): The number of worker processes. None, 0 or 1 streams the sources one
+    after another in this process.
+    adapter_names (Sequence[str]): The names of the registered adapters, in output order.
+
+    Returns:
+    int: The number of rows written.
+    """
+    columns = combined_columns(adapter_names)
+    parts = [f"{output_path}.{name}.part" for name in adapter_names]
+    arguments = (adapter_names, parts, repeat(columns), repeat(chunk_size))
+
+    if workers is None or workers <= 1:
+        rows = list(map(stream_source_to_csv, *arguments))
     else:
-        logging.error("Failed to process source3.xlsx.")
-        return pd.DataFrame()
+        with ProcessPoolExecutor(max_workers=min(workers, len(adapter_names))) as executor:
+            rows = list(executor.map(stream_source_to_csv, *arguments))
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as output:
+        pd.DataFrame(columns=columns).to_csv(output, index=False)
+        for part in parts:
+            with open(part, encoding='utf-8') as file:
+                shutil.copyfileobj(file, output)
+            os.remove(part)
+
+    for name, count in zip(adapter_names, rows):
+        logging.info(f"{name} streamed ({count} rows).")
+    return sum(rows)
+
+
+def write_parquet_from_csv(csv_path: str, parquet_path: str, chunk_size: int) -> str:
+    """
+    Writes a combined CSV file as a partitioned Parquet dataset, reading it chunk by chunk.
+
+    Parameters:
+    csv_path (str): The path of the combined CSV file.
+    parquet_path (str): The directory of the dataset.
+    chunk_size (int): The number of rows read at a time.
+
+    Returns:
+    str: The directory of the dataset.
+    """
+    text_dtypes = {column: 'string' for column in CANONICAL_SCHEMA if column not in NUMERIC_COLUMNS}
+    for number, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunk_size, dtype=text_dtypes)):
+        write_parquet_dataset(apply_canonical_schema(chunk), parquet_path, append=number > 0)
+    return parquet_path
 
 
 def convert_to_kg(row):
     """
     Converts weight to kilograms based on the unit.
 
+    This is the row-wise counterpart of `units.convert_weight_to_kg`; prefer the column-wise
+    function when converting a whole DataFrame.
+
     Parameters:
     row (pd.Series): A row of the DataFrame.
 
@@ -134,78 +259,188 @@ def convert_to_kg(row):
     float: The weight converted to kilograms.
     """
     unit = row['Unit']
-    weight = row['weight']
-
-    if unit.lower() == 'g':  # If the unit is grams
-        return weight / 1000  # Convert grams to kilograms
-    elif unit.lower() == 'mg':  # If the unit is milligrams
-        return weight / 1e6  # Convert milligrams to kilograms
-    elif unit.lower() == 'lbs':  # If the unit is pounds
-        return weight * 0.453592  # Convert pounds to kilograms
-    elif unit.lower() == 'kg':  # If the unit is already kilograms
-        return weight  # No conversion needed
-    elif unit == 'EA':  # "EA" likely stands for "Each," not a weight unit
-        return 0
-    else:
+    factor = WEIGHT_UNITS_TO_KG.get(str(unit).strip().lower())
+    if factor is None:
         raise ValueError(f"Unknown unit: {unit}")  # Handle unexpected units
+    return row['weight'] * factor
 
 
-def merge_csv_files(data_folder: str) -> pd.DataFrame:
+def read_csv_header(file_path: str) -> List[str]:
     """
-    Reads and merges all CSV files in the specified folder.
+    Reads only the header row of a CSV file.
+
+    Parameters:
+    file_path (str): The path to the CSV file.
+
+    Returns:
+    List[str]: The column names.
+    """
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+def merge_csv_files(data_folder: str, include: Sequence[str] = ('*.csv',),
+                    exclude: Sequence[str] = MERGE_EXCLUDE_PATTERNS, workers: Optional[int] = None,
+                    dedup_key: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads and merges the CSV files in the specified folder.
+
+    The headers are read first to build one unified column list, then the files are read concurrently
+    in a thread pool and concatenated once, with the canonical dtypes applied to the merged frame.
 
     Parameters:
     data_folder (str): The directory containing the CSV files.
+    include (Sequence[str]): Glob patterns of the file names to merge.
+    exclude (Sequence[str]): Glob patterns of the file names to skip. Defaults to the pipeline's own outputs.
+    workers (Optional[int]): The number of reader threads. Defaults to the ThreadPoolExecutor default.
+    dedup_key (Optional[List[str]]): If set, rows repeating an earlier row's values in these columns are dropped.
 
     Returns:
-    pd.DataFrame: The merged DataFrame containing data from all CSV files.
+    pd.DataFrame: The merged DataFrame containing data from the selected CSV files.
     """
-    # List all CSV files in the directory
-    csv_files = [f for f in os.listdir(data_folder) if f.endswith('.csv')]
+    # List the selected CSV files in the directory, in a stable order
+    csv_files = sorted(f for f in os.listdir(data_folder)
+                       if any(fnmatch(f, pattern) for pattern in include)
+                       and not any(fnmatch(f, pattern) for pattern in exclude))
+    if not csv_files:
+        logging.info(f"No CSV files to merge in {data_folder}.")
+        return pd.DataFrame()
+    file_paths = [os.path.join(data_folder, file) for file in csv_files]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Unify the schemas from the headers alone, keeping the columns in order of first appearance
+        headers = list(executor.map(read_csv_header, file_paths))
+        columns = list(dict.fromkeys(column for header in headers for column in header))
 
-    # Initialize an empty list to hold the DataFrames
-    df_list = []
+        # Text columns of the canonical schema are read as strings so every file agrees on their type
+        text_dtypes = {column: 'string' for column, dtype in CANONICAL_SCHEMA.items()
+                       if column in columns and column not in NUMERIC_COLUMNS}
+        df_list = list(executor.map(
+            lambda path: pd.read_csv(path, dtype=text_dtypes).reindex(columns=columns).astype(text_dtypes), file_paths))
 
-    # Loop through each file and read it into a DataFrame
     for file in csv_files:
-        file_path = os.path.join(data_folder, file)
-        df = pd.read_csv(file_path)
-        df_list.append(df)
         logging.info(f"CSV file {file} read successfully.")
 
     # Concatenate all DataFrames in the list
-    combined_csv_df = pd.concat(df_list, ignore_index=True)
+    combined_csv_df = apply_canonical_schema(pd.concat(df_list, ignore_index=True))
+
+    if dedup_key:
+        rows = len(combined_csv_df)
+        combined_csv_df = combined_csv_df.drop_duplicates(subset=dedup_key, ignore_index=True)
+        logging.info(f"Dropped {rows - len(combined_csv_df)} duplicate rows on {dedup_key}.")
+
     logging.info("All CSV files merged successfully.")
 
     return combined_csv_df
 
 
-def main():
+def timed_call(processor: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, float]:
+    """
+    Runs a source processor and measures how long it takes.
+
+    Parameters:
+    processor (Callable[[], pd.DataFrame]): The source processor to run.
+
+    Returns:
+    Tuple[pd.DataFrame, float]: The processed DataFrame and the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    df = processor()
+    return df, time.perf_counter() - start
+
+
+def run_source_processors(processors: List[Tuple[str, Callable[[], pd.DataFrame]]],
+                          workers: Optional[int] = None) -> List[pd.DataFrame]:
+    """
+    Runs the source processors, each in its own worker process when more than one worker is allowed.
+
+    Results are returned in the order of `processors`, whichever finishes first, so the combined
+    output is the same as a serial run. Processors must be picklable (module-level functions or
+    partials of them) to run in worker processes.
+
+    Parameters:
+    processors (List[Tuple[str, Callable[[], pd.DataFrame]]]): The source names and their processors.
+    workers (Optional[int]): The number of worker processes. None, 0 or 1 runs the processors serially
+    in this process, which is easier to debug.
+
+    Returns:
+    List[pd.DataFrame]: The processed DataFrame of each source, in order.
+    """
+    if workers is None or workers <= 1:
+        results = [timed_call(processor) for _, processor in processors]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(processors))) as executor:
+            futures = [executor.submit(timed_call, processor) for _, processor in processors]
+            results = [future.result() for future in futures]
+
+    for (name, _), (df, elapsed) in zip(processors, results):
+        logging.info(f"{name} processed in {elapsed:.2f}s ({len(df)} rows).")
+        print(f"{name} processed in {elapsed:.2f}s ({len(df)} rows)")
+
+    return [df for df, _ in results]
+
+
+def main(chunk_size: Optional[int] = None, workers: Optional[int] = None, write_parquet: bool = False,
+         use_cache: bool = False):
     """
     The main function that orchestrates reading, processing, and displaying the data.
+
+    Parameters:
+    chunk_size (Optional[int]): If set, source workbooks are streamed in chunks of this many rows straight
+    to the output files, so memory stays bounded whatever the size of the workbooks. The ingestion
+    cache is not used then, since it holds whole frames.
+    workers (Optional[int]): If greater than 1, sources are processed in parallel by up to this many
+    worker processes, and the sheets of source2 by up to this many more. Otherwise they are processed
+    one after another.
+    write_parquet (bool): Whether to also write the combined data as a Parquet dataset partitioned
+    by source and material grade.
+    use_cache (bool): Whether to reuse the processed frames of workbooks that did not change since the
+    previous run, rebuilding only the others.
     """
     # Set up logging
     setup_logging()
 
-    # Process data from source1.xlsx, source2.xlsx, and source3.xlsx
-    source1_df = process_source1()
-    source2_df = process_source2()
-    source3_df = process_source3()
-
-    # Combine the filtered data from all sources
-    final_combined_df = pd.concat([source1_df, source2_df, source3_df], ignore_index=True)
+    final_output_path = get_file_path("final_combined_output.csv")
+    parquet_output_path = get_file_path("final_combined_output.parquet")
 
-    # Remove any empty rows after merging
-    final_combined_df = final_combined_df.dropna(how='all')
+    if chunk_size:
+        if use_cache:
+            logging.info("The ingestion cache is not used when streaming the workbooks.")
 
-    # Save the final combined DataFrame to a CSV file
-    final_output_path = get_file_path("final_combined_output.csv")
-    final_combined_df.to_csv(final_output_path, index=False)
+        # Stream source1.xlsx, source2.xlsx, and source3.xlsx to the final CSV file
+        rows = stream_sources_to_csv(final_output_path, chunk_size, workers=workers)
+        logging.info(f"Final Combined CSV file saved to: {final_output_path}")
+        print(f"Final Combined CSV file saved to: {final_output_path} ({rows} rows)")
 
-    # Log and print the result
-    logging.info(f"Final Combined CSV file saved to: {final_output_path}")
-    print(f"Final Combined CSV file saved to: {final_output_path}")
-    print(final_combined_df)
+        if write_parquet:
+            write_parquet_from_csv(final_output_path, parquet_output_path, chunk_size)
+            print(f"Final Combined Parquet dataset saved to: {parquet_output_path}")
+    else:
+        cache = IngestionCache() if use_cache else None
+
+        # Process data from source1.xlsx, source2.xlsx, and source3.xlsx
+        processors = [
+            ('source1', partial(process_source1, cache=cache)),
+            ('source2', partial(process_source2, workers=workers, cache=cache)),
+            ('source3', partial(process_source3, cache=cache)),
+        ]
+        source_dfs = run_source_processors(processors, workers=workers)
+
+        # Combine the filtered data from all sources, tagging each row with its source
+        final_combined_df = pd.concat([df.assign(source=name) for (name, _), df in zip(processors, source_dfs)],
+                                      ignore_index=True)
+        final_combined_df = finish_combined_frame(final_combined_df)
+
+        # Save the final combined DataFrame to a CSV file
+        final_combined_df.to_csv(final_output_path, index=False)
+
+        # Log and print the result
+        logging.info(f"Final Combined CSV file saved to: {final_output_path}")
+        print(f"Final Combined CSV file saved to: {final_output_path}")
+        print(final_combined_df)
+
+        if write_parquet:
+            write_parquet_dataset(final_combined_df, parquet_output_path)
+            print(f"Final Combined Parquet dataset saved to: {parquet_output_path}")
 
     # Now, merge all CSV files in the 'data' directory
     data_folder = os.path.dirname(final_output_path)
@@ -0,0 +1,107 @@
+import os
+import json
+import logging
+import threading
+import spacy
+from typing import Dict, Iterable, Optional, Tuple
+
+# Directory the NER model is trained into and loaded from, next to this module
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ner_model')
+
+# Loaded models, keyed by model path, model version and disabled components
+MODELS: Dict[Tuple[str, str, Tuple[str, ...]], spacy.Language] = {}
+
+_models_lock = threading.Lock()
+
+
+def get_model_dir() -> str:
+    """
+    Returns the directory the NER model is trained into and loaded from. It does not depend on the
+    working directory.
+
+    Returns:
+    str: The absolute path to the model directory.
+    """
+    return DEFAULT_MODEL_DIR
+
+
+def model_version(path: str) -> str:
+    """
+    Identifies the version of a saved model from its meta.json and the modification times of its
+    files, so a model saved again at the same path gets a new version. Only file metadata is read.
+
+    Parameters:
+    path (str): The model directory.
+
+    Returns:
+    str: The version of the model.
+    """
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as file:
+        meta_version = json.load(file).get('version', '')
+
+    latest = max(os.stat(os.path.join(root, name)).st_mtime_ns
+                 for root, _, names in os.walk(path) for name in names)
+    return f"{meta_version}-{latest}"
+
+
+def load_model(path: Optional[str] = None, disable: Iterable[str] = ()) -> spacy.Language:
+    """
+    Loads a saved model once per process. Later calls return the loaded model until the model on
+    disk is saved again, which loads the new version and drops the old one.
+
+    Parameters:
+    path (Optional[str]): The model directory. Defaults to `get_model_dir()`.
+    disable (Iterable[str]): Pipeline components to disable at load time.
+
+    Returns:
+    spacy.Language: The loaded model.
+    """
+    path = os.path.abspath(path or get_model_dir())
+    disable = tuple(sorted(disable))
+    key = (path, model_version(path), disable)
+
+    with _models_lock:
+        if key not in MODELS:
+            # The pipeline uses components registered by the NER module
+            import supplier_data_standardization.ner_model  # noqa: F401
+
+            for stale_key in [stale_key for stale_key in MODELS if stale_key[0] == path and stale_key[1] != key[1]]:
+                del MODELS[stale_key]
+            MODELS[key] = spacy.load(path, disable=list(disable))
+            logging.info(f"Model loaded from {path}, version {key[1]}, disabled components {list(disable)}.")
+        return MODELS[key]
+
+
+def get_model(nlp: Optional[spacy.Language] = None, path: Optional[str] = None,
+              disable: Iterable[str] = ()) -> spacy.Language:
+    """
+    Returns the model to run: the one passed in if any, otherwise the loaded model at the path.
+
+    Parameters:
+    nlp (Optional[spacy.Language]): A model the caller already holds.
+    path (Optional[str]): The model directory. Defaults to `get_model_dir()`.
+    disable (Iterable[str]): Pipeline components to disable when the model is loaded from disk.
+
+    Returns:
+    spacy.Language: The model.
+    """
+    if nlp is not None:
+        return nlp
+    return load_model(path, disable)
+
+
+def clear_models(path: Optional[str] = None) -> int:
+    """
+    Drops loaded models so they are loaded again on next use.
+
+    Parameters:
+    path (Optional[str]): The model directory. Defaults to every loaded model.
+
+    Returns:
+    int: The number of dropped models.
+    """
+    with _models_lock:
+        keys = [key for key in MODELS if path is None or key[0] == os.path.abspath(path)]
+        for key in keys:
+            del MODELS[key]
+    return len(keys)
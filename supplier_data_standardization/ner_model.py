@@ -1,14 +1,88 @@
+import os
 import re
 import spacy
 import pandas as pd
 import logging
 import random
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from spacy.matcher import Matcher
 from spacy.tokens import DocBin
 from spacy.training.example import Example
 from spacy.language import Language
-from spacy.util import minibatch, compounding
-from supplier_data_standardization.utils import get_file_path, get_training_data, setup_logging
+from spacy.util import minibatch, compounding, compile_prefix_regex, compile_infix_regex
+from spacy.lang.char_classes import ALPHA, HYPHENS
+from supplier_data_standardization.utils import get_file_path, get_training_data, setup_logging, validate_numeric_column
+from supplier_data_standardization.schema import CANONICAL_SCHEMA, NUMERIC_COLUMNS, apply_canonical_schema
+from supplier_data_standardization.storage import PARTITION_COLUMNS, read_parquet_dataset, write_parquet_dataset
+from supplier_data_standardization.models import get_model, get_model_dir
+from supplier_data_standardization.entity_cache import EntityCache, clear_entity_cache, forget_model_fingerprint, \
+    model_fingerprint
+from supplier_data_standardization.rules import RULES_VERSION, RuleFastPath
+from supplier_data_standardization.checkpoints import checkpoint_path, latest_checkpoint, load_checkpoint, \
+    prune_checkpoints, save_checkpoint
+
+# Number of materials the NER model processes at a time during extraction
+DEFAULT_BATCH_SIZE = 256
+
+# Version of the entity records; cached entities of an older version are not reused
+ENTITY_FORMAT_VERSION = 2
+
+# Training settings of train_ner_model: the dropout rate, the first and largest minibatch size and
+# the rate it compounds at, the largest number of epochs and the epochs without a better dev F1, or
+# without a lower loss when there is no dev set, to stop after
+DEFAULT_DROPOUT = 0.35
+DEFAULT_BATCH_SIZES = (4.0, 32.0, 1.001)
+DEFAULT_MAX_EPOCHS = 50
+DEFAULT_PATIENCE = 5
+
+# Share of the training data held out to stop training and pick the best epoch on
+DEFAULT_DEV_FRACTION = 0.2
+
+# Directory the training checkpoints of each epoch are saved to, next to the NER model
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(get_model_dir()), 'ner_checkpoints')
+
+# Sizes of the NER model per training profile: the tok2vec width and depth, the rows of each hash
+# embedding table and the width of the hidden layer of the entity parser. 'default' is spaCy's own
+# NER model; descriptions are short and have few labels, which 'fast' trades some capacity for
+NER_PROFILES = {
+    'default': {'width': 96, 'depth': 4, 'embed_size': 2000, 'hidden_width': 64},
+    'fast': {'width': 32, 'depth': 1, 'embed_size': 500, 'hidden_width': 32},
+    'accurate': {'width': 128, 'depth': 6, 'embed_size': 5000, 'hidden_width': 128},
+}
+
+
+# Units that are attached to the number before them
+UNIT_PATTERN = r'(mm|cm|m|kg|g)'
+
+# A dimension number with or without a decimal comma
+NUMBER_PATTERN = r'(\d+,\d+|\d+)'
+
+# Patterns of preprocess_dimensions, compiled once. The passes must run in this order: each one removes
+# whitespace a later one would otherwise match on, so they cannot be folded into one alternation.
+
+# Removes the spaces around '*' between numbers, e.g. '9,99 * 1500' becomes '9,99*1500'
+STAR_SPACES_PATTERN = re.compile(r'(\d+)\s*\*\s*(\d+)')
+
+# Joins three-part dimensions with decimal commas and their unit, e.g. '1,50 x 1350,00 x 2850,00 mm'
+THREE_DIM_PATTERN = re.compile(r'(\d+,\d+)\s*x\s*(\d+,\d+)\s*x\s*(\d+,\d+)\s*' + UNIT_PATTERN + '?')
+
+# Joins two-part dimensions and their unit, e.g. '9,99 x 1500 mm' becomes '9,99x1500mm'
+TWO_DIM_WITH_UNIT_PATTERN = re.compile(NUMBER_PATTERN + r'\s*x\s*' + NUMBER_PATTERN + r'\s*' + UNIT_PATTERN + '?')
+
+# Joins two-part dimensions ending in a decimal comma, e.g. '1,50 x 1500,00' becomes '1,50x1500,00'
+TWO_DIM_NO_UNIT_PATTERN = re.compile(NUMBER_PATTERN + r'\s*x\s*(\d+,\d+)')
+
+# Joins '*' dimensions and their unit, e.g. '1,50 * 1500 mm' becomes '1,50*1500mm'
+TWO_DIM_STAR_WITH_UNIT_PATTERN = re.compile(NUMBER_PATTERN + r'\s*\*\s*(\d+)\s*' + UNIT_PATTERN + '?')
+
+# Joins '*' dimensions without a unit, e.g. '1,50 * 1500' becomes '1,50*1500'
+TWO_DIM_STAR_NO_UNIT_PATTERN = re.compile(NUMBER_PATTERN + r'\s*\*\s*(\d+)')
+
+# Attaches a unit to the number before it, e.g. '1250,00 mm' becomes '1250,00mm'
+SINGLE_DIM_WITH_UNIT_PATTERN = re.compile(NUMBER_PATTERN + r'\s*' + UNIT_PATTERN)
+
+# Separates a dimension from the text after it, e.g. '1250x1500AFP' becomes '1250x1500 AFP'
+TRAILING_TEXT_PATTERN = re.compile(r'(\d+x\d+)(\s*)([A-Za-z])')
 
 
 def preprocess_dimensions(text: str) -> str:
@@ -22,55 +96,33 @@ def preprocess_dimensions(text: str) -> str:
     str: The preprocessed text.
     """
     try:
-        # Replace patterns like '9,99 * 1500' by removing spaces around '*'
-        # This ensures dimensions like '9,99 * 1500' are standardized as '9,99*1500'
-        text = re.sub(r'(\d+,\d+)\s*\*\s*(\d+)', r'\1*\2', text)
-
-        # Replace patterns like '9 * 1500' by removing spaces around '*'
-        # This ensures dimensions like '9 * 1500' are standardized as '9*1500'
-        text = re.sub(r'(\d+)\s*\*\s*(\d+)', r'\1*\2', text)
-
-        # Handle three-part dimensions with 'x' separators (e.g., '1,50 x 1350,00 x 2850,00')
-        # The regex matches three comma-separated dimensions and attaches optional units like mm, cm, m, etc.
-        three_dim_pattern = r'(\d+,\d+)\s*x\s*(\d+,\d+)\s*x\s*(\d+,\d+)\s*(mm|cm|m|kg|g)?'
-        text = re.sub(three_dim_pattern, r'\1x\2x\3\4', text)
-
-        # Handle two-part dimensions with 'x' separator, and ensure units like mm/cm/m are attached correctly
-        # This ensures patterns like '9,99 x 1500 mm' are normalized without extra spaces (e.g., '9,99x1500mm')
-        two_dim_with_unit_pattern = r'(\d+,\d+|\d+)\s*x\s*(\d+,\d+|\d+)\s*(mm|cm|m|kg|g)?'
-        text = re.sub(two_dim_with_unit_pattern, r'\1x\2\3', text)
-
-        # Handle two-part dimensions without units (e.g., '1,50 x 1500')
-        # This ensures dimensions like '1,50 x 1500' are standardized as '1,50x1500'
-        two_dim_no_unit_pattern = r'(\d+,\d+|\d+)\s*x\s*(\d+,\d+)'
-        text = re.sub(two_dim_no_unit_pattern, r'\1x\2', text)
-
-        # Handle dimensions with '*' separator and units attached
-        # For example, it converts '1,50 * 1500 mm' to '1,50*1500mm'
-        two_dim_star_with_unit_pattern = r'(\d+,\d+|\d+)\s*\*\s*(\d+)\s*(mm|cm|m|kg|g)?'
-        text = re.sub(two_dim_star_with_unit_pattern, r'\1*\2\3', text)
-
-        # Handle dimensions with '*' separator but no unit attached
-        # For example, it converts '1,50 * 1500' to '1,50*1500'
-        two_dim_star_no_unit_pattern = r'(\d+,\d+|\d+)\s*\*\s*(\d+)'
-        text = re.sub(two_dim_star_no_unit_pattern, r'\1*\2', text)
-
-        # Handle single-part dimension followed by a unit, ensuring no space between the number and unit
-        # For example, '1250,00 mm' is converted to '1250,00mm'
-        single_dim_with_unit_pattern = r'(\d+,\d+|\d+)\s*(mm|cm|m|kg|g)'
-        text = re.sub(single_dim_with_unit_pattern, r'\1\2', text)
-
-        # Remove any space before units like mm, cm, or m if there is a number followed by a space
-        # For example, '1250 mm' becomes '1250mm'
-        text = re.sub(r'(\d)\s+(?=mm|cm|m)', r'\1', text)
-
-        # Ensure that a space exists between the last dimension and any trailing text part
-        # For example, '1250x1500AFP' is converted to '1250x1500 AFP'
-        text = re.sub(r'(\d+x\d+)(\s*)([A-Za-z])', r'\1 \3', text)
+        # Passes that only rewrite '*', 'x' or decimal commas are skipped for texts without them
+        has_star = '*' in text
+        has_comma = ',' in text
+
+        if has_star:
+            text = STAR_SPACES_PATTERN.sub(r'\1*\2', text)
+
+        if 'x' in text:
+            if has_comma:
+                text = THREE_DIM_PATTERN.sub(r'\1x\2x\3\4', text)
+            text = TWO_DIM_WITH_UNIT_PATTERN.sub(r'\1x\2\3', text)
+            if has_comma:
+                text = TWO_DIM_NO_UNIT_PATTERN.sub(r'\1x\2', text)
+
+        if has_star:
+            text = TWO_DIM_STAR_WITH_UNIT_PATTERN.sub(r'\1*\2\3', text)
+            text = TWO_DIM_STAR_NO_UNIT_PATTERN.sub(r'\1*\2', text)
+
+        # This also removes the space between a number and a following 'mm', 'cm' or 'm'
+        text = SINGLE_DIM_WITH_UNIT_PATTERN.sub(r'\1\2', text)
+
+        if 'x' in text:
+            text = TRAILING_TEXT_PATTERN.sub(r'\1 \3', text)
 
         # Replace '*' with 'x' to ensure consistency in the final output
-        # For example, '1250*1500' becomes '1250x1500'
-        text = text.replace('*', 'x')
+        if has_star:
+            text = text.replace('*', 'x')
 
         return text
     except Exception as e:
@@ -78,51 +130,256 @@ def preprocess_dimensions(text: str) -> str:
         return text  # Return the original text if an error occurs
 
 
-@Language.component("merge_hyphenated_words")
-def merge_hyphenated_words(doc: spacy.tokens.Doc) -> spacy.tokens.Doc:
+def preprocess_dimensions_series(texts: pd.Series) -> pd.Series:
     """
-    Merges hyphenated words and certain patterns in the document.
+    Applies `preprocess_dimensions` to a column of texts, preprocessing each distinct text only once.
+    Supplier descriptions repeat a lot, so this is much faster than preprocessing row by row.
 
     Parameters:
-    doc (spacy.tokens.Doc): The document to process.
+    texts (pd.Series): The texts to preprocess. Missing values stay missing.
 
     Returns:
-    spacy.tokens.Doc: The processed document with merged tokens.
+    pd.Series: The preprocessed texts, with the index of `texts`.
     """
-    try:
-        matcher = Matcher(doc.vocab)
-        pattern = [{"TEXT": {"REGEX": "^[a-zA-Z0-9]+$"}}, {"ORTH": "-"}, {"TEXT": {"REGEX": "^[a-zA-Z0-9]+$"}}]
-        plus_pattern = [{"ORTH": "+"}, {"TEXT": {"REGEX": "^[a-zA-Z0-9]+$"}}]
-        slash_pattern = [{"TEXT": {"REGEX": "^[a-zA-Z0-9]+$"}}, {"ORTH": "/"}]
-
-        matcher.add("PLUS_ALPHANUMERIC", [plus_pattern])
-        matcher.add("SLASH_PATTERN", [slash_pattern])
-        matcher.add("HYPHENATED", [pattern])
-        matches = matcher(doc)
-        with doc.retokenize() as retokenizer:
-            for match_id, start, end in matches:
-                span = doc[start:end]
-                retokenizer.merge(span)
-        return doc
-    except Exception as e:
-        logging.error(f"Error merging hyphenated words: {e}")
-        return doc
+    distinct = texts.dropna().unique()
+    return texts.map(dict(zip(distinct, map(preprocess_dimensions, distinct))))
+
+
+# Alphanumeric token of the merge patterns
+ALPHANUMERIC_TOKEN = {"TEXT": {"REGEX": "^[a-zA-Z0-9]+$"}}
+
+# Token patterns merge_hyphenated_words merges into one token, e.g. '+Z140', 'G7/' and 'Ma-C'
+MERGE_PATTERNS = {
+    "PLUS_ALPHANUMERIC": [{"ORTH": "+"}, ALPHANUMERIC_TOKEN],
+    "SLASH_PATTERN": [ALPHANUMERIC_TOKEN, {"ORTH": "/"}],
+    "HYPHENATED": [ALPHANUMERIC_TOKEN, {"ORTH": "-"}, ALPHANUMERIC_TOKEN],
+}
+
+# How merge_hyphenated_words merges tokens: by retokenizing the matches of MERGE_PATTERNS, or by
+# changing the tokenizer rules so the tokens are never split in the first place
+MERGE_MODES = ('matcher', 'tokenizer')
+
+
+def use_merge_tokenizer_rules(nlp: spacy.Language) -> None:
+    """
+    Changes the tokenizer rules of a pipeline so it keeps '+Z140' and 'Ma-C' as one token and splits
+    'a/b' into 'a/' and 'b', which is what merging the MERGE_PATTERNS matches does. The rules are
+    saved with the pipeline.
+
+    Parameters:
+    nlp (spacy.Language): The pipeline whose tokenizer to change.
+    """
+    hyphen_infix = r"(?<=[{a}0-9])(?:{h})(?=[{a}])".format(a=ALPHA, h=HYPHENS)
+    slash_infix = r"(?<=[{a}0-9])[:<>=/](?=[{a}])".format(a=ALPHA)
+
+    # '+' is no longer split off alphanumerics and '-' no longer between them
+    prefixes = [r"\+(?![a-zA-Z0-9])" if prefix == r"\+(?![0-9])" else prefix for prefix in nlp.Defaults.prefixes]
+    infixes = [infix for infix in nlp.Defaults.infixes if infix != hyphen_infix]
+
+    # '/' between alphanumerics and letters stays with the token before it
+    infixes = [r"(?<=[{a}0-9])[:<>=](?=[{a}])".format(a=ALPHA) if infix == slash_infix else infix
+               for infix in infixes]
+    infixes.append(r"(?<=[{a}0-9]/)(?=[{a}])".format(a=ALPHA))
+
+    nlp.tokenizer.prefix_search = compile_prefix_regex(prefixes).search
+    nlp.tokenizer.infix_finditer = compile_infix_regex(infixes).finditer
+
+
+class MergeHyphenatedWords:
+    """
+    Pipeline component that merges hyphenated words and certain patterns in a document. Its matcher
+    is compiled once, when the pipeline is built; in 'tokenizer' mode the tokenizer already produces
+    the merged tokens and the component leaves documents as they are.
+    """
+
+    def __init__(self, nlp: spacy.Language, mode: str = 'matcher'):
+        if mode not in MERGE_MODES:
+            raise ValueError(f"Unknown merge mode '{mode}'. Known modes: {list(MERGE_MODES)}")
+        self.mode = mode
+        self.matcher = None
+
+        if mode == 'tokenizer':
+            use_merge_tokenizer_rules(nlp)
+        else:
+            self.matcher = Matcher(nlp.vocab)
+            for label, pattern in MERGE_PATTERNS.items():
+                self.matcher.add(label, [pattern])
+
+    def __call__(self, doc: spacy.tokens.Doc) -> spacy.tokens.Doc:
+        """
+        Merges hyphenated words and certain patterns in the document.
+
+        Parameters:
+        doc (spacy.tokens.Doc): The document to process.
+
+        Returns:
+        spacy.tokens.Doc: The processed document with merged tokens.
+        """
+        if self.matcher is None:
+            return doc
+        try:
+            matches = self.matcher(doc)
+            with doc.retokenize() as retokenizer:
+                for match_id, start, end in matches:
+                    span = doc[start:end]
+                    retokenizer.merge(span)
+            return doc
+        except Exception as e:
+            logging.error(f"Error merging hyphenated words: {e}")
+            return doc
+
+
+@Language.factory("merge_hyphenated_words", default_config={"mode": "matcher"})
+def create_merge_hyphenated_words(nlp: spacy.Language, name: str, mode: str) -> MergeHyphenatedWords:
+    """
+    Builds the merge_hyphenated_words component of a pipeline.
+
+    Parameters:
+    nlp (spacy.Language): The pipeline.
+    name (str): The name of the component.
+    mode (str): One of MERGE_MODES.
+
+    Returns:
+    MergeHyphenatedWords: The component.
+    """
+    return MergeHyphenatedWords(nlp, mode)
+
+
+def ner_model_config(profile: str = 'default') -> dict:
+    """
+    Builds the model config of the NER component for a training profile.
+
+    Parameters:
+    profile (str): The name of the profile, one of NER_PROFILES.
+
+    Returns:
+    dict: The config to pass as the "model" of the NER component.
+    """
+    if profile not in NER_PROFILES:
+        raise ValueError(f"Unknown training profile '{profile}'. Known profiles: {list(NER_PROFILES)}")
+    sizes = NER_PROFILES[profile]
+    return {
+        "@architectures": "spacy.TransitionBasedParser.v2",
+        "state_type": "ner",
+        "extra_state_tokens": False,
+        "hidden_width": sizes['hidden_width'],
+        "maxout_pieces": 2,
+        "use_upper": True,
+        "nO": None,
+        "tok2vec": {
+            "@architectures": "spacy.HashEmbedCNN.v2",
+            "pretrained_vectors": None,
+            "width": sizes['width'],
+            "depth": sizes['depth'],
+            "embed_size": sizes['embed_size'],
+            "window_size": 1,
+            "maxout_pieces": 3,
+            "subword_features": True,
+        },
+    }
+
+
+def split_training_data(train_data: list, dev_fraction: float = DEFAULT_DEV_FRACTION,
+                        seed: int = 0) -> Tuple[list, list]:
+    """
+    Shuffles the training data with a fixed seed and holds out a share of it for evaluation.
+
+    Parameters:
+    train_data (list): A list of tuples containing text and labels.
+    dev_fraction (float): The share of the examples to hold out.
+    seed (int): The seed of the shuffle.
+
+    Returns:
+    Tuple[list, list]: The training examples and the held-out examples.
+    """
+    shuffled = list(train_data)
+    random.Random(seed).shuffle(shuffled)
+    dev_size = max(1, round(len(shuffled) * dev_fraction))
+    return shuffled[dev_size:], shuffled[:dev_size]
+
+
+def make_examples(nlp: spacy.Language, data: list) -> List[Example]:
+    """
+    Builds evaluation examples, labeling the tokens of each text in order like the training does.
+
+    Parameters:
+    nlp (spacy.Language): The pipeline whose tokenizer splits the texts.
+    data (list): A list of tuples containing text and labels.
+
+    Returns:
+    List[Example]: The examples, with the labeled text as reference.
+    """
+    examples = []
+    for text, labels in data:
+        doc = nlp.make_doc(text)
+        entities = [(token.idx, token.idx + len(token), label) for token, label in zip(doc, labels)]
+        examples.append(Example.from_dict(doc, {"entities": entities}))
+    return examples
 
 
-def train_ner_model(train_data: list) -> spacy.Language:
+def length_bucketed_batches(examples: List[Example],
+                            batch_sizes: Tuple[float, float, float] = DEFAULT_BATCH_SIZES) -> List[List[Example]]:
     """
-    Trains an NER model using the provided training data.
+    Splits training examples into minibatches of growing size for an epoch. Each batch holds
+    descriptions of about the same length, so little of it is padding, and the batches come in a
+    random order.
+
+    Parameters:
+    examples (List[Example]): The training examples.
+    batch_sizes (Tuple[float, float, float]): The first and largest batch size and the rate the size
+    compounds at from batch to batch.
+
+    Returns:
+    List[List[Example]]: The minibatches.
+    """
+    # Shuffling first puts examples of the same length in a random order within their bucket
+    examples = random.sample(examples, len(examples))
+    examples.sort(key=lambda example: len(example.predicted))
+    batches = list(minibatch(examples, size=compounding(*batch_sizes)))
+    random.shuffle(batches)
+    return batches
+
+
+def train_ner_model(train_data: list, merge_mode: str = 'matcher', profile: str = 'default',
+                    output_dir: Optional[str] = None, dropout: float = DEFAULT_DROPOUT,
+                    batch_sizes: Tuple[float, float, float] = DEFAULT_BATCH_SIZES,
+                    max_epochs: int = DEFAULT_MAX_EPOCHS, patience: int = DEFAULT_PATIENCE,
+                    corpus_path: str = "./train.spacy",
+                    epoch_callback: Optional[Callable[[int, spacy.Language, Dict[str, float]], bool]] = None,
+                    dev_data: Optional[list] = None, checkpoint_dir: Optional[str] = None,
+                    resume: bool = False) -> spacy.Language:
+    """
+    Trains an NER model using the provided training data. With dev data, training stops once the dev
+    F1 stops improving and the model of the epoch with the best dev F1 is saved; otherwise it stops
+    once the loss stops falling and the model of the last epoch is saved.
 
     Parameters:
     train_data (list): A list of tuples containing text and labels for training.
+    merge_mode (str): How the merge_hyphenated_words component merges tokens, one of MERGE_MODES.
+    profile (str): The size of the NER model, one of NER_PROFILES.
+    output_dir (Optional[str]): The directory to save the model to. Defaults to `get_model_dir()`.
+    dropout (float): The dropout rate of the updates.
+    batch_sizes (Tuple[float, float, float]): The first and largest minibatch size and the rate the
+    size compounds at.
+    max_epochs (int): The largest number of passes over the training data.
+    patience (int): The number of epochs without a better dev F1, or without a lower loss when there
+    is no dev data, after which training stops.
+    corpus_path (str): The path to write the annotated training corpus to.
+    epoch_callback (Optional[Callable[[int, spacy.Language, Dict[str, float]], bool]]): Called after
+    each epoch with its number, the model and the losses. Training stops when it returns True.
+    dev_data (Optional[list]): Held-out tuples of text and labels to score every epoch on.
+    checkpoint_dir (Optional[str]): The directory to save a checkpoint to after every epoch, with the
+    weights, the optimizer state and the random number generator states. Only the checkpoints of the
+    last and of the best epoch are kept.
+    resume (bool): Whether to continue from the last checkpoint in checkpoint_dir instead of starting over.
 
     Returns:
     spacy.Language: The trained spaCy NER model.
     """
     try:
         nlp = spacy.blank("en")
-        nlp.add_pipe("merge_hyphenated_words")
-        ner = nlp.add_pipe("ner")
+        nlp.add_pipe("merge_hyphenated_words", config={"mode": merge_mode})
+        ner = nlp.add_pipe("ner", config={"model": ner_model_config(profile)})
 
         db = DocBin()
 
@@ -138,52 +395,75 @@ def train_ner_model(train_data: list) -> spacy.Language:
             doc.ents = ents
             db.add(doc)
 
-        db.to_disk("./train.spacy")
+        db.to_disk(corpus_path)
+
+        # Convert the corpus to examples once, from the annotated documents of the DocBin
+        examples = [Example(nlp.make_doc(doc.text), doc) for doc in db.get_docs(nlp.vocab)]
 
         for text, labels in train_data:
             for label in labels:
                 ner.add_label(label)
 
         optimizer = nlp.begin_training()
-        best_loss = float('inf')
-        patience = 5
-        patience_counter = 0
-
-        for itn in range(50):
-            random.shuffle(train_data)
+        dev_examples = make_examples(nlp, dev_data) if dev_data else None
+        metric = 'dev F1' if dev_examples else 'loss'
+
+        # Epochs are scored on the dev F1, or on the negated loss without dev data
+        state = {'epoch': 0, 'best_epoch': 0, 'best_score': None, 'patience_counter': 0, 'scores': []}
+        checkpoint = latest_checkpoint(checkpoint_dir) if checkpoint_dir and resume else None
+        if checkpoint is not None:
+            state = load_checkpoint(checkpoint, nlp, optimizer)
+        elif checkpoint_dir and os.path.isdir(checkpoint_dir):
+            # The checkpoints of an earlier run must not be resumed from or promoted
+            prune_checkpoints(checkpoint_dir, keep=())
+        best_weights = None
+
+        start = state['epoch'] if state['patience_counter'] < patience else max_epochs
+        for itn in range(start, max_epochs):
             losses = {}
-            batches = minibatch(train_data, size=compounding(4.0, 32.0, 1.001))
-
-            for batch in batches:
-                texts, labels = zip(*batch)
-                examples = []
-                for text, label in zip(texts, labels):
-                    doc = nlp.make_doc(text)
-                    ents = []
-                    for i, token in enumerate(doc):
-                        if i < len(label):
-                            ents.append((token.idx, token.idx + len(token), label[i]))
-                        spans = [doc.char_span(start, end, label=l) for start, end, l in ents]
-                        doc.ents = [span for span in spans if span is not None]
-                        examples.append(
-                            Example.from_dict(doc, {
-                                "entities": [(ent.start_char, ent.end_char, ent.label_) for ent in doc.ents]}))
-                    nlp.update(examples, sgd=optimizer, drop=0.35, losses=losses)
+            for batch in length_bucketed_batches(examples, batch_sizes):
+                nlp.update(batch, sgd=optimizer, drop=dropout, losses=losses)
+            forget_model_fingerprint(nlp)
 
             logging.info(f"Iteration {itn + 1}, Losses: {losses}")
-
-            current_loss = sum(losses.values())
-            if current_loss < best_loss:
-                best_loss = current_loss
-                patience_counter = 0
+            stopped = epoch_callback is not None and epoch_callback(itn + 1, nlp, losses)
+
+            score = nlp.evaluate(dev_examples)['ents_f'] if dev_examples else -sum(losses.values())
+            state['scores'].append(score)
+            if state['best_score'] is None or score > state['best_score']:
+                state.update(best_epoch=itn + 1, best_score=score, patience_counter=0)
+                if dev_examples and not checkpoint_dir:
+                    best_weights = nlp.to_bytes()
             else:
-                patience_counter += 1
+                state['patience_counter'] += 1
+
+            if checkpoint_dir:
+                save_checkpoint(checkpoint_dir, itn + 1, nlp, optimizer, state)
+                prune_checkpoints(checkpoint_dir, keep=(itn + 1, state['best_epoch']))
 
-            if patience_counter >= patience:
-                logging.info("Early stopping: No improvement in loss for the last 5 iterations.")
+            if stopped:
+                logging.info(f"Early stopping: Stopped by the epoch callback after iteration {itn + 1}.")
                 break
 
-        nlp.to_disk("./ner_model")
+            if state['patience_counter'] >= patience:
+                logging.info(f"Early stopping: No improvement in {metric} for the last {patience} iterations.")
+                break
+
+        if dev_examples and state['best_epoch']:
+            # Promote the best epoch rather than the last one
+            if checkpoint_dir:
+                nlp.from_disk(os.path.join(checkpoint_path(checkpoint_dir, state['best_epoch']), 'model'))
+            elif best_weights is not None:
+                nlp.from_bytes(best_weights)
+            logging.info(f"Saving the model of iteration {state['best_epoch']} with dev F1 {state['best_score']:.3f}")
+
+        nlp.to_disk(output_dir or get_model_dir())
+
+        # Entities cached for the previous model are stale now, and so is the fingerprint of a
+        # resumed or promoted model
+        forget_model_fingerprint(nlp)
+        if output_dir is None:
+            clear_entity_cache()
         return nlp
     except Exception as e:
         logging.error(f"Error training NER model: {e}")
@@ -212,65 +492,263 @@ def combine_dataframes(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
     return combined_df
 
 
-def extract_entities_from_csv(nlp: spacy.Language, csv_path: str, output_path: str) -> None:
+# Column order of the entity output
+column_order = [
+    'article id', 'MATERIAL_NAME', 'weight', 'quantity', 'material',
+    'MATERIAL_GRADE', 'COATING_TYPE', 'FINISH_TYPE', 'DIMENSION', 'thickness_mm', 'width_mm', 'length_mm',
+    'ADDITIONAL_SPEC'
+]
+
+
+def doc_entities(doc: spacy.tokens.Doc) -> Dict[str, str]:
+    """
+    Collects the entities of a processed document, joining the texts of repeated labels with spaces.
+
+    Parameters:
+    doc (spacy.tokens.Doc): The processed document.
+
+    Returns:
+    Dict[str, str]: The entity text of each label.
+    """
+    entities = {}
+    for ent in doc.ents:
+        entities.setdefault(ent.label_, []).append(ent.text)
+    return {label: ' '.join(texts) for label, texts in entities.items()}
+
+
+def pipe_entities(nlp: spacy.Language, texts: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                  n_process: int = 1, rules: Optional[RuleFastPath] = None) -> List[Dict[str, str]]:
+    """
+    Runs the NER model over texts in batches with `nlp.pipe`, collecting the entities of each text.
+
+    Parameters:
+    nlp (spacy.Language): The trained spaCy NER model.
+    texts (Iterable[str]): The texts to process.
+    batch_size (int): The number of texts the model processes at a time.
+    n_process (int): The number of processes to run the model in. -1 uses every CPU.
+    rules (Optional[RuleFastPath]): If set, texts these rules fully resolve take their entities from
+    the rules and skip the model.
+
+    Returns:
+    List[Dict[str, str]]: The entities of each text, in the order of the texts, with the texts of
+    repeated labels joined.
+    """
+    if rules is None:
+        return [doc_entities(doc) for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process)]
+
+    texts = list(texts)
+    records = rules.resolve_all(texts)
+    leftover = [text for text, entities in zip(texts, records) if entities is None]
+    model_docs = nlp.pipe(leftover, batch_size=batch_size, n_process=n_process)
+    return [entities if entities is not None else doc_entities(next(model_docs)) for entities in records]
+
+
+def cached_pipe_entities(nlp: spacy.Language, texts: List[str], cache: EntityCache,
+                         batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = 1,
+                         rules: Optional[RuleFastPath] = None) -> List[Dict[str, str]]:
+    """
+    Counterpart of `pipe_entities` that runs the model only on the distinct texts it never saw before,
+    taking the entities of the others from the entity cache.
+
+    Parameters:
+    nlp (spacy.Language): The trained spaCy NER model.
+    texts (List[str]): The texts to process.
+    cache (EntityCache): The entity cache.
+    batch_size (int): The number of texts the model processes at a time.
+    n_process (int): The number of processes to run the model in. -1 uses every CPU.
+    rules (Optional[RuleFastPath]): If set, texts these rules fully resolve skip the model.
+
+    Returns:
+    List[Dict[str, str]]: The entities of each text, in the order of the texts.
+    """
+    # Entities found with the rules are cached apart from the model's own
+    fingerprint = f"{model_fingerprint(nlp)}+format{ENTITY_FORMAT_VERSION}"
+    fingerprint += f"+rules{RULES_VERSION}" if rules is not None else ''
+    found = cache.get_many(fingerprint, texts)
+
+    new_texts = [text for text in dict.fromkeys(texts) if text not in found]
+    rule_hits = rules.hits if rules is not None else 0
+    new_records = dict(zip(new_texts, pipe_entities(nlp, new_texts, batch_size=batch_size,
+                                                             n_process=n_process, rules=rules)))
+    rule_hits = rules.hits - rule_hits if rules is not None else 0
+    cache.put_many(fingerprint, new_records)
+    found.update(new_records)
+
+    logging.info(f"Of {len(found)} distinct materials, the entity cache served {len(found) - len(new_texts)}, "
+                 f"the rules resolved {rule_hits} and {len(new_texts) - rule_hits} went to the model.")
+    return [found[text] for text in texts]
+
+
+def extract_entities(nlp: Optional[spacy.Language], df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE,
+                     n_process: int = 1, cache: Optional[EntityCache] = None, use_rules: bool = False) -> pd.DataFrame:
+    """
+    Applies the trained NER model to extract entities from the 'material' column of a DataFrame,
+    then merges the results back into it, preserving all rows.
+
+    Parameters:
+    nlp (Optional[spacy.Language]): The trained spaCy NER model. Defaults to the saved model.
+    df (pd.DataFrame): The combined supplier data.
+    batch_size (int): The number of materials the model processes at a time.
+    n_process (int): The number of processes to run the model in. -1 uses every CPU.
+    cache (Optional[EntityCache]): If set, materials whose entities are cached for this model skip the model.
+    use_rules (bool): Whether materials the rule fast path fully resolves skip the model.
+
+    Returns:
+    pd.DataFrame: The DataFrame with the entity columns, in `column_order`.
+    """
+    nlp = get_model(nlp)
+    # Add the missing columns with empty strings
+    df['ADDITIONAL_SPEC'] = ''
+    df['FINISH_TYPE'] = ''
+
+    # Stream the preprocessed materials through the model in batches, keeping the row order
+    materials = df['material'].dropna()
+    texts = preprocess_dimensions_series(materials).tolist()
+    rules = RuleFastPath() if use_rules else None
+    if cache is not None:
+        records = cached_pipe_entities(nlp, texts, cache, batch_size=batch_size, n_process=n_process, rules=rules)
+    else:
+        records = pipe_entities(nlp, texts, batch_size=batch_size, n_process=n_process, rules=rules)
+    entities = pd.DataFrame(records, index=materials.index)
+
+    # Labels without an output column would be lost by the reordering below
+    unknown = entities.columns.difference(column_order)
+    if len(unknown):
+        counts = entities[unknown].notna().sum()
+        logging.warning(f"Entities of labels missing from the column order are not written: {counts.to_dict()}")
+
+    # Overwrite the rows with the extracted entities in one step, keeping the other values
+    labels = entities.columns.intersection(column_order)
+    entities = entities.reindex(index=df.index, columns=labels)
+    df[labels] = entities.where(entities.notna(), df.reindex(columns=labels).astype(object))
+
+    # Ensure all columns are present in final_df before reordering
+    return df.reindex(columns=column_order)
+
+
+def read_csv_measures(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gives the measures of a CSV frame read as text their canonical dtypes. Types inferred by pandas
+    would depend on the rows read together, so every CSV input goes through here whether it is read
+    whole or in chunks, and the output does not depend on the chunk size.
+
+    Parameters:
+    df (pd.DataFrame): The frame, read with dtype=str.
+
+    Returns:
+    pd.DataFrame: The frame with its numeric columns validated.
+    """
+    for column in NUMERIC_COLUMNS:
+        if column in df:
+            df, _ = validate_numeric_column(df, column, CANONICAL_SCHEMA[column])
+    return df
+
+
+def extract_entities_from_csv(nlp: Optional[spacy.Language], csv_path: str, output_path: str,
+                              batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = 1,
+                              cache: Optional[EntityCache] = None, use_rules: bool = False,
+                              chunk_size: Optional[int] = None) -> None:
     """
     Applies the trained NER model to extract entities from the 'material' column of a CSV file,
     then merges the results back into the original DataFrame, preserving all rows.
 
+    With a chunk size, the file is read and processed that many rows at a time and each chunk is
+    appended to the output as soon as it is done, so memory stays flat whatever the file size and a
+    failure keeps the chunks written before it.
+
     Parameters:
-    nlp (spacy.Language): The trained spaCy NER model.
+    nlp (Optional[spacy.Language]): The trained spaCy NER model. Defaults to the saved model.
     csv_path (str): The path to the CSV file to process.
     output_path (str): The path to save the CSV file with extracted entities.
+    batch_size (int): The number of materials the model processes at a time.
+    n_process (int): The number of processes to run the model in. -1 uses every CPU.
+    cache (Optional[EntityCache]): If set, materials whose entities are cached for this model skip the model.
+    use_rules (bool): Whether materials the rule fast path fully resolves skip the model.
+    chunk_size (Optional[int]): The number of rows to process at a time. Defaults to the whole file.
     """
     try:
-        nlp = spacy.load("./ner_model")
-        df = pd.read_csv(csv_path)
-        print(df.columns)
-        # Add the missing columns with empty strings
-        df['ADDITIONAL_SPEC'] = ''
-        df['FINISH_TYPE'] = ''
-        print(df.columns)
-
-        # Iterate over each row in the DataFrame
-        for index, row in df.iterrows():
-            if pd.notna(row['material']):
-                # Preprocess the material column
-                material = preprocess_dimensions(row['material'])
-
-                # Apply the NER model
-                doc = nlp(material)
-                entities = {}
-
-                for ent in doc.ents:
-                    if ent.label_ in entities:
-                        entities[ent.label_] += f" {ent.text}"
-                    else:
-                        entities[ent.label_] = f" {ent.text}"
-
-                # Update the row with extracted entities
-                for label, value in entities.items():
-                    df.at[index, label] = value
-
-        # Reorder the columns as required
-        column_order = [
-            'article id', 'MATERIAL_NAME', 'weight', 'quantity', 'material',
-            'MATERIAL_GRADE', 'COATING_TYPE', 'FINISH_TYPE', 'DIMENSION', 'ADDITIONAL_SPEC'
-        ]
-
-        # Ensure all columns are present in final_df before reordering
-        final_df = df.reindex(columns=column_order)
-
-        # Save the final DataFrame to a CSV file
-        final_df.to_csv(output_path, index=False)
+        if chunk_size is None:
+            df = read_csv_measures(pd.read_csv(csv_path, dtype=str))
+            final_df = extract_entities(nlp, df, batch_size=batch_size, n_process=n_process, cache=cache,
+                                        use_rules=use_rules)
+
+            # Save the final DataFrame to a CSV file
+            final_df.to_csv(output_path, index=False)
+        else:
+            # Load the model once rather than for every chunk
+            nlp = get_model(nlp)
+            rows = 0
+            with pd.read_csv(csv_path, chunksize=chunk_size, dtype=str) as chunks:
+                for number, chunk in enumerate(chunks):
+                    final_df = extract_entities(nlp, read_csv_measures(chunk), batch_size=batch_size,
+                                                n_process=n_process, cache=cache, use_rules=use_rules)
+
+                    # The first chunk starts the file with the header, the others are appended
+                    final_df.to_csv(output_path, index=False, mode='w' if number == 0 else 'a', header=number == 0)
+                    rows += len(final_df)
+                    logging.info(f"Extracted entities of {rows} rows")
+
+            if rows == 0:
+                pd.DataFrame(columns=column_order).to_csv(output_path, index=False)
 
         logging.info(f"Entities extracted and saved to: {output_path}")
     except Exception as e:
         logging.error(f"Error extracting entities from CSV: {e}")
 
 
-def main():
+def extract_entities_from_parquet(nlp: Optional[spacy.Language], input_path: str, output_path: str,
+                                  batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = 1,
+                                  cache: Optional[EntityCache] = None, use_rules: bool = False) -> None:
+    """
+    Parquet counterpart of `extract_entities_from_csv`. Reads the partitioned combined dataset and
+    writes the entities as a dataset partitioned the same way, keeping the partition columns.
+
+    Parameters:
+    nlp (Optional[spacy.Language]): The trained spaCy NER model. Defaults to the saved model.
+    input_path (str): The directory of the combined Parquet dataset.
+    output_path (str): The directory to write the Parquet dataset with extracted entities to.
+    batch_size (int): The number of materials the model processes at a time.
+    n_process (int): The number of processes to run the model in. -1 uses every CPU.
+    cache (Optional[EntityCache]): If set, materials whose entities are cached for this model skip the model.
+    use_rules (bool): Whether materials the rule fast path fully resolves skip the model.
+    """
+    try:
+        df = read_parquet_dataset(input_path)
+        partitions = df[[column for column in PARTITION_COLUMNS if column in df]]
+
+        # Entities are written into the existing columns, which categoricals only accept for known categories
+        df = df.astype({column: object for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)})
+
+        # Keep the partition columns next to the entity columns, and the entity columns typed
+        final_df = extract_entities(nlp, df.copy(), batch_size=batch_size, n_process=n_process, cache=cache,
+                                    use_rules=use_rules)
+        final_df = final_df.join(partitions.drop(columns=final_df.columns.intersection(partitions.columns)))
+        write_parquet_dataset(apply_canonical_schema(final_df), output_path)
+
+        logging.info(f"Entities extracted and saved to: {output_path}")
+    except Exception as e:
+        logging.error(f"Error extracting entities from Parquet: {e}")
+
+
+def main(parquet: bool = False, batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = 1, use_cache: bool = False,
+         use_rules: bool = False, chunk_size: Optional[int] = None, profile: str = 'default',
+         dev_fraction: float = 0, checkpoint_dir: Optional[str] = None, resume: bool = False):
     """
     The main function that orchestrates NER training and entity extraction.
+
+    Parameters:
+    parquet (bool): Whether to read and write the partitioned Parquet datasets instead of the CSV files.
+    batch_size (int): The number of materials the model processes at a time during extraction.
+    n_process (int): The number of processes to run the model in during extraction. -1 uses every CPU.
+    use_cache (bool): Whether to reuse the entities of materials the model already processed in earlier runs.
+    use_rules (bool): Whether materials the rule fast path fully resolves skip the model.
+    chunk_size (Optional[int]): The number of CSV rows to extract entities from at a time. Defaults to the whole file.
+    profile (str): The size of the trained NER model, one of NER_PROFILES.
+    dev_fraction (float): The share of the training data held out to stop training and pick the best
+    epoch on, e.g. DEFAULT_DEV_FRACTION. 0 trains on all of it and stops on the loss.
+    checkpoint_dir (Optional[str]): The directory to save the training checkpoints to, e.g.
+    DEFAULT_CHECKPOINT_DIR. None saves none.
+    resume (bool): Whether to continue an interrupted training run from its last checkpoint in checkpoint_dir.
     """
     try:
         setup_logging()
@@ -278,16 +756,33 @@ def main():
         # Step 2: Define the training data with adjusted patterns for dimensions
         TRAIN_DATA = get_training_data()
 
-        # Train the NER model
-        nlp = train_ner_model(TRAIN_DATA)
+        # Train the NER model, holding out part of the data to pick the best epoch on if asked to
+        dev_data = None
+        if dev_fraction:
+            TRAIN_DATA, dev_data = split_training_data(TRAIN_DATA, dev_fraction)
+        nlp = train_ner_model(TRAIN_DATA, profile=profile, dev_data=dev_data, checkpoint_dir=checkpoint_dir,
+                              resume=resume)
 
         if nlp is not None:
-            # Extract entities from the CSV file and save the output
-            csv_input_path = get_file_path("final_combined_output.csv")
-            csv_output_path = get_file_path("final_combined_output_with_entities.csv")
-            extract_entities_from_csv(nlp, csv_input_path, csv_output_path)
-
-            logging.info(f"Entities extracted and saved to: {csv_output_path}")
+            cache = EntityCache() if use_cache else None
+            if parquet:
+                # Extract entities from the Parquet dataset and save the output
+                parquet_input_path = get_file_path("final_combined_output.parquet")
+                parquet_output_path = get_file_path("final_combined_output_with_entities.parquet")
+                extract_entities_from_parquet(nlp, parquet_input_path, parquet_output_path,
+                                              batch_size=batch_size, n_process=n_process, cache=cache,
+                                              use_rules=use_rules)
+
+                logging.info(f"Entities extracted and saved to: {parquet_output_path}")
+            else:
+                # Extract entities from the CSV file and save the output
+                csv_input_path = get_file_path("final_combined_output.csv")
+                csv_output_path = get_file_path("final_combined_output_with_entities.csv")
+                extract_entities_from_csv(nlp, csv_input_path, csv_output_path,
+                                          batch_size=batch_size, n_process=n_process, cache=cache,
+                                          use_rules=use_rules, chunk_size=chunk_size)
+
+                logging.info(f"Entities extracted and saved to: {csv_output_path}")
         else:
             logging.error("NER model training failed. Skipping entity extraction.")
 
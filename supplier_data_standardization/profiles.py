@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import spacy
+import pandas as pd
+from typing import List, Optional, Sequence
+from supplier_data_standardization.utils import get_training_data, setup_logging
+from supplier_data_standardization.models import get_model_dir
+from supplier_data_standardization.ner_model import DEFAULT_DEV_FRACTION, NER_PROFILES, make_examples, \
+    split_training_data, train_ner_model
+
+# Directory the models of the training profiles are saved to, next to the NER model
+DEFAULT_PROFILES_DIR = os.path.join(os.path.dirname(get_model_dir()), 'ner_profiles')
+
+
+def model_size(path: str) -> int:
+    """
+    Measures the size of a saved model.
+
+    Parameters:
+    path (str): The model directory.
+
+    Returns:
+    int: The total size of its files in bytes.
+    """
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def docs_per_second(nlp: spacy.Language, texts: List[str], docs: int = 5000, repeat: int = 3) -> float:
+    """
+    Measures the best throughput of a model on texts with `nlp.pipe`.
+
+    Parameters:
+    nlp (spacy.Language): The model.
+    texts (List[str]): The texts, repeated up to the number of documents.
+    docs (int): The number of documents per timed run.
+    repeat (int): The number of timed runs.
+
+    Returns:
+    float: The documents per second of the fastest run.
+    """
+    texts = (texts * (docs // len(texts) + 1))[:docs]
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(nlp.pipe(texts))
+        best = min(best, time.perf_counter() - start)
+    return docs / best
+
+
+def compare_profiles(profiles: Sequence[str] = ('fast', 'accurate'), train_data: Optional[list] = None,
+                     output_dir: str = DEFAULT_PROFILES_DIR, dev_fraction: float = DEFAULT_DEV_FRACTION,
+                     seed: int = 0) -> pd.DataFrame:
+    """
+    Trains a model for each profile on the same training split and compares their accuracy on the
+    held-out examples with their speed and size. The report is written to report.csv in the output
+    directory.
+
+    Parameters:
+    profiles (Sequence[str]): The training profiles to compare, from NER_PROFILES.
+    train_data (Optional[list]): A list of tuples containing text and labels. Defaults to the training data.
+    output_dir (str): The directory to save the model of each profile and the report to.
+    dev_fraction (float): The share of the examples held out for evaluation.
+    seed (int): The seed of the split and of the training.
+
+    Returns:
+    pd.DataFrame: One row per profile with its sizes, overall and per-label F1, docs/sec and size on disk.
+    """
+    train, dev = split_training_data(train_data or get_training_data(), dev_fraction, seed)
+    labels = sorted({label for _, text_labels in train + dev for label in text_labels})
+    texts = [text for text, _ in dev]
+    os.makedirs(output_dir, exist_ok=True)
+
+    rows = []
+    for profile in profiles:
+        path = os.path.join(output_dir, profile)
+        random.seed(seed)
+        spacy.util.fix_random_seed(seed)
+        nlp = train_ner_model(list(train), profile=profile, output_dir=path)
+        if nlp is None:
+            logging.error(f"Training profile '{profile}' failed, it is left out of the report.")
+            continue
+
+        scores = nlp.evaluate(make_examples(nlp, dev))
+        per_type = scores.get('ents_per_type') or {}
+        row = {'profile': profile, **NER_PROFILES[profile], 'ents_f': scores['ents_f']}
+        row.update({f"{label}_f": per_type.get(label, {}).get('f', 0.0) for label in labels})
+        row['docs_per_sec'] = docs_per_second(nlp, texts)
+        row['size_mb'] = model_size(path) / 1e6
+        rows.append(row)
+        logging.info(f"Profile '{profile}': F1 {row['ents_f']:.3f}, {row['docs_per_sec']:,.0f} docs/s, "
+                     f"{row['size_mb']:.1f} MB")
+
+    report = pd.DataFrame(rows)
+    report.to_csv(os.path.join(output_dir, 'report.csv'), index=False)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point that trains and compares the training profiles.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Compare the accuracy, speed and size of NER training profiles.")
+    parser.add_argument('profiles', nargs='*', default=['fast', 'accurate'], choices=list(NER_PROFILES),
+                        help="The training profiles to compare.")
+    parser.add_argument('--output-dir', default=DEFAULT_PROFILES_DIR,
+                        help="The directory to save the models and the report to.")
+    parser.add_argument('--dev-fraction', type=float, default=DEFAULT_DEV_FRACTION,
+                        help="The share of the training data held out for evaluation.")
+    parser.add_argument('--seed', type=int, default=0, help="The seed of the split and of the training.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    report = compare_profiles(args.profiles, output_dir=args.output_dir, dev_fraction=args.dev_fraction,
+                              seed=args.seed)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,106 @@
+import re
+import logging
+from typing import Dict, List, Optional
+
+# Version of the rule table; entities cached with an older version are not reused
+RULES_VERSION = 1
+
+# Tokens that identify an entity without ambiguity, per label, as regular expressions a whole
+# whitespace-separated token of a preprocessed description must match. The NER model only sees the
+# descriptions these do not fully cover.
+RULE_TABLE = {
+    # Steel grades such as DX51D, DC01, DD11, S235JR, S350GD or S500MC, and the product forms
+    'MATERIAL_NAME': r'DX5[1-7]D|DC0[1-6]|DD1[1-4]|S\d{3}(?:JR|J0|J2|GD|MC)|HDC|HRP',
+    # Zinc and zinc alloy coatings such as +Z140, +AZ150 or +ZM310, coating classes such as G7/7, and oiling
+    'COATING_TYPE': r'\+(?:Z|AZ|ZM|ZA|ZF)\d{2,3}|G\d{1,2}/\d{1,2}|(?i:licht|geolied|oiled)',
+    'FINISH_TYPE': r'Ma-C|Ma-O|MAC|MB',
+    # Dimensions as written by preprocess_dimensions, e.g. '1,50x1350,00x2850,00'
+    'DIMENSION': r'\d+(?:[.,]\d+)?(?:x\d+(?:[.,]\d+)?){1,2}',
+    'ADDITIONAL_SPEC': r'AFP|SLIT',
+}
+
+# Units of a dimension, either attached as in '1,00x1250,00mm' or apart as in '2,50x1500 mm'. Like the
+# tokenizer the model is trained on, the rules leave them out of the DIMENSION entity
+UNIT_TOKEN = 'mm|cm|m'
+
+RULE_PATTERN = re.compile('|'.join(f'(?P<{label}>{pattern})' + (f'(?:{UNIT_TOKEN})?' if label == 'DIMENSION' else '')
+                                   for label, pattern in RULE_TABLE.items())
+                          + f'|(?P<UNIT>{UNIT_TOKEN})')
+
+
+class RuleFastPath:
+    """
+    Deterministic pre-extractor that labels each whitespace-separated token of a preprocessed
+    description with the RULE_TABLE. Descriptions whose tokens it all labels do not need the
+    statistical model; it keeps count of how many it resolved.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.total = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of the descriptions seen so far that the rules fully resolved.
+        """
+        return self.hits / self.total if self.total else 0.0
+
+    def resolve(self, text: str) -> Optional[Dict[str, str]]:
+        """
+        Labels the tokens of a description with the rule table.
+
+        Parameters:
+        text (str): The preprocessed description.
+
+        Returns:
+        Optional[Dict[str, str]]: The entity text of each label, formatted like the entities of the
+        model, or None if some token is left for the model.
+        """
+        self.total += 1
+        entities = {}
+        previous = None
+        for token in text.split():
+            match = RULE_PATTERN.fullmatch(token)
+            if match is None:
+                return None
+
+            label = match.lastgroup
+            if label == 'UNIT':
+                # A unit is only known after a dimension
+                if previous != 'DIMENSION':
+                    return None
+                continue
+
+            entities.setdefault(label, []).append(match.group(label))
+            previous = label
+
+        if not entities:
+            return None
+        self.hits += 1
+        return {label: ' '.join(texts) for label, texts in entities.items()}
+
+    def resolve_all(self, texts: List[str]) -> List[Optional[Dict[str, str]]]:
+        """
+        Labels several descriptions and logs the fast-path hit rate.
+
+        Parameters:
+        texts (List[str]): The preprocessed descriptions.
+
+        Returns:
+        List[Optional[Dict[str, str]]]: The result of `resolve` for each description.
+        """
+        hits = self.hits
+        records = [self.resolve(text) for text in texts]
+        logging.info(f"Rule fast path resolved {self.hits - hits} of {len(texts)} materials "
+                     f"({(self.hits - hits) / len(texts) if texts else 0.0:.1%}), the rest go to the model.")
+        return records
+
+    def report(self) -> Dict[str, float]:
+        """
+        Summarizes the fast-path use so far.
+
+        Returns:
+        Dict[str, float]: The number of resolved and seen descriptions and the hit rate.
+        """
+        return {'resolved': self.hits, 'total': self.total, 'hit_rate': self.hit_rate}
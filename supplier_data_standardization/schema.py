@@ -0,0 +1,49 @@
+import logging
+import pandas as pd
+from supplier_data_standardization.utils import validate_numeric_column
+
+# Canonical dtypes of the combined supplier frame. Low-cardinality descriptive columns are categoricals,
+# measures are numeric, and free text stays as strings. Columns a frame does not have are left out.
+CANONICAL_SCHEMA = {
+    'article id': 'string',
+    'material': 'string',
+    'MATERIAL_NAME': 'category',
+    'MATERIAL_GRADE': 'category',
+    'COATING_TYPE': 'category',
+    'FINISH_TYPE': 'category',
+    'DIMENSION': 'string',
+    'thickness_mm': 'float64',
+    'width_mm': 'float64',
+    'length_mm': 'float64',
+    'ADDITIONAL_SPEC': 'string',
+    'weight': 'float64',
+    'quantity': 'Int64',
+    'sheet': 'category',
+    'source': 'category',
+}
+
+# Columns of the canonical schema that hold numbers
+NUMERIC_COLUMNS = [column for column, dtype in CANONICAL_SCHEMA.items() if pd.api.types.is_numeric_dtype(dtype)]
+
+
+def apply_canonical_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts the columns of a supplier frame to the canonical schema. Numeric columns are validated with
+    `validate_numeric_column`, so values that are not numbers become missing and are reported.
+
+    Parameters:
+    df (pd.DataFrame): The frame to cast.
+
+    Returns:
+    pd.DataFrame: The frame with canonical dtypes. Columns outside the schema are kept as they are.
+    """
+    for column in NUMERIC_COLUMNS:
+        if column in df:
+            df, _ = validate_numeric_column(df, column, CANONICAL_SCHEMA[column])
+
+    other_dtypes = {column: dtype for column, dtype in CANONICAL_SCHEMA.items()
+                    if column in df and column not in NUMERIC_COLUMNS}
+    df = df.astype(other_dtypes)
+
+    logging.info("Canonical schema applied successfully.")
+    return df
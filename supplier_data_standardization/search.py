@@ -0,0 +1,220 @@
+import os
+import sys
+import time
+import random
+import shutil
+import logging
+import argparse
+import itertools
+import threading
+import multiprocessing
+import spacy
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from supplier_data_standardization.utils import get_training_data, setup_logging
+from supplier_data_standardization.models import get_model_dir
+from supplier_data_standardization.entity_cache import clear_entity_cache
+from supplier_data_standardization.ner_model import (DEFAULT_BATCH_SIZES, DEFAULT_DEV_FRACTION, DEFAULT_DROPOUT,
+                                                     DEFAULT_MAX_EPOCHS, DEFAULT_PATIENCE, make_examples,
+                                                     split_training_data, train_ner_model)
+
+# Directory the candidate models and the leaderboard are saved to, next to the NER model
+DEFAULT_SEARCH_DIR = os.path.join(os.path.dirname(get_model_dir()), 'ner_search')
+
+# Values the search draws candidate training settings from
+SEARCH_SPACE = {
+    'profile': ['fast', 'default'],
+    'dropout': [0.1, 0.2, DEFAULT_DROPOUT, 0.5],
+    'batch_sizes': [DEFAULT_BATCH_SIZES, (8.0, 32.0, 1.001), (2.0, 16.0, 1.001)],
+    'max_epochs': [DEFAULT_MAX_EPOCHS],
+    'patience': [3, DEFAULT_PATIENCE],
+}
+
+# Number of candidates the search trains by default
+DEFAULT_CANDIDATES = 8
+
+# A candidate is stopped once its best dev F1 trails the best of all candidates at the same epoch by
+# more than this margin, but not before it trained for MIN_EPOCHS epochs
+PRUNE_MARGIN = 0.15
+MIN_EPOCHS = 5
+
+
+def sample_candidates(count: int = DEFAULT_CANDIDATES, space: Optional[Dict[str, list]] = None,
+                      seed: int = 0) -> List[Dict[str, object]]:
+    """
+    Draws distinct training settings from the search space, each with its own training seed.
+
+    Parameters:
+    count (int): The number of candidates. Fewer are returned if the space is smaller.
+    space (Optional[Dict[str, list]]): The values of each setting. Defaults to SEARCH_SPACE.
+    seed (int): The seed of the draw.
+
+    Returns:
+    List[Dict[str, object]]: The settings of each candidate, with its name and seed.
+    """
+    space = space or SEARCH_SPACE
+    rng = random.Random(seed)
+    grid = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    candidates = rng.sample(grid, min(count, len(grid)))
+    return [{'name': f"candidate_{number:02d}", 'seed': seed + number, **settings}
+            for number, settings in enumerate(candidates)]
+
+
+def train_candidate(candidate: Dict[str, object], train: list, dev: list, output_dir: str,
+                    board, lock) -> Dict[str, object]:
+    """
+    Trains one candidate, scoring it on the dev split after every epoch. The best dev F1 of all
+    candidates per epoch is shared on the board, and the candidate stops once it clearly trails it.
+
+    Parameters:
+    candidate (Dict[str, object]): The candidate from `sample_candidates`.
+    train (list): The training examples, as tuples of text and labels.
+    dev (list): The held-out examples, as tuples of text and labels.
+    output_dir (str): The directory to save the candidate's model in.
+    board: A mapping of epoch to the best dev F1 any candidate reached by it, shared by the candidates.
+    lock: The lock guarding the board.
+
+    Returns:
+    Dict[str, object]: The leaderboard row of the candidate.
+    """
+    random.seed(candidate['seed'])
+    spacy.util.fix_random_seed(candidate['seed'])
+    path = os.path.join(output_dir, candidate['name'])
+    os.makedirs(path, exist_ok=True)
+    history = []
+    pruned = []
+
+    def score_epoch(epoch: int, nlp: spacy.Language, losses: Dict[str, float]) -> bool:
+        history.append(nlp.evaluate(make_examples(nlp, dev))['ents_f'])
+        best = max(history)
+        with lock:
+            leader = max(board.get(epoch, 0.0), best)
+            board[epoch] = leader
+        if epoch >= MIN_EPOCHS and best < leader - PRUNE_MARGIN:
+            logging.info(f"{candidate['name']} trails the best dev F1 {leader:.3f} at epoch {epoch}, stopping it.")
+            pruned.append(epoch)
+        return bool(pruned)
+
+    start = time.perf_counter()
+    nlp = train_ner_model(list(train), profile=candidate['profile'], output_dir=os.path.join(path, 'model'),
+                          dropout=candidate['dropout'], batch_sizes=candidate['batch_sizes'],
+                          max_epochs=candidate['max_epochs'], patience=candidate['patience'],
+                          corpus_path=os.path.join(path, 'train.spacy'), epoch_callback=score_epoch)
+    seconds = time.perf_counter() - start
+
+    return {
+        **candidate,
+        'batch_sizes': str(candidate['batch_sizes']),
+        'dev_f1': history[-1] if nlp is not None and history else float('nan'),
+        'best_dev_f1': max(history) if history else float('nan'),
+        'epochs': len(history),
+        'pruned': bool(pruned),
+        'seconds': seconds,
+        'model_path': os.path.join(path, 'model') if nlp is not None else None,
+    }
+
+
+def promote_model(path: str, model_dir: Optional[str] = None) -> str:
+    """
+    Replaces the deployed NER model with a trained one.
+
+    Parameters:
+    path (str): The directory of the model to deploy.
+    model_dir (Optional[str]): The directory of the deployed model. Defaults to `get_model_dir()`.
+
+    Returns:
+    str: The directory of the deployed model.
+    """
+    target = model_dir or get_model_dir()
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    # Fresh modification times give the deployed model a new version for the model registry
+    shutil.copytree(path, target, copy_function=shutil.copy)
+
+    # Entities cached for the previous model are stale now
+    if model_dir is None:
+        clear_entity_cache()
+    return target
+
+
+def search_hyperparameters(candidates: Optional[List[Dict[str, object]]] = None, train_data: Optional[list] = None,
+                           output_dir: str = DEFAULT_SEARCH_DIR, workers: Optional[int] = None,
+                           dev_fraction: float = DEFAULT_DEV_FRACTION, seed: int = 0,
+                           promote: bool = True, model_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Trains candidate training settings on the same split, each in its own worker process, and ranks
+    them by dev F1 and then by training time. The leaderboard is written to leaderboard.csv in the
+    output directory and the winner is deployed as the NER model.
+
+    Parameters:
+    candidates (Optional[List[Dict[str, object]]]): The candidates. Defaults to `sample_candidates(seed=seed)`.
+    train_data (Optional[list]): A list of tuples containing text and labels. Defaults to the training data.
+    output_dir (str): The directory to save the candidate models and the leaderboard to.
+    workers (Optional[int]): The number of worker processes. None, 0 or 1 trains the candidates one
+    after another in this process.
+    dev_fraction (float): The share of the examples held out to score the candidates on.
+    seed (int): The seed of the split and of the candidate draw.
+    promote (bool): Whether to deploy the winning model.
+    model_dir (Optional[str]): The directory of the deployed model. Defaults to `get_model_dir()`.
+
+    Returns:
+    pd.DataFrame: The leaderboard, best candidate first.
+    """
+    candidates = candidates or sample_candidates(seed=seed)
+    train, dev = split_training_data(train_data or get_training_data(), dev_fraction, seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    if workers is None or workers <= 1:
+        board, lock = {}, threading.Lock()
+        rows = [train_candidate(candidate, train, dev, output_dir, board, lock) for candidate in candidates]
+    else:
+        with multiprocessing.Manager() as manager:
+            board, lock = manager.dict(), manager.Lock()
+            with ProcessPoolExecutor(max_workers=min(workers, len(candidates))) as executor:
+                futures = [executor.submit(train_candidate, candidate, train, dev, output_dir, board, lock)
+                           for candidate in candidates]
+                rows = [future.result() for future in futures]
+
+    leaderboard = pd.DataFrame(rows).sort_values(['dev_f1', 'seconds'], ascending=[False, True],
+                                                 na_position='last', ignore_index=True)
+    leaderboard.to_csv(os.path.join(output_dir, 'leaderboard.csv'), index=False)
+
+    winners = leaderboard[leaderboard['model_path'].notna() & ~leaderboard['pruned']]
+    if promote and len(winners):
+        winner = winners.iloc[0]
+        promote_model(winner['model_path'], model_dir)
+        logging.info(f"Deployed {winner['name']} with dev F1 {winner['dev_f1']:.3f}")
+    elif promote:
+        logging.error("No candidate finished training, the deployed model is unchanged.")
+    return leaderboard
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point for the hyperparameter search.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Search NER training settings and deploy the best model.")
+    parser.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES, help="The number of candidates.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="The number of worker processes.")
+    parser.add_argument('--output-dir', default=DEFAULT_SEARCH_DIR,
+                        help="The directory to save the candidate models and the leaderboard to.")
+    parser.add_argument('--dev-fraction', type=float, default=DEFAULT_DEV_FRACTION,
+                        help="The share of the training data held out to score the candidates on.")
+    parser.add_argument('--seed', type=int, default=0, help="The seed of the split and of the candidates.")
+    parser.add_argument('--no-promote', dest='promote', action='store_false',
+                        help="Only write the leaderboard, keep the deployed model.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    leaderboard = search_hyperparameters(sample_candidates(args.candidates, seed=args.seed),
+                                         output_dir=args.output_dir, workers=args.workers,
+                                         dev_fraction=args.dev_fraction, seed=args.seed, promote=args.promote)
+    print(leaderboard.drop(columns=['model_path']).to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
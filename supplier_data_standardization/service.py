@@ -0,0 +1,305 @@
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+import socketserver
+import numpy as np
+import spacy
+from collections import Counter, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional
+from supplier_data_standardization.utils import setup_logging
+from supplier_data_standardization.models import get_model
+from supplier_data_standardization.rules import RuleFastPath
+from supplier_data_standardization.ner_model import pipe_entities, preprocess_dimensions
+
+# Largest number of descriptions the model processes in one micro-batch
+DEFAULT_MAX_BATCH_SIZE = 64
+
+# Longest time a request waits for other requests to share its micro-batch, in milliseconds
+DEFAULT_MAX_WAIT_MS = 5.0
+
+# Number of most recent requests the latency percentiles are computed over
+LATENCY_WINDOW = 10_000
+
+# Longest time a request waits for its entities, in seconds
+REQUEST_TIMEOUT = 30.0
+
+
+class ExtractionRequest(NamedTuple):
+    texts: List[str]
+    future: Future
+    received: float
+
+
+class MicroBatcher:
+    """
+    Keeps a NER model warm in a worker thread and coalesces the descriptions of concurrent requests
+    into `nlp.pipe` micro-batches. A batch is processed once it holds max_batch_size descriptions or
+    its first request waited max_wait_ms, whichever comes first.
+    """
+
+    def __init__(self, nlp: Optional[spacy.Language] = None, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, use_rules: bool = False):
+        self.nlp = get_model(nlp)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.rules = RuleFastPath() if use_rules else None
+        self.requests = queue.Queue()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = Counter()
+        self.stats_lock = threading.Lock()
+        self.worker = threading.Thread(target=self.run, name='ner-micro-batcher', daemon=True)
+        self.worker.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Queues descriptions for extraction.
+
+        Parameters:
+        texts (List[str]): The supplier descriptions.
+
+        Returns:
+        Future: Resolves to the entities of each description, in order.
+        """
+        future = Future()
+        self.requests.put(ExtractionRequest(list(texts), future, time.perf_counter()))
+        return future
+
+    def extract(self, texts: List[str], timeout: Optional[float] = REQUEST_TIMEOUT) -> List[Dict[str, str]]:
+        """
+        Extracts the entities of descriptions, sharing a micro-batch with concurrent calls.
+
+        Parameters:
+        texts (List[str]): The supplier descriptions.
+        timeout (Optional[float]): The longest time to wait for the entities, in seconds.
+
+        Returns:
+        List[Dict[str, str]]: The entity text of each label, per description.
+        """
+        return self.submit(texts).result(timeout)
+
+    def run(self):
+        """
+        Worker loop: collects requests into micro-batches until `close` is called.
+        """
+        while True:
+            first = self.requests.get()
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.perf_counter() + self.max_wait
+            closing = False
+            while size < self.max_batch_size:
+                try:
+                    request = self.requests.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self.process(batch)
+            if closing:
+                return
+
+    def process(self, batch: List[ExtractionRequest]):
+        """
+        Runs the model over the descriptions of a micro-batch and resolves each request's future.
+
+        Parameters:
+        batch (List[ExtractionRequest]): The coalesced requests.
+        """
+        texts = [preprocess_dimensions(text) for request in batch for text in request.texts]
+        try:
+            records = pipe_entities(self.nlp, texts, batch_size=max(len(texts), 1), rules=self.rules)
+        except Exception as e:
+            logging.error(f"Error extracting entities of a micro-batch: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        done = time.perf_counter()
+        start = 0
+        with self.stats_lock:
+            self.batch_sizes[len(texts)] += 1
+            for request in batch:
+                request.future.set_result(records[start:start + len(request.texts)])
+                start += len(request.texts)
+                self.latencies.append(done - request.received)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Reports the latency percentiles of recent requests and how many micro-batches of each size ran.
+
+        Returns:
+        Dict[str, object]: The number of requests and batches, the p50 and p99 latency in milliseconds,
+        the batch-size histogram and, with the rule fast path, its hit rate.
+        """
+        with self.stats_lock:
+            latencies = np.array(self.latencies) * 1000
+            histogram = dict(sorted(self.batch_sizes.items()))
+
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        stats = {
+            'requests': len(latencies),
+            'batches': sum(histogram.values()),
+            'p50_ms': round(float(p50), 3),
+            'p99_ms': round(float(p99), 3),
+            'batch_sizes': {str(size): count for size, count in histogram.items()},
+        }
+        if self.rules is not None:
+            stats['rules'] = self.rules.report()
+        return stats
+
+    def close(self):
+        """
+        Stops the worker thread once the queued requests are processed.
+        """
+        self.requests.put(None)
+        self.worker.join()
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    """
+    HTTP interface of a MicroBatcher.
+
+    POST /extract with {"text": "..."} returns {"entities": {...}}, and with {"texts": [...]} returns
+    {"entities": [{...}, ...]}. GET /stats returns the batcher statistics and GET /health returns
+    {"status": "ok"}.
+    """
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self.send_json(200, self.server.batcher.stats())
+        else:
+            self.send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/extract':
+            self.send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError as e:
+            self.send_json(400, {'error': f"Invalid JSON: {e}"})
+            return
+
+        single = isinstance(payload, dict) and isinstance(payload.get('text'), str)
+        texts = [payload['text']] if single else payload.get('texts') if isinstance(payload, dict) else None
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            self.send_json(400, {'error': "Expected a JSON object with a 'text' string or a 'texts' list of strings"})
+            return
+
+        try:
+            records = self.server.batcher.extract(texts)
+        except Exception as e:
+            logging.error(f"Error serving extraction request: {e}")
+            self.send_json(500, {'error': str(e)})
+            return
+        self.send_json(200, {'entities': records[0] if single else records})
+
+    def send_json(self, status: int, body: Dict[str, object]):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+# Connections waiting to be accepted; the socketserver default of 5 resets bursts of concurrent clients
+REQUEST_QUEUE_SIZE = 128
+
+
+class ExtractionHTTPServer(ThreadingHTTPServer):
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+
+def create_server(batcher: MicroBatcher, host: str = '127.0.0.1', port: int = 8080,
+                  socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """
+    Creates the HTTP server of a batcher, on a TCP port or on a Unix socket.
+
+    Parameters:
+    batcher (MicroBatcher): The batcher that serves the requests.
+    host (str): The address to listen on. Defaults to the local machine only.
+    port (int): The TCP port to listen on. 0 picks a free port.
+    socket_path (Optional[str]): If set, listen on this Unix socket instead of a TCP port.
+
+    Returns:
+    socketserver.BaseServer: The server, not yet serving.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, ExtractionHandler)
+    else:
+        server = ExtractionHTTPServer((host, port), ExtractionHandler)
+    server.batcher = batcher
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Command line entry point that serves entity extraction until interrupted.
+
+    Parameters:
+    argv (Optional[List[str]]): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Serve supplier description entity extraction locally.")
+    parser.add_argument('--host', default='127.0.0.1', help="The address to listen on.")
+    parser.add_argument('--port', type=int, default=8080, help="The TCP port to listen on.")
+    parser.add_argument('--socket', dest='socket_path', help="Listen on this Unix socket instead of a TCP port.")
+    parser.add_argument('--model', help="The model directory. Defaults to the trained model.")
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="The largest number of descriptions in a micro-batch.")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="The longest time a request waits for others to share its micro-batch.")
+    parser.add_argument('--rules', action='store_true', help="Skip the model for descriptions the rules resolve.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    batcher = MicroBatcher(get_model(path=args.model), max_batch_size=args.max_batch_size,
+                           max_wait_ms=args.max_wait_ms, use_rules=args.rules)
+    server = create_server(batcher, args.host, args.port, args.socket_path)
+    address = args.socket_path or f"http://{args.host}:{server.server_address[1]}"
+    logging.info(f"Serving entity extraction on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        if args.socket_path and os.path.exists(args.socket_path):
+            os.remove(args.socket_path)
+        logging.info(f"Served {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+import os
+import shutil
+import logging
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from typing import List, Optional, Sequence
+
+# Columns the Parquet datasets are partitioned by, outermost first
+PARTITION_COLUMNS = ['source', 'MATERIAL_GRADE']
+
+
+def write_parquet_dataset(df: pd.DataFrame, path: str, partition_cols: Sequence[str] = PARTITION_COLUMNS,
+                          append: bool = False) -> str:
+    """
+    Writes a DataFrame as a Parquet dataset partitioned into one directory per value of the partition
+    columns, replacing any dataset already at the path. Partition columns the frame does not have are skipped.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to write.
+    path (str): The directory of the dataset.
+    partition_cols (Sequence[str]): The columns to partition by, outermost first.
+    append (bool): Whether to add the rows to the dataset already at the path as new files, e.g. to
+    write a dataset chunk by chunk, instead of replacing it.
+
+    Returns:
+    str: The directory of the dataset.
+    """
+    partition_cols = [column for column in partition_cols if column in df]
+
+    if os.path.isdir(path) and not append:
+        shutil.rmtree(path)
+
+    df.to_parquet(path, engine='pyarrow', index=False, partition_cols=partition_cols or None)
+    logging.info(f"Parquet dataset written to {path}, partitioned by {partition_cols}.")
+    return path
+
+
+def read_parquet_dataset(path: str, columns: Optional[List[str]] = None,
+                         filters: Optional[list] = None) -> pd.DataFrame:
+    """
+    Reads a Parquet dataset, parsing only the requested columns and partitions.
+
+    Parameters:
+    path (str): The directory (or file) of the dataset.
+    columns (Optional[List[str]]): The columns to read. Defaults to all columns.
+    filters (Optional[list]): Row filters in pyarrow form, e.g. [('source', '==', 'source1')]. Filters on
+    partition columns skip the other partitions without opening them.
+
+    Returns:
+    pd.DataFrame: The requested columns of the matching rows.
+    """
+    # Partition directories are read as plain strings: pandas cannot combine categorical partitions
+    # that include the missing-value partition
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    table = dataset.to_table(columns=columns, filter=pq.filters_to_expression(filters) if filters else None)
+    df = table.to_pandas()
+    df = df.astype({column: 'category' for column in PARTITION_COLUMNS if column in df})
+    logging.info(f"Parquet dataset read from {path}.")
+    return df
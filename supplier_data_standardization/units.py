@@ -0,0 +1,103 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+# Conversion factors to kilograms, keyed by the lower-cased unit as suppliers send it.
+# "EA" (each) is a count rather than a weight, so it converts to 0 and is filtered out downstream.
+WEIGHT_UNITS_TO_KG = {
+    'mg': 1e-6,
+    'g': 1e-3,
+    'kg': 1.0,
+    't': 1000.0,
+    'lbs': 0.453592,
+    'ea': 0.0,
+}
+
+# Conversion factors to millimetres, keyed by the lower-cased unit.
+LENGTH_UNITS_TO_MM = {
+    'mm': 1.0,
+    'cm': 10.0,
+    'm': 1000.0,
+    'inch': 25.4,
+}
+
+
+def normalize_units(units: pd.Series) -> pd.Series:
+    """
+    Normalizes a column of unit labels so they can be looked up in a unit table.
+
+    Parameters:
+    units (pd.Series): The raw unit labels.
+
+    Returns:
+    pd.Series: The stripped, lower-cased unit labels.
+    """
+    return units.astype('string').str.strip().str.lower()
+
+
+def convert_units(values: pd.Series, units: pd.Series, unit_table: dict) -> Tuple[pd.Series, pd.Series]:
+    """
+    Converts a whole column of values to a base unit using a unit lookup table.
+
+    Unknown units do not raise; their converted value is NaN and they are flagged in the error mask.
+
+    Parameters:
+    values (pd.Series): The numeric values to convert.
+    units (pd.Series): The unit label of each value.
+    unit_table (dict): Mapping of lower-cased unit label to conversion factor.
+
+    Returns:
+    Tuple[pd.Series, pd.Series]: The converted values and a boolean mask of rows with unknown units.
+    """
+    factors = normalize_units(units).map(unit_table).astype('float64')
+    error_mask = factors.isna()
+    converted = pd.to_numeric(values, errors='coerce').astype('float64') * factors
+    return converted, error_mask
+
+
+def convert_weight_to_kg(df: pd.DataFrame, weight_col: str = 'weight', unit_col: str = 'Unit') -> Tuple[pd.Series, pd.Series]:
+    """
+    Converts the weight column of a DataFrame to kilograms.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame containing the weight and unit columns.
+    weight_col (str): The name of the weight column.
+    unit_col (str): The name of the unit column.
+
+    Returns:
+    Tuple[pd.Series, pd.Series]: The weights in kilograms and a boolean mask of rows with unknown units.
+    """
+    weights, error_mask = convert_units(df[weight_col], df[unit_col], WEIGHT_UNITS_TO_KG)
+    log_unknown_units(df[unit_col], error_mask)
+    return weights, error_mask
+
+
+def convert_length_to_mm(df: pd.DataFrame, length_col: str, unit_col: str) -> Tuple[pd.Series, pd.Series]:
+    """
+    Converts a length column of a DataFrame to millimetres.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame containing the length and unit columns.
+    length_col (str): The name of the length column.
+    unit_col (str): The name of the unit column.
+
+    Returns:
+    Tuple[pd.Series, pd.Series]: The lengths in millimetres and a boolean mask of rows with unknown units.
+    """
+    lengths, error_mask = convert_units(df[length_col], df[unit_col], LENGTH_UNITS_TO_MM)
+    log_unknown_units(df[unit_col], error_mask)
+    return lengths, error_mask
+
+
+def log_unknown_units(units: pd.Series, error_mask: pd.Series) -> None:
+    """
+    Logs a single warning summarizing the unknown units found in a column.
+
+    Parameters:
+    units (pd.Series): The raw unit labels.
+    error_mask (pd.Series): Boolean mask of rows with unknown units.
+    """
+    if error_mask.any():
+        unknown = sorted(np.unique(units[error_mask].astype(str)))
+        logging.warning(f"{int(error_mask.sum())} rows have unknown units: {unknown}")
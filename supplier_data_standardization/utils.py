@@ -1,8 +1,12 @@
 import os
 import logging
 import pandas as pd
-from typing import Optional
+from typing import Callable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from openpyxl import load_workbook
+
+# Number of worksheet rows materialized per DataFrame chunk when streaming workbooks
+DEFAULT_CHUNK_SIZE = 10000
 
 
 def setup_logging():
@@ -64,6 +68,190 @@ def read_data(file_name: str) -> Optional[pd.DataFrame]:
         return None
 
 
+def _header_names(header_row: tuple) -> List[str]:
+    """
+    Builds column names from a worksheet header row the same way pandas.read_excel does,
+    naming empty cells 'Unnamed: <position>' and de-duplicating repeated names.
+
+    Parameters:
+    header_row (tuple): The cell values of the header row.
+
+    Returns:
+    List[str]: The column names.
+    """
+    columns = []
+    seen = {}
+    for position, value in enumerate(header_row):
+        name = f"Unnamed: {position}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _rows_to_frame(rows: list, columns: list, start: int, dtype: Optional[dict] = None,
+                   usecols: Optional[Callable] = None) -> pd.DataFrame:
+    """
+    Converts a list of worksheet rows into a DataFrame, padding or trimming ragged rows.
+    Cell values are typed the way pandas.read_excel types them: integral floats become integers,
+    and text columns that parse as numbers become numeric.
+
+    Parameters:
+    rows (list): The row tuples read from the worksheet.
+    columns (list): The column names of the frame.
+    start (int): The index label of the first row, so chunk indices continue across chunks.
+    dtype (Optional[dict]): Column dtypes to apply to the frame.
+    usecols (Optional[Callable]): If set, only the columns whose name it accepts are kept.
+
+    Returns:
+    pd.DataFrame: The rows as a DataFrame.
+    """
+    width = len(columns)
+    rows = [row[:width] + (None,) * (width - len(row)) if len(row) != width else row for row in rows]
+    if usecols is not None:
+        positions = [position for position, name in enumerate(columns) if usecols(name)]
+        columns = [columns[position] for position in positions]
+        rows = [tuple(row[position] for position in positions) for row in rows]
+    rows = [tuple(int(value) if isinstance(value, float) and value.is_integer() else value for value in row)
+            for row in rows]
+    frame = pd.DataFrame(rows, columns=columns, index=pd.RangeIndex(start, start + len(rows)))
+    frame = frame.mask(frame.isna())  # Empty cells become NaN rather than None, as with pandas.read_excel
+
+    for column in frame.columns[frame.dtypes == object]:
+        try:
+            frame[column] = pd.to_numeric(frame[column])
+        except (ValueError, TypeError):
+            pass  # Not a numeric column, keep the values as they are
+    if dtype:
+        frame = frame.astype({column: column_type for column, column_type in dtype.items() if column in frame})
+    return frame
+
+
+def _chunk_columns(header_row: tuple, width: int, header: bool) -> list:
+    """
+    Builds the column names of a streamed chunk that is `width` cells wide.
+
+    Parameters:
+    header_row (tuple): The cell values of the header row.
+    width (int): The number of columns of the chunk.
+    header (bool): Whether the header row holds the column names. If False, columns are numbered.
+
+    Returns:
+    list: The column names.
+    """
+    if not header:
+        return list(range(width))
+    return _header_names(header_row + (None,) * (width - len(header_row)))
+
+
+def iter_excel_chunks(file_path: str, sheet_name: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      header: bool = True, dtype: Optional[dict] = None, skiprows: int = 0,
+                      usecols: Optional[Callable] = None) -> Iterator[pd.DataFrame]:
+    """
+    Streams a worksheet as fixed-size DataFrame chunks using openpyxl's read-only row iteration,
+    so only one chunk of rows is held in memory at a time.
+
+    Parameters:
+    file_path (str): The path to the Excel workbook.
+    sheet_name (Optional[str]): The sheet to read. Defaults to the first sheet.
+    chunk_size (int): The maximum number of rows per chunk.
+    header (bool): Whether the first row holds the column names. If False, columns are numbered.
+    dtype (Optional[dict]): Column dtypes to apply to every chunk. Types are otherwise inferred per
+    chunk, so columns mixing integers and floats should be pinned here.
+    skiprows (int): The number of rows to skip before the header (or the data, without a header).
+    usecols (Optional[Callable]): If set, only the columns whose name it accepts are kept, before
+    the cells of the other columns are turned into a frame.
+
+    Returns:
+    Iterator[pd.DataFrame]: The worksheet rows, chunk by chunk, indexed as pandas.read_excel would.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name is not None else workbook.worksheets[0]
+        rows = worksheet.iter_rows(min_row=skiprows + 1, values_only=True)
+
+        # Read-only rows can be ragged and the sheet dimensions may be missing, so the frame width
+        # grows to the widest row seen so far, as pandas.read_excel sizes it by the widest row
+        width = worksheet.max_column or 0
+        header_row = next(rows, ()) if header else ()
+        start = 0
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                width = max(width, len(header_row), *map(len, buffer))
+                yield _rows_to_frame(buffer, _chunk_columns(header_row, width, header), start, dtype, usecols)
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            width = max(width, len(header_row), *map(len, buffer))
+            yield _rows_to_frame(buffer, _chunk_columns(header_row, width, header), start, dtype, usecols)
+    finally:
+        workbook.close()
+
+
+def create_dimension_column(dataframe, thickness_col='Thickness', width_col='Width'):
+    """
+    Creates a DIMENSION column in the given DataFrame by combining the thickness and width columns.
+
+    Parameters:
+    dataframe (pd.DataFrame): The DataFrame containing the thickness and width columns.
+    thickness_col (str): The name of the thickness column.
+    width_col (str): The name of the width column.
+
+    Returns:
+    pd.DataFrame: The DataFrame with the added DIMENSION column.
+    """
+    dataframe['DIMENSION'] = dataframe[thickness_col].astype(str) + 'x' + dataframe[width_col].astype(str)
+    return dataframe
+
+
+def repeated_header_mask(df: pd.DataFrame, column: str, header: Optional[str] = None) -> pd.Series:
+    """
+    Flags the rows that repeat the header, comparing the cells of one column with its header
+    while ignoring case and stray whitespace.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to check.
+    column (str): The column whose cells repeat the header on header rows.
+    header (Optional[str]): The header text to look for. Defaults to the column name.
+
+    Returns:
+    pd.Series: A boolean mask of the repeated header rows.
+    """
+    header = (column if header is None else header).strip().lower()
+    return df[column].astype(str).str.strip().str.lower() == header
+
+
+def drop_repeated_headers(df: pd.DataFrame, column: str, header: Optional[str] = None,
+                          next_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Removes the rows that repeat the header and the row before each of them in a single
+    boolean-mask pass.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame (or chunk) to clean.
+    column (str): The column whose cells repeat the header on header rows.
+    header (Optional[str]): The header text to look for. Defaults to the column name.
+    next_df (Optional[pd.DataFrame]): The next chunk of the same sheet, if any. A repeated header
+    opening it also removes the last row of `df`.
+
+    Returns:
+    pd.DataFrame: The DataFrame without the repeated headers.
+    """
+    header_mask = repeated_header_mask(df, column, header)
+
+    # A row is dropped if it is a header or if the row after it is
+    drop_mask = header_mask | header_mask.shift(-1, fill_value=False)
+    if next_df is not None and not next_df.empty and not drop_mask.empty:
+        drop_mask.iloc[-1] = drop_mask.iloc[-1] or bool(repeated_header_mask(next_df.iloc[:1], column, header).any())
+
+    return df[~drop_mask]
+
+
 def clean_headers(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans the DataFrame by removing rows that are headers, the row before them, and empty rows.
@@ -80,12 +268,8 @@ def clean_headers(df: pd.DataFrame) -> pd.DataFrame:
     # Strip spaces from column names
     df.columns = df.columns.str.strip()
 
-    # Identify the rows with repeated headers
-    header_indices = df.index[df['Article ID'] == 'Article ID '].tolist()
-
     # Remove the repeated headers and the row before them
-    for index in reversed(header_indices):  # Reversed to avoid indexing issues
-        df = df.drop([index, index - 1])
+    df = drop_repeated_headers(df, 'Article ID')
 
     # Remove any empty rows
     df = df.dropna(how='all')
@@ -94,28 +278,47 @@ def clean_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def validate_quantity_column(df: pd.DataFrame) -> pd.DataFrame:
+def validate_numeric_column(df: pd.DataFrame, column: str, dtype: str = 'float64') -> Tuple[pd.DataFrame, pd.Series]:
     """
-    Validates the 'quantity' column, replacing non-numeric values with empty strings.
+    Converts a column to a numeric dtype in one vectorized pass, turning values that are not numbers
+    (or not whole numbers, for integer dtypes) into missing values and reporting the rows it coerced.
 
     Parameters:
     df (pd.DataFrame): The DataFrame to validate.
+    column (str): The name of the column to convert.
+    dtype (str): The numeric dtype of the converted column, e.g. 'float64' or the nullable 'Int64'.
 
     Returns:
-    pd.DataFrame: The DataFrame with validated 'quantity' column.
+    Tuple[pd.DataFrame, pd.Series]: The DataFrame with the converted column and a boolean mask of the
+    rows whose value was coerced to missing.
     """
     df = df.copy()  # Create a copy to avoid SettingWithCopyWarning
 
-    # Function to check if a value is numeric
-    def is_numeric(value):
-        try:
-            float(value)
-            return True
-        except ValueError:
-            return False
+    values = pd.to_numeric(df[column], errors='coerce')
+    if pd.api.types.is_integer_dtype(dtype):
+        values = values.where(values % 1 == 0)  # Fractional values cannot be stored as integers
+
+    coerced = df[column].notna() & values.isna()
+    if coerced.any():
+        logging.warning(f"{int(coerced.sum())} non-numeric values in column '{column}' set to missing, "
+                        f"rows: {df.index[coerced].tolist()[:20]}")
+
+    df[column] = values.astype(dtype)
+    return df, coerced
+
 
-    # Apply the function to replace non-numeric values with empty strings
-    df['quantity'] = df['quantity'].apply(lambda x: x if is_numeric(x) else '')
+def validate_quantity_column(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validates the 'quantity' column, converting it to nullable integers and replacing non-numeric
+    values with missing values.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to validate.
+
+    Returns:
+    pd.DataFrame: The DataFrame with validated 'quantity' column.
+    """
+    df, _ = validate_numeric_column(df, 'quantity', 'Int64')
 
     logging.info("Quantity column validated successfully.")
     return df
@@ -0,0 +1,139 @@
+import os
+import sys
+import tempfile
+import unittest
+import subprocess
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.adapters import SourceAdapter, compile_adapter, get_adapter
+
+
+class TestSourceAdapters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'supplier.xlsx')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_workbook(self, rows):
+        workbook = Workbook()
+        for row in rows:
+            workbook.active.append(row)
+        workbook.save(self.file_path)
+
+    def test_unmapped_columns_are_not_read(self):
+        self.write_workbook([['Grade ', 'Remark', 'KG'], ['DX51D', 'scratched', 100], ['S235JR', 'ok', 0]])
+        plan = compile_adapter(SourceAdapter(
+            name='test',
+            file_name='supplier.xlsx',
+            columns={'grade': 'MATERIAL_NAME', 'kg': 'weight'},
+            filters=[('weight', '>', 0)],
+            output_columns=['MATERIAL_NAME', 'weight'],
+        ))
+
+        self.assertFalse(plan.usecols('Remark'))
+        for chunk_size in (None, 1):
+            raw = next(plan.read(self.file_path, chunk_size=chunk_size))
+            self.assertEqual(list(raw.columns), ['Grade ', 'KG'])
+
+            result = plan.run(self.file_path, chunk_size=chunk_size)
+            self.assertEqual(result.to_dict('list'), {'MATERIAL_NAME': ['DX51D'], 'weight': [100]})
+
+    def test_repeated_headers_are_removed(self):
+        header = ['Article ID ', 'Material ', 'Weight ']
+        self.write_workbook([
+            ['Coils'],
+            header,
+            ['A1', 'DX51D', 100],
+            ['Slit coils', None, None],
+            header,
+            ['A2', 'S235JR', 200],
+        ])
+        plan = compile_adapter(SourceAdapter(
+            name='test',
+            file_name='supplier.xlsx',
+            header_row=1,
+            columns={'Article ID': 'article id', 'Material': 'material', 'Weight': 'weight'},
+            repeated_header_column='article id',
+            output_columns=['material', 'article id', 'weight'],
+        ))
+
+        # A chunk size of 2 puts the repeated header at the start of a chunk
+        for chunk_size in (None, 1, 2, 3):
+            result = plan.run(self.file_path, chunk_size=chunk_size)
+            self.assertEqual(result['article id'].tolist(), ['A1', 'A2'])
+
+    def test_all_sheets_are_discovered_and_tagged(self):
+        workbook = Workbook()
+        workbook.active.title = 'Coils'
+        for row in [['Article ID', 'Weight'], ['A1', 100]]:
+            workbook.active.append(row)
+        slit = workbook.create_sheet('Slit coils')
+        for row in [[' article id ', 'WEIGHT'], ['A2', 200], ['A3', 300]]:
+            slit.append(row)
+        notes = workbook.create_sheet('Notes')
+        notes.append(['Remarks'])
+        workbook.save(self.file_path)
+
+        plan = compile_adapter(SourceAdapter(
+            name='test',
+            file_name='supplier.xlsx',
+            columns={'Article ID': 'article id', 'Weight': 'weight'},
+            all_sheets=True,
+            sheet_column='sheet',
+            output_columns=['article id', 'weight'],
+        ))
+
+        self.assertEqual(plan.discover_sheets(self.file_path), ['Coils', 'Slit coils'])
+        for workers in (None, 2):
+            result = plan.run(self.file_path, workers=workers)
+            self.assertEqual(result['article id'].tolist(), ['A1', 'A2', 'A3'])
+            self.assertEqual(result['sheet'].tolist(), ['Coils', 'Slit coils', 'Slit coils'])
+
+        # Streaming yields the same rows chunk by chunk, never more than a chunk at a time
+        chunks = list(plan.iter_run(self.file_path, chunk_size=1))
+        self.assertEqual([len(chunk) for chunk in chunks], [1, 1, 1])
+        self.assertEqual(pd.concat(chunks)['article id'].tolist(), ['A1', 'A2', 'A3'])
+        self.assertEqual(pd.concat(chunks)['sheet'].tolist(), ['Coils', 'Slit coils', 'Slit coils'])
+
+    def test_invalid_filter_operator(self):
+        with self.assertRaises(ValueError):
+            compile_adapter(SourceAdapter(name='test', file_name='supplier.xlsx', columns={},
+                                          output_columns=[], filters=[('weight', '=>', 0)]))
+
+    def test_registered_suppliers(self):
+        for name in ('source1', 'source2', 'source3'):
+            self.assertEqual(get_adapter(name).file_name, f'{name}.xlsx')
+        with self.assertRaises(KeyError):
+            get_adapter('unknown')
+
+    def test_importing_adapters_keeps_the_log_file(self):
+        # A fresh interpreter, since the test runner already configures the root logger
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        work_dir = os.path.join(self.tmp_dir.name, 'work')
+        os.makedirs(work_dir)
+        script = (
+            "import logging, os\n"
+            "import supplier_data_standardization.adapters\n"
+            "import supplier_data_standardization.main\n"
+            "from supplier_data_standardization.utils import setup_logging\n"
+            "setup_logging()\n"
+            "logging.info('written')\n"
+            "assert any(isinstance(handler, logging.FileHandler) for handler in logging.getLogger().handlers)\n"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=work_dir, capture_output=True, text=True,
+                                env={**os.environ, 'PYTHONPATH': root})
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        log_files = os.listdir(os.path.join(self.tmp_dir.name, 'logs'))
+        self.assertEqual(len(log_files), 1)
+        with open(os.path.join(self.tmp_dir.name, 'logs', log_files[0])) as log:
+            self.assertIn('written', log.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+import spacy
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.ner_model import column_order, extract_entities, pipe_entities
+
+
+class TestBatchedNER(unittest.TestCase):
+
+    def setUp(self):
+        self.nlp = spacy.blank("en")
+        ruler = self.nlp.add_pipe("entity_ruler")
+        ruler.add_patterns([
+            {"label": "MATERIAL_NAME", "pattern": "DX51D"},
+            {"label": "MATERIAL_NAME", "pattern": "S235JR"},
+            {"label": "DIMENSION", "pattern": [{"TEXT": {"REGEX": r"^\d+(,\d+)?x\d+(,\d+)?$"}}]},
+        ])
+        self.texts = [f"DX51D 1,50x{width}" if width % 2 else f"S235JR geolied {width}" for width in range(1000, 1050)]
+
+    def test_entities_keep_text_order(self):
+        for batch_size, n_process in ((1, 1), (7, 1), (7, 2)):
+            records = pipe_entities(self.nlp, iter(self.texts), batch_size=batch_size, n_process=n_process)
+
+            self.assertEqual(len(records), len(self.texts))
+            self.assertEqual(records[0], {'MATERIAL_NAME': 'S235JR'})
+            self.assertEqual(records[1], {'MATERIAL_NAME': 'DX51D', 'DIMENSION': '1,50x1001'})
+            self.assertEqual(records[-1]['DIMENSION'], '1,50x1049')
+
+    def test_repeated_labels_are_joined(self):
+        records = pipe_entities(self.nlp, ["DX51D S235JR"])
+        self.assertEqual(records, [{'MATERIAL_NAME': 'DX51D S235JR'}])
+
+    def test_extracted_columns(self):
+        self.nlp.get_pipe("entity_ruler").add_patterns([{"label": "SURFACE", "pattern": "geolied"}])
+        df = pd.DataFrame({'material': ['DX51D 1,50 x 1350', None, 'S235JR geolied'],
+                           'MATERIAL_NAME': ['old', 'kept', 'old'], 'weight': [1.0, 2.0, 3.0]}, index=[4, 2, 9])
+
+        with self.assertLogs(level='WARNING') as logs:
+            result = extract_entities(self.nlp, df)
+
+        self.assertEqual(list(result.columns), column_order)
+        self.assertEqual(list(result.index), [4, 2, 9])
+        self.assertEqual(result['MATERIAL_NAME'].tolist(), ['DX51D', 'kept', 'S235JR'])
+        self.assertEqual(result['DIMENSION'].tolist()[0], '1,50x1350')
+        self.assertEqual(result['weight'].tolist(), [1.0, 2.0, 3.0])
+        self.assertIn("{'SURFACE': 1}", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.cache import IngestionCache, file_content_hash
+
+
+class TestIngestionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = IngestionCache(os.path.join(self.tmp_dir.name, 'cache'))
+        self.workbook = os.path.join(self.tmp_dir.name, 'source1.xlsx')
+        self.write_workbook(b'first delivery')
+        self.df = pd.DataFrame({'material': ['DX51D'], 'quantity': pd.array([1], dtype='Int64')})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_workbook(self, content):
+        with open(self.workbook, 'wb') as file:
+            file.write(content)
+
+    def test_hit_until_workbook_or_adapter_changes(self):
+        content_hash = file_content_hash(self.workbook)
+        self.assertIsNone(self.cache.get('source1', 1, content_hash))
+
+        self.cache.put('source1', 1, content_hash, self.df)
+        pd.testing.assert_frame_equal(self.cache.get('source1', 1, content_hash), self.df)
+        self.assertIsNone(self.cache.get('source1', 2, content_hash))
+
+        self.write_workbook(b'second delivery')
+        new_hash = file_content_hash(self.workbook)
+        self.assertNotEqual(new_hash, content_hash)
+        self.assertIsNone(self.cache.get('source1', 1, new_hash))
+
+        # Caching the new delivery replaces the entry of the old one
+        self.cache.put('source1', 1, new_hash, self.df)
+        self.assertEqual(len(self.cache.entries('source1')), 1)
+
+    def test_invalidate(self):
+        self.cache.put('source1', 1, 'a', self.df)
+        self.cache.put('source2', 1, 'b', self.df)
+
+        self.assertEqual(self.cache.invalidate('source1'), 1)
+        self.assertIsNone(self.cache.get('source1', 1, 'a'))
+        self.assertIsNotNone(self.cache.get('source2', 1, 'b'))
+        self.assertEqual(self.cache.invalidate(), 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        first = self.cache.put('source1', 1, 'a', self.df)
+        os.utime(first, (0, 0))
+        self.cache.put('source2', 1, 'b', self.df)
+        self.cache.max_bytes = os.path.getsize(first)
+
+        self.assertEqual(self.cache.evict(), [first])
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_concurrent_puts_under_a_small_limit(self):
+        # Every put evicts, so the workers keep removing entries the others have just listed
+        self.cache.max_bytes = 1
+        names = [f"source{number}" for number in range(40)]
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            paths = list(executor.map(put_entry, [self.cache.cache_dir] * len(names), names))
+
+        self.assertEqual(len(paths), len(names))
+        self.assertLessEqual(len(self.cache.entries()), 1)
+
+
+def put_entry(cache_dir, name):
+    cache = IngestionCache(cache_dir, max_bytes=1)
+    for number in range(5):
+        cache.put(name, 1, str(number), pd.DataFrame({'material': ['DX51D'] * 100}))
+    return cache.entry_path(name, 1, '4')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+import spacy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization import ner_model
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.checkpoints import latest_checkpoint
+from supplier_data_standardization.ner_model import make_examples, split_training_data, train_ner_model
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.train_data, self.dev_data = split_training_data(get_training_data()[:20])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def train(self, name, **kwargs):
+        spacy.util.fix_random_seed(0)
+        settings = {'profile': 'fast', 'max_epochs': 4, 'patience': 10,
+                    'corpus_path': os.path.join(self.tmp_dir.name, 'train.spacy'),
+                    'checkpoint_dir': os.path.join(self.tmp_dir.name, name),
+                    'output_dir': os.path.join(self.tmp_dir.name, name + '_model'), **kwargs}
+        return train_ner_model(list(self.train_data), **settings)
+
+    def read_state(self, name):
+        with open(os.path.join(latest_checkpoint(os.path.join(self.tmp_dir.name, name)), 'state.json')) as file:
+            return json.load(file)
+
+    def test_resume_continues_where_training_stopped(self):
+        uninterrupted = self.train('uninterrupted')
+
+        # Stop after the second epoch, then resume with a different seed, which the checkpoint replaces
+        self.train('interrupted', epoch_callback=lambda epoch, nlp, losses: epoch == 2)
+        self.assertEqual(self.read_state('interrupted')['epoch'], 2)
+        spacy.util.fix_random_seed(1)
+        resumed = train_ner_model(list(self.train_data), profile='fast', max_epochs=4, patience=10,
+                                  corpus_path=os.path.join(self.tmp_dir.name, 'train.spacy'),
+                                  checkpoint_dir=os.path.join(self.tmp_dir.name, 'interrupted'),
+                                  output_dir=os.path.join(self.tmp_dir.name, 'resumed_model'), resume=True)
+
+        self.assertEqual(self.read_state('interrupted')['scores'], self.read_state('uninterrupted')['scores'])
+        self.assertEqual(resumed.get_pipe('ner').model.to_bytes(), uninterrupted.get_pipe('ner').model.to_bytes())
+
+    def test_best_epoch_is_promoted(self):
+        for checkpoint_dir in (os.path.join(self.tmp_dir.name, 'best'), None):
+            self.train('best', dev_data=self.dev_data, max_epochs=8, checkpoint_dir=checkpoint_dir)
+
+            nlp = spacy.load(os.path.join(self.tmp_dir.name, 'best_model'))
+            state = self.read_state('best')
+            self.assertEqual(state['best_score'], max(state['scores']))
+            self.assertEqual(nlp.evaluate(make_examples(nlp, self.dev_data))['ents_f'], state['best_score'])
+
+        # Only the checkpoints of the last and the best epoch are kept
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp_dir.name, 'best'))),
+                         sorted({f"epoch_{state['best_epoch']:03d}", 'epoch_008'}))
+
+    def test_new_run_discards_earlier_checkpoints(self):
+        self.train('run', max_epochs=3)
+        self.train('run', max_epochs=2)
+
+        self.assertEqual(self.read_state('run')['epoch'], 2)
+        self.assertNotIn('epoch_003', os.listdir(os.path.join(self.tmp_dir.name, 'run')))
+
+    def test_main_holds_out_and_checkpoints_only_when_asked(self):
+        with mock.patch.object(ner_model, 'setup_logging'), \
+                mock.patch.object(ner_model, 'train_ner_model', return_value=None) as train:
+            ner_model.main()
+            self.assertEqual(len(train.call_args.args[0]), len(get_training_data()))
+            self.assertIsNone(train.call_args.kwargs['dev_data'])
+            self.assertIsNone(train.call_args.kwargs['checkpoint_dir'])
+
+            checkpoint_dir = os.path.join(self.tmp_dir.name, 'checkpoints')
+            ner_model.main(dev_fraction=ner_model.DEFAULT_DEV_FRACTION, checkpoint_dir=checkpoint_dir)
+            self.assertTrue(train.call_args.kwargs['dev_data'])
+            self.assertEqual(train.call_args.kwargs['checkpoint_dir'], checkpoint_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import unittest
+import spacy
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.ner_model import column_order, extract_entities_from_csv
+
+
+class TestChunkedExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp_dir.name, 'combined.csv')
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe("entity_ruler").add_patterns([{"label": "MATERIAL_NAME", "pattern": "DX51D"}])
+
+        # Quantities are only missing in the last rows, so a chunk reading them on its own sees other types
+        pd.DataFrame({
+            'article id': [f'A{i}' for i in range(10)],
+            'material': ['DX51D 1,50 x 1350' if i % 3 else None for i in range(10)],
+            'weight': [1000 + i for i in range(10)],
+            'quantity': [i if i < 8 else None for i in range(10)],
+        }).to_csv(self.input_path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def extract(self, chunk_size):
+        output_path = os.path.join(self.tmp_dir.name, f'entities_{chunk_size}.csv')
+        extract_entities_from_csv(self.nlp, self.input_path, output_path, chunk_size=chunk_size)
+        with open(output_path) as file:
+            return file.read()
+
+    def test_chunk_size_does_not_change_output(self):
+        outputs = {chunk_size: self.extract(chunk_size) for chunk_size in (None, 1, 3, 4, 100)}
+        self.assertEqual(len(set(outputs.values())), 1)
+
+        df = pd.read_csv(os.path.join(self.tmp_dir.name, 'entities_3.csv'))
+        self.assertEqual(list(df.columns), column_order)
+        self.assertEqual(len(df), 10)
+        self.assertEqual(df['MATERIAL_NAME'].fillna('').tolist(), ['' if i % 3 == 0 else 'DX51D' for i in range(10)])
+        self.assertEqual(df['quantity'].iloc[7], 7)
+
+    def test_empty_input_writes_header(self):
+        pd.DataFrame(columns=['article id', 'material']).to_csv(self.input_path, index=False)
+
+        self.assertEqual(self.extract(5).strip(), ','.join(column_order))
+
+
+if __name__ == '__main__':
+    unittest.main()
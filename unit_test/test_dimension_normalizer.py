@@ -0,0 +1,39 @@
+import os
+import sys
+import random
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.ner_model import preprocess_dimensions, preprocess_dimensions_series
+from supplier_data_standardization.benchmarks import legacy_preprocess_dimensions
+
+
+class TestDimensionNormalizer(unittest.TestCase):
+
+    def test_matches_legacy_chain_on_training_data(self):
+        for text, _ in get_training_data():
+            self.assertEqual(preprocess_dimensions(text), legacy_preprocess_dimensions(text), text)
+
+    def test_matches_legacy_chain_on_random_text(self):
+        rng = random.Random(0)
+        alphabet = list('0123456789' * 3) + list(',,  ** xx mcgkADZ+-/.X\t') + ['mm', 'cm', 'kg']
+        for _ in range(20000):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 20)))
+            self.assertEqual(preprocess_dimensions(text), legacy_preprocess_dimensions(text), repr(text))
+
+    def test_series_variant(self):
+        texts = pd.Series(['9,99 * 1500', None, 'DX51D +Z140 Ma-C 1,00 x 1250,00 mm AFP', '9,99 * 1500'],
+                          index=[3, 5, 7, 9])
+        result = preprocess_dimensions_series(texts)
+
+        self.assertEqual(list(result.index), [3, 5, 7, 9])
+        self.assertEqual(result[3], '9,99x1500')
+        self.assertTrue(pd.isna(result[5]))
+        self.assertEqual(result[7], preprocess_dimensions(texts[7]))
+        self.assertEqual(result[9], result[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import unittest
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.dimensions import parse_dimensions, add_dimension_columns, DimensionIndex
+
+
+class TestDimensions(unittest.TestCase):
+
+    def test_parse_dimensions(self):
+        text = pd.Series([
+            '2.23x1075.0',
+            'DX51D +Z140 Ma-C 1,50 x 1350,00 x 2850,00',
+            'S500MC  Oiled  9,99 * 1500',
+            'HDC 1x1000 HX300LAD+Z 140 MB O',
+            '2ND QUALITY CR SLIT',
+            None,
+        ])
+        result = parse_dimensions(text)
+
+        self.assertEqual(list(result.columns), ['thickness_mm', 'width_mm', 'length_mm'])
+        self.assertEqual(result['thickness_mm'].tolist()[:4], [2.23, 1.5, 9.99, 1.0])
+        self.assertEqual(result['width_mm'].tolist()[:4], [1075.0, 1350.0, 1500.0, 1000.0])
+        self.assertEqual(result['length_mm'][1], 2850.0)
+        self.assertTrue(result['length_mm'][[0, 2, 3]].isna().all())
+        self.assertTrue(result.iloc[4:].isna().all().all())
+
+    def test_add_dimension_columns_after_dimension(self):
+        df = pd.DataFrame({
+            'material': ['C100S', 'DD11 geolied 2,00 x 92,00 mm'],
+            'DIMENSION': ['2.23x1075.0', None],
+            'weight': [6341.0, 1700.0],
+        })
+        result = add_dimension_columns(df)
+
+        self.assertEqual(list(result.columns),
+                         ['material', 'DIMENSION', 'thickness_mm', 'width_mm', 'length_mm', 'weight'])
+        self.assertEqual(result['thickness_mm'].tolist(), [2.23, 2.0])
+        self.assertEqual(result['width_mm'].tolist(), [1075.0, 92.0])
+        self.assertTrue(pd.isna(result['DIMENSION'][1]))  # The strings are kept as they are
+
+    def test_range_query(self):
+        df = pd.DataFrame({
+            'thickness_mm': [2.28, 2.2, np.nan, 2.3, 2.31, 2.25],
+            'width_mm': [1036.0, 1500.0, 1200.0, 999.0, 1100.0, np.nan],
+            'length_mm': [np.nan] * 6,
+        }, index=[10, 11, 12, 13, 14, 15])
+        index = DimensionIndex(df)
+
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.query(thickness_mm=(2.2, 2.3)).tolist(), [11, 15, 10, 13])
+        self.assertEqual(index.query(thickness_mm=(2.2, 2.3), width_mm=(1000, None)).tolist(), [11, 10])
+        self.assertEqual(index.query(width_mm=(None, 1100)).tolist(), [10, 13, 14])
+        self.assertEqual(len(index.query(thickness_mm=(3, 2))), 0)
+        self.assertEqual(index.select(df, thickness_mm=(2.31, None))['width_mm'].tolist(), [1100.0])
+
+        with self.assertRaises(KeyError):
+            index.query(weight=(0, None))
+
+    def test_range_query_matches_scan(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'thickness_mm': rng.uniform(0.3, 10, 5000).round(2),
+            'width_mm': rng.uniform(40, 2000, 5000).round(0),
+            'length_mm': np.nan,
+        })
+        index = DimensionIndex(df)
+
+        expected = df.index[df['thickness_mm'].between(2.2, 2.3) & (df['width_mm'] >= 1000)]
+        result = index.query(thickness_mm=(2.2, 2.3), width_mm=(1000, None))
+        self.assertEqual(sorted(result), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import hashlib
+import tempfile
+import unittest
+import spacy
+from spacy.language import Language
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.entity_cache import EntityCache, clear_entity_cache, model_fingerprint
+from supplier_data_standardization.ner_model import cached_pipe_entities, train_ner_model
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.rules import RuleFastPath
+
+PROCESSED = []
+
+
+@Language.component("record_processed_texts")
+def record_processed_texts(doc):
+    PROCESSED.append(doc.text)
+    return doc
+
+
+class TestEntityCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'entities.sqlite')
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe("record_processed_texts")
+        self.nlp.add_pipe("entity_ruler").add_patterns([{"label": "MATERIAL_NAME", "pattern": "DX51D"}])
+        PROCESSED.clear()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_only_unseen_texts_reach_the_model(self):
+        cache = EntityCache(self.path)
+        texts = ['DX51D 1,50x1350', 'S235JR 2x1500', 'DX51D 1,50x1350']
+
+        records = cached_pipe_entities(self.nlp, texts, cache)
+        self.assertEqual(records, [{'MATERIAL_NAME': 'DX51D'}, {}, {'MATERIAL_NAME': 'DX51D'}])
+        self.assertEqual(PROCESSED, ['DX51D 1,50x1350', 'S235JR 2x1500'])
+
+        records = cached_pipe_entities(self.nlp, texts + ['DX51D 3x1250'], cache)
+        self.assertEqual(records[-1], {'MATERIAL_NAME': 'DX51D'})
+        self.assertEqual(PROCESSED[2:], ['DX51D 3x1250'])
+        cache.close()
+
+        # The on-disk tier survives the process
+        cache = EntityCache(self.path)
+        self.assertEqual(cached_pipe_entities(self.nlp, texts, cache), records[:3])
+        self.assertEqual(len(PROCESSED), 3)
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+        cache.close()
+
+    def test_rule_hits_are_reported_apart_from_model_calls(self):
+        cache = EntityCache(self.path)
+        texts = ['DC01 licht geolied 2,50x1500 mm', 'S550 GD+ZM175 MAC 2x1070']
+        cached_pipe_entities(self.nlp, texts[:1], cache, rules=RuleFastPath())
+
+        with self.assertLogs(level='INFO') as logs:
+            cached_pipe_entities(self.nlp, texts + ['DX51D +Z140 Ma-C 1,50x1350,00x2850,00'], cache,
+                                 rules=RuleFastPath())
+        self.assertIn("Of 3 distinct materials, the entity cache served 1, the rules resolved 1 and 1 went to "
+                      "the model.", '\n'.join(logs.output))
+        self.assertEqual(PROCESSED, ['S550 GD+ZM175 MAC 2x1070'])
+        cache.close()
+
+    def test_fingerprint_follows_in_place_training(self):
+        fingerprints = []
+        nlp = train_ner_model(get_training_data()[:10], profile='fast', max_epochs=2,
+                              output_dir=os.path.join(self.tmp_dir.name, 'model'),
+                              corpus_path=os.path.join(self.tmp_dir.name, 'train.spacy'),
+                              epoch_callback=lambda epoch, nlp, losses: fingerprints.append(model_fingerprint(nlp)))
+
+        self.assertEqual(len(fingerprints), 2)
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+        self.assertEqual(model_fingerprint(nlp), hashlib.sha256(nlp.to_bytes()).hexdigest())
+
+    def test_entries_are_keyed_by_model(self):
+        cache = EntityCache(self.path)
+        other_nlp = spacy.blank("en")
+        other_nlp.add_pipe("entity_ruler").add_patterns([{"label": "COATING_TYPE", "pattern": "DX51D"}])
+
+        self.assertNotEqual(model_fingerprint(self.nlp), model_fingerprint(other_nlp))
+        cached_pipe_entities(self.nlp, ['DX51D'], cache)
+        self.assertEqual(cached_pipe_entities(other_nlp, ['DX51D'], cache), [{'COATING_TYPE': 'DX51D'}])
+        cache.close()
+
+    def test_memory_tier_is_bounded(self):
+        cache = EntityCache(self.path, max_memory_entries=2)
+        cache.put_many('model', {'a': {}, 'b': {}, 'c': {'DIMENSION': '1x2'}})
+
+        self.assertEqual([text for _, text in cache.memory], ['b', 'c'])
+        self.assertEqual(cache.get_many('model', ['a', 'c', 'd']), {'a': {}, 'c': {'DIMENSION': '1x2'}})
+        cache.close()
+
+    def test_clear_entity_cache(self):
+        EntityCache(self.path).close()
+
+        self.assertTrue(clear_entity_cache(self.path))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(clear_entity_cache(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+import spacy
+from spacy.tokens import Span
+from spacy.training.example import Example
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization import evaluate
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.ner_model import make_examples, train_ner_model
+from supplier_data_standardization.evaluate import (build_gold_corpus, evaluate_model, evaluate_models, label_scores,
+                                                    load_gold_corpus)
+
+
+class TestEvaluation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.data = get_training_data()
+        cls.model_path = os.path.join(cls.tmp_dir.name, 'model')
+        cls.nlp = train_ner_model(cls.data[:20], profile='fast', output_dir=cls.model_path, max_epochs=5,
+                                  corpus_path=os.path.join(cls.tmp_dir.name, 'train.spacy'))
+        cls.gold_path = os.path.join(cls.tmp_dir.name, 'gold.jsonl')
+        with open(cls.gold_path, 'w', encoding='utf-8') as file:
+            for text, labels in cls.data[20:]:
+                file.write(json.dumps({'text': text, 'labels': labels}) + '\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_gold_corpus_labels_tokens_in_order(self):
+        doc = list(build_gold_corpus([("DX51D geolied 2x1500", ["MATERIAL_NAME", "COATING_TYPE"])])
+                   .get_docs(spacy.blank("en").vocab))[0]
+
+        self.assertEqual([(ent.text, ent.label_) for ent in doc.ents],
+                         [("DX51D", "MATERIAL_NAME"), ("geolied", "COATING_TYPE")])
+
+    def test_gold_corpus_is_cached(self):
+        cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        corpus = load_gold_corpus(self.gold_path, cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        with mock.patch.object(evaluate, 'build_gold_corpus', side_effect=AssertionError("parsed again")):
+            cached = load_gold_corpus(self.gold_path, cache_dir)
+        self.assertEqual(cached.to_bytes(), corpus.to_bytes())
+
+    def test_gold_corpus_uses_the_model_tokenizer(self):
+        cache_dir = os.path.join(self.tmp_dir.name, 'tokenizer_cache')
+        merging = spacy.blank("en")
+        merging.add_pipe("merge_hyphenated_words", config={"mode": "tokenizer"})
+        data = [("DX51D +Z140 Ma-C 1,50x1350", ["MATERIAL_NAME", "COATING_TYPE", "FINISH_TYPE", "DIMENSION"])]
+
+        doc = list(build_gold_corpus(data, merging).get_docs(merging.vocab))[0]
+        self.assertEqual([(ent.text, ent.label_) for ent in doc.ents],
+                         [("DX51D", "MATERIAL_NAME"), ("+Z140", "COATING_TYPE"), ("Ma-C", "FINISH_TYPE"),
+                          ("1,50x1350", "DIMENSION")])
+
+        # Each tokenizer gets its own cached corpus
+        merged = load_gold_corpus(self.gold_path, cache_dir, merging)
+        blank = load_gold_corpus(self.gold_path, cache_dir, spacy.blank("en"))
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+        self.assertNotEqual(merged.to_bytes(), blank.to_bytes())
+        self.assertEqual(load_gold_corpus(self.gold_path, cache_dir, merging).to_bytes(), merged.to_bytes())
+
+    def test_label_scores(self):
+        nlp = spacy.blank("en")
+        reference = nlp.make_doc("CR 1.5x1487 XE320D")
+        reference.ents = [Span(reference, 0, 1, label="MATERIAL_NAME"), Span(reference, 1, 2, label="DIMENSION"),
+                          Span(reference, 2, 3, label="MATERIAL_GRADE")]
+        predicted = nlp.make_doc("CR 1.5x1487 XE320D")
+        predicted.ents = [Span(predicted, 0, 1, label="MATERIAL_NAME"), Span(predicted, 1, 2, label="MATERIAL_GRADE")]
+
+        scores = label_scores([Example(predicted, reference)]).set_index('label')
+
+        self.assertEqual(scores.loc['MATERIAL_NAME', ['precision', 'recall', 'f1', 'support']].tolist(), [1, 1, 1, 1])
+        self.assertEqual(scores.loc['DIMENSION', ['recall', 'support']].tolist(), [0, 1])
+        self.assertEqual(scores.loc['MATERIAL_GRADE', 'precision'], 0)
+        self.assertAlmostEqual(scores.loc['ALL', 'precision'], 0.5)
+        self.assertAlmostEqual(scores.loc['ALL', 'recall'], 1 / 3)
+        self.assertEqual(scores.loc['ALL', 'support'], 3)
+
+    def test_evaluate_model_matches_spacy_scores(self):
+        corpus = load_gold_corpus(self.gold_path, os.path.join(self.tmp_dir.name, 'cache'), self.nlp)
+        result = evaluate_model(self.nlp, corpus, batch_size=4, timed_docs=50, repeat=1, latency_docs=20)
+
+        expected = self.nlp.evaluate(make_examples(self.nlp, self.data[20:]))
+        self.assertAlmostEqual(result['labels']['f1'].iloc[-1], expected['ents_f'] or 0.0)
+        self.assertEqual(result['docs'], len(self.data[20:]))
+        self.assertGreater(result['tokens_per_sec'], result['docs_per_sec'])
+        self.assertLessEqual(result['p50_latency_ms'], result['p95_latency_ms'])
+
+    def test_evaluate_models(self):
+        report = evaluate_models([self.model_path, self.model_path], gold_path=self.gold_path, timed_docs=20,
+                                 repeat=1, latency_docs=10, cache_dir=os.path.join(self.tmp_dir.name, 'cache'))
+
+        self.assertEqual(report['model'].value_counts()[self.model_path], 2 * report['label'].nunique())
+        self.assertIn('MATERIAL_NAME', set(report['label']))
+        self.assertTrue({'precision', 'recall', 'f1', 'docs_per_sec', 'tokens_per_sec',
+                         'p95_latency_ms'} <= set(report.columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
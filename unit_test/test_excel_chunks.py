@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.utils import iter_excel_chunks, drop_repeated_headers
+
+
+class TestExcelChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'stock.xlsx')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_workbook(self, rows, sheet_name='Sheet1'):
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.title = sheet_name
+        for row in rows:
+            worksheet.append(row)
+        workbook.save(self.file_path)
+
+    def test_chunks_match_read_excel(self):
+        rows = [['Grade', 'Weight', 'Note']] + [[f'DX{i}', i * 10, None if i % 2 else 'x'] for i in range(7)]
+        self.write_workbook(rows)
+
+        chunks = list(iter_excel_chunks(self.file_path, chunk_size=3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        pd.testing.assert_frame_equal(pd.concat(chunks), pd.read_excel(self.file_path), check_dtype=False)
+
+    def test_drop_repeated_headers_ignores_stray_whitespace(self):
+        df = pd.DataFrame({'Article ID': ['A1', 'Slit coils', ' article ID  ', 'A2', 'A3']})
+
+        result = drop_repeated_headers(df, 'Article ID')
+        self.assertEqual(result['Article ID'].tolist(), ['A1', 'A2', 'A3'])
+
+        # A header opening the next chunk drops the last row of this one
+        result = drop_repeated_headers(df, 'Article ID', next_df=pd.DataFrame({'Article ID': ['Article ID']}))
+        self.assertEqual(result['Article ID'].tolist(), ['A1', 'A2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.ner_model import train_ner_model
+from supplier_data_standardization.incremental import bump_version, fine_tune_ner_model, read_labeled_rows
+
+
+class TestIncrementalTraining(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.data = get_training_data()
+        cls.model_path = os.path.join(cls.tmp_dir.name, 'model')
+        train_ner_model(cls.data[:20], profile='fast', output_dir=cls.model_path, max_epochs=20,
+                        corpus_path=os.path.join(cls.tmp_dir.name, 'train.spacy'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_bump_version(self):
+        self.assertEqual(bump_version('0.0.3'), '0.0.4')
+        self.assertEqual(bump_version('1.2.9'), '1.2.10')
+
+    def test_read_labeled_rows(self):
+        path = os.path.join(self.tmp_dir.name, 'new.jsonl')
+        with open(path, 'w', encoding='utf-8') as file:
+            for text, labels in self.data[20:23]:
+                file.write(json.dumps({'text': text, 'labels': labels}) + '\n')
+            file.write('\n')
+
+        self.assertEqual(read_labeled_rows(path), [(text, list(labels)) for text, labels in self.data[20:23]])
+
+    def test_fine_tuned_model_is_saved_as_new_version(self):
+        output_dir = os.path.join(self.tmp_dir.name, 'fine_tuned')
+        report = fine_tune_ner_model(self.data[20:], old_data=self.data[:16], dev_data=self.data[16:20],
+                                     model_path=self.model_path, output_dir=output_dir, epochs=0)
+
+        self.assertTrue(report['saved'])
+        self.assertEqual(report['fine_tuned_f1'], report['baseline_f1'])
+        self.assertEqual(report['new_examples'], len(self.data[20:]))
+        self.assertEqual(report['rehearsed_examples'], min(16, 2 * len(self.data[20:])))
+        with open(os.path.join(output_dir, 'meta.json')) as meta:
+            self.assertEqual(json.load(meta)['version'], report['version'])
+        self.assertEqual(report['version'], '0.0.1')
+
+    def test_regression_is_not_saved(self):
+        output_dir = os.path.join(self.tmp_dir.name, 'regressed')
+        mislabeled = [(text, ['COATING_TYPE'] * len(labels)) for text, labels in self.data[20:]]
+        with self.assertLogs(level='WARNING'):
+            report = fine_tune_ner_model(mislabeled, old_data=self.data[:16], dev_data=self.data[:20],
+                                         model_path=self.model_path, output_dir=output_dir, epochs=5,
+                                         rehearsal_ratio=0)
+
+        self.assertFalse(report['saved'])
+        self.assertLess(report['fine_tuned_f1'], report['baseline_f1'])
+        self.assertFalse(os.path.exists(output_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
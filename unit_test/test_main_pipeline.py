@@ -0,0 +1,74 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization import main as pipeline
+from supplier_data_standardization.main import main, process_source
+from supplier_data_standardization.cache import IngestionCache
+from supplier_data_standardization.storage import read_parquet_dataset
+
+# The supplier workbooks the pipeline reads
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+
+class TestMainPipeline(unittest.TestCase):
+
+    def setUp(self):
+        # main() reads and writes the 'data' directory next to the working directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp_dir.name, 'data')
+        os.makedirs(self.data_dir)
+        for name in ('source1.xlsx', 'source2.xlsx', 'source3.xlsx'):
+            shutil.copy(os.path.join(DATA_DIR, name), self.data_dir)
+        work_dir = os.path.join(self.tmp_dir.name, 'work')
+        os.makedirs(work_dir)
+        self.cwd = os.getcwd()
+        os.chdir(work_dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def run_main(self, **kwargs):
+        main(**kwargs)
+        with open(os.path.join(self.data_dir, 'final_combined_output.csv'), encoding='utf-8') as file:
+            return file.read()
+
+    def test_streamed_output_matches_in_memory_output(self):
+        expected = self.run_main()
+
+        for workers in (None, 3):
+            self.assertEqual(self.run_main(chunk_size=4, workers=workers), expected)
+            self.assertEqual([name for name in os.listdir(self.data_dir) if name.endswith('.part')], [])
+
+        self.run_main(chunk_size=4, write_parquet=True)
+        dataset = read_parquet_dataset(os.path.join(self.data_dir, 'final_combined_output.parquet'))
+        self.assertEqual(len(dataset), len(pd.read_csv(os.path.join(self.data_dir, 'final_combined_output.csv'))))
+    def test_workers_reach_the_source2_sheets(self):
+        expected = self.run_main()
+
+        self.assertEqual(self.run_main(workers=2), expected)
+
+        # Serially, so the call can be observed in this process
+        with mock.patch.object(pipeline, 'process_source2', wraps=pipeline.process_source2) as process_source2:
+            with mock.patch.object(pipeline, 'run_source_processors',
+                                   side_effect=lambda processors, workers: [run() for _, run in processors]):
+                self.assertEqual(self.run_main(workers=2), expected)
+        self.assertEqual(process_source2.call_args.kwargs['workers'], 2)
+
+    def test_cache_write_failure_keeps_the_source(self):
+        cache = IngestionCache(os.path.join(self.tmp_dir.name, 'cache'))
+        with mock.patch.object(IngestionCache, 'put', side_effect=OSError("disk full")):
+            df = process_source('source1', cache=cache)
+
+        pd.testing.assert_frame_equal(df, process_source('source1'))
+        self.assertGreater(len(df), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import unittest
+import spacy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.ner_model import preprocess_dimensions
+from supplier_data_standardization.utils import get_training_data
+
+
+class TestMergeComponent(unittest.TestCase):
+
+    def build(self, mode):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("merge_hyphenated_words", config={"mode": mode})
+        return nlp
+
+    def test_patterns_are_merged(self):
+        for mode in ('matcher', 'tokenizer'):
+            doc = self.build(mode)("DX51D +Z140 Ma-C 1,50x1350,00x2850,00 a/b G6/6")
+            self.assertEqual([token.text for token in doc],
+                             ['DX51D', '+Z140', 'Ma-C', '1,50x1350,00x2850,00', 'a/', 'b', 'G6/6'], mode)
+
+    def test_modes_agree_on_training_data(self):
+        texts = [preprocess_dimensions(text) for text, _ in get_training_data()]
+        matcher_tokens = [[token.text for token in doc] for doc in self.build('matcher').pipe(texts)]
+        tokenizer_tokens = [[token.text for token in doc] for doc in self.build('tokenizer').pipe(texts)]
+        self.assertEqual(matcher_tokens, tokenizer_tokens)
+
+    def test_tokenizer_rules_are_saved(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.build('tokenizer').to_disk(tmp_dir)
+            nlp = spacy.load(tmp_dir)
+
+        self.assertEqual([token.text for token in nlp.make_doc("+Z140 Ma-C")], ['+Z140', 'Ma-C'])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.build('regex')
+
+
+if __name__ == '__main__':
+    unittest.main()
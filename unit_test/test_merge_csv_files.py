@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.main import merge_csv_files
+
+
+class TestMergeCsvFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = self.tmp_dir.name
+        self.write_csv('supplier_a.csv', 'article id,material,weight,quantity\n2304/52068,DX51D,2222,48\n')
+        self.write_csv('supplier_b.csv', 'material,weight,MATERIAL_GRADE,article id\nS235JR,1700.5,2nd,11006841\n'
+                                         'DX51D,2222,,2304/52068\n')
+        self.write_csv('final_combined_output.csv', 'material,weight\nDX51D,2222\n')
+        self.write_csv('final_combined_output_with_entities.csv', 'material,weight\nDX51D,2222\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_csv(self, name, content):
+        with open(os.path.join(self.data_folder, name), 'w') as file:
+            file.write(content)
+
+    def test_outputs_are_skipped_and_schemas_unified(self):
+        result = merge_csv_files(self.data_folder, workers=2)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(list(result.columns), ['article id', 'material', 'weight', 'quantity', 'MATERIAL_GRADE'])
+        self.assertEqual(result['article id'].tolist(), ['2304/52068', '11006841', '2304/52068'])
+        self.assertEqual(str(result['weight'].dtype), 'float64')
+        self.assertEqual(str(result['quantity'].dtype), 'Int64')
+        self.assertIsInstance(result['MATERIAL_GRADE'].dtype, pd.CategoricalDtype)
+
+    def test_include_exclude_and_dedup(self):
+        result = merge_csv_files(self.data_folder, include=['supplier_*.csv'], exclude=['*_b.csv'])
+        self.assertEqual(result['material'].tolist(), ['DX51D'])
+
+        result = merge_csv_files(self.data_folder, dedup_key=['article id'])
+        self.assertEqual(result['article id'].tolist(), ['2304/52068', '11006841'])
+
+    def test_no_files(self):
+        result = merge_csv_files(self.data_folder, include=['*.tsv'])
+        self.assertTrue(result.empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
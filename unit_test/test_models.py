@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import unittest
+import spacy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.models import load_model, get_model, clear_models, MODELS
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'ner_model')
+        self.save_model()
+
+    def tearDown(self):
+        clear_models()
+        self.tmp_dir.cleanup()
+
+    def save_model(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("merge_hyphenated_words")
+        nlp.add_pipe("sentencizer")
+        nlp.to_disk(self.path)
+
+    def test_model_is_loaded_once(self):
+        nlp = load_model(self.path)
+
+        self.assertIs(load_model(self.path), nlp)
+        self.assertIs(get_model(path=self.path), nlp)
+        self.assertEqual(nlp.pipe_names, ['merge_hyphenated_words', 'sentencizer'])
+
+    def test_disabled_components(self):
+        nlp = load_model(self.path, disable=['sentencizer'])
+
+        self.assertEqual(nlp.pipe_names, ['merge_hyphenated_words'])
+        self.assertIsNot(load_model(self.path), nlp)
+        self.assertIs(load_model(self.path, disable=('sentencizer',)), nlp)
+
+    def test_saved_model_is_reloaded(self):
+        nlp = load_model(self.path)
+        meta_path = os.path.join(self.path, 'meta.json')
+        self.save_model()
+        os.utime(meta_path, ns=(os.stat(meta_path).st_mtime_ns + 10 ** 9,) * 2)
+
+        self.assertIsNot(load_model(self.path), nlp)
+        self.assertEqual(len(MODELS), 1)  # The old version is dropped
+
+    def test_passed_model_is_used(self):
+        nlp = spacy.blank("en")
+        self.assertIs(get_model(nlp, path=self.path), nlp)
+        self.assertEqual(len(MODELS), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
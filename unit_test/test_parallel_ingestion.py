@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+import unittest
+from functools import partial
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.main import run_source_processors
+
+
+def make_source(name, delay=0.0):
+    time.sleep(delay)
+    return pd.DataFrame({'source': [name, name]})
+
+
+class TestRunSourceProcessors(unittest.TestCase):
+
+    def setUp(self):
+        # The first source finishes last, so out-of-order completion would show up in the results
+        self.processors = [
+            ('slow', partial(make_source, 'slow', delay=0.3)),
+            ('medium', partial(make_source, 'medium', delay=0.1)),
+            ('fast', partial(make_source, 'fast')),
+        ]
+
+    def test_serial_run(self):
+        results = run_source_processors(self.processors, workers=1)
+        self.assertEqual([df['source'][0] for df in results], ['slow', 'medium', 'fast'])
+
+    def test_parallel_run_keeps_source_order(self):
+        serial = run_source_processors(self.processors)
+        parallel = run_source_processors(self.processors, workers=3)
+
+        self.assertEqual(len(parallel), 3)
+        for expected, result in zip(serial, parallel):
+            pd.testing.assert_frame_equal(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
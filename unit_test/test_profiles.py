@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import unittest
+import spacy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.ner_model import NER_PROFILES, ner_model_config
+from supplier_data_standardization.profiles import compare_profiles, make_examples, split_training_data
+
+
+class TestTrainingProfiles(unittest.TestCase):
+
+    def test_default_profile_is_the_spacy_model(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("ner", config={"model": ner_model_config('default')})
+        default_nlp = spacy.blank("en")
+        default_nlp.add_pipe("ner")
+
+        self.assertEqual(nlp.config['components']['ner'], default_nlp.config['components']['ner'])
+
+    def test_profile_sizes(self):
+        tok2vec = ner_model_config('fast')['tok2vec']
+        self.assertEqual((tok2vec['width'], tok2vec['depth'], tok2vec['embed_size']), (32, 1, 500))
+        self.assertLess(NER_PROFILES['fast']['width'], NER_PROFILES['accurate']['width'])
+        with self.assertRaises(ValueError):
+            ner_model_config('tiny')
+
+    def test_split_is_deterministic_and_disjoint(self):
+        data = get_training_data()
+        train, dev = split_training_data(data, dev_fraction=0.2, seed=3)
+
+        self.assertEqual((len(train), len(dev)), (24, 6))
+        self.assertEqual(sorted(map(str, train + dev)), sorted(map(str, data)))
+        self.assertEqual(split_training_data(data, dev_fraction=0.2, seed=3), (train, dev))
+
+    def test_make_examples_labels_tokens_in_order(self):
+        example = make_examples(spacy.blank("en"), [("DX51D geolied 2x1500", ["MATERIAL_NAME", "COATING_TYPE"])])[0]
+
+        self.assertEqual([(ent.text, ent.label_) for ent in example.reference.ents],
+                         [("DX51D", "MATERIAL_NAME"), ("geolied", "COATING_TYPE")])
+
+    def test_compare_profiles_report(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Training writes its DocBin to the working directory
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            try:
+                report = compare_profiles(['fast'], train_data=get_training_data()[:12], output_dir=tmp_dir)
+            finally:
+                os.chdir(cwd)
+
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'fast', 'meta.json')))
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, 'report.csv')))
+        self.assertEqual(report['profile'].tolist(), ['fast'])
+        for column in ('ents_f', 'MATERIAL_NAME_f', 'docs_per_sec', 'size_mb'):
+            self.assertIn(column, report)
+        self.assertGreater(report['docs_per_sec'][0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
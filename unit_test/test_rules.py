@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+import spacy
+from spacy.language import Language
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.rules import RuleFastPath
+from supplier_data_standardization.ner_model import pipe_entities
+
+PROCESSED = []
+
+
+@Language.component("record_rule_leftovers")
+def record_rule_leftovers(doc):
+    PROCESSED.append(doc.text)
+    return doc
+
+
+class TestRuleFastPath(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleFastPath()
+        PROCESSED.clear()
+
+    def test_resolves_fully_covered_descriptions(self):
+        self.assertEqual(self.rules.resolve('DX51D +Z140 Ma-C 1,50x1350,00x2850,00'),
+                         {'MATERIAL_NAME': 'DX51D', 'COATING_TYPE': '+Z140', 'FINISH_TYPE': 'Ma-C',
+                          'DIMENSION': '1,50x1350,00x2850,00'})
+        self.assertEqual(self.rules.resolve('DC01 licht geolied 2,50x1500 mm'),
+                         {'MATERIAL_NAME': 'DC01', 'COATING_TYPE': 'licht geolied', 'DIMENSION': '2,50x1500'})
+        self.assertEqual(self.rules.resolve('DX51D +AZ150  Ma-C 1,00x1250,00mm AFP')['DIMENSION'], '1,00x1250,00')
+
+    def test_leaves_uncertain_descriptions_to_the_model(self):
+        for text in ('S550 GD+ZM175 MAC 2x1070', 'DY51D +Z15 Va-C 1,00x1250,00', 'mm DX51D', '', '   '):
+            self.assertIsNone(self.rules.resolve(text), text)
+
+    def test_hit_rate(self):
+        self.rules.resolve_all(['DX51D 1,50x1350', 'CR3 1,5x1250,00', 'S235JR geolied 2x1500', 'HRP'])
+
+        self.assertEqual(self.rules.report(), {'resolved': 3, 'total': 4, 'hit_rate': 0.75})
+
+    def test_only_unresolved_texts_reach_the_model(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("record_rule_leftovers")
+        nlp.add_pipe("entity_ruler").add_patterns([{"label": "MATERIAL_NAME", "pattern": "CR3"}])
+        texts = ['DX51D 1,50x1350', 'CR3 1,5x1250', 'S235JR 2x1500', 'CR3']
+        PROCESSED.clear()
+
+        records = pipe_entities(nlp, texts, rules=self.rules)
+        self.assertEqual(records, [{'MATERIAL_NAME': 'DX51D', 'DIMENSION': '1,50x1350'},
+                                   {'MATERIAL_NAME': 'CR3'},
+                                   {'MATERIAL_NAME': 'S235JR', 'DIMENSION': '2x1500'},
+                                   {'MATERIAL_NAME': 'CR3'}])
+        self.assertEqual(PROCESSED, ['CR3 1,5x1250', 'CR3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
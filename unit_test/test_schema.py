@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.schema import apply_canonical_schema
+from supplier_data_standardization.utils import validate_numeric_column, validate_quantity_column
+
+
+class TestCanonicalSchema(unittest.TestCase):
+
+    def test_validate_numeric_column_reports_coerced_rows(self):
+        df = pd.DataFrame({'quantity': [1, '2', ' ', 'n/a', 2.5, None]})
+        result, coerced = validate_numeric_column(df, 'quantity', 'Int64')
+
+        self.assertEqual(str(result['quantity'].dtype), 'Int64')
+        self.assertEqual(result['quantity'].tolist()[:2], [1, 2])
+        self.assertTrue(result['quantity'][2:].isna().all())
+        self.assertEqual(coerced.tolist(), [False, False, True, True, True, False])
+
+    def test_validate_quantity_column(self):
+        df = pd.DataFrame({'quantity': ['48', 'abc']})
+        result = validate_quantity_column(df)
+
+        self.assertEqual(str(result['quantity'].dtype), 'Int64')
+        self.assertTrue(pd.isna(result['quantity'][1]))
+        self.assertEqual(df['quantity'].tolist(), ['48', 'abc'])  # The input is not modified
+
+    def test_apply_canonical_schema(self):
+        df = pd.DataFrame({
+            'MATERIAL_GRADE': ['2nd', '2nd', None],
+            'MATERIAL_NAME': ['C100S', 'DX51D', 'C100S'],
+            'article id': ['2304/52068', 11006841, None],
+            'weight': [6341, '12530', 'heavy'],
+            'quantity': [1, None, 3],
+            'supplier note': ['a', 'b', 'c'],
+        })
+        result = apply_canonical_schema(df)
+
+        self.assertIsInstance(result['MATERIAL_GRADE'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(result['MATERIAL_NAME'].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(result['article id'].dtype), 'string')
+        self.assertEqual(result['article id'][1], '11006841')
+        self.assertEqual(str(result['weight'].dtype), 'float64')
+        self.assertTrue(pd.isna(result['weight'][2]))
+        self.assertEqual(str(result['quantity'].dtype), 'Int64')
+        self.assertEqual(result['supplier note'].dtype, object)
+
+
+if __name__ == '__main__':
+    unittest.main()
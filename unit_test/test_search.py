@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.search import SEARCH_SPACE, sample_candidates, search_hyperparameters
+
+
+class TestHyperparameterSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = os.path.join(self.tmp_dir.name, 'ner_model')
+        self.candidates = [
+            {'name': 'small', 'seed': 1, 'profile': 'fast', 'dropout': 0.2, 'batch_sizes': (4.0, 8.0, 1.001),
+             'max_epochs': 6, 'patience': 3},
+            {'name': 'larger', 'seed': 2, 'profile': 'fast', 'dropout': 0.1, 'batch_sizes': (2.0, 4.0, 1.001),
+             'max_epochs': 6, 'patience': 3},
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sample_candidates(self):
+        candidates = sample_candidates(5, seed=7)
+
+        self.assertEqual(len(candidates), 5)
+        self.assertEqual(len({str(sorted(candidate.items())) for candidate in candidates}), 5)
+        self.assertEqual(len({candidate['seed'] for candidate in candidates}), 5)
+        self.assertEqual(candidates, sample_candidates(5, seed=7))
+        for candidate in candidates:
+            for setting, values in SEARCH_SPACE.items():
+                self.assertIn(candidate[setting], values)
+
+    def check_search(self, workers):
+        leaderboard = search_hyperparameters(self.candidates, train_data=get_training_data()[:15],
+                                             output_dir=os.path.join(self.tmp_dir.name, 'search'),
+                                             workers=workers, model_dir=self.model_dir)
+
+        self.assertEqual(sorted(leaderboard['name']), ['larger', 'small'])
+        self.assertTrue(leaderboard['dev_f1'].is_monotonic_decreasing)
+        self.assertTrue((leaderboard['epochs'] > 0).all())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, 'search', 'leaderboard.csv')))
+
+        # The winner is deployed
+        winner = leaderboard.iloc[0]
+        with open(os.path.join(self.model_dir, 'meta.json')) as deployed, \
+                open(os.path.join(winner['model_path'], 'meta.json')) as trained:
+            self.assertEqual(json.load(deployed), json.load(trained))
+
+    def test_serial_search(self):
+        self.check_search(workers=None)
+
+    def test_parallel_search(self):
+        self.check_search(workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
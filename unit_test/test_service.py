@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import socket
+import tempfile
+import threading
+import unittest
+import http.client
+import spacy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.service import MicroBatcher, create_server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, socket_path):
+        super().__init__('localhost')
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class TestExtractionService(unittest.TestCase):
+
+    def setUp(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "MATERIAL_NAME", "pattern": "DX51D"},
+            {"label": "DIMENSION", "pattern": [{"TEXT": {"REGEX": r"^\d+(,\d+)?x\d+(,\d+)?$"}}]},
+        ])
+        self.batcher = MicroBatcher(nlp, max_batch_size=16, max_wait_ms=200)
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_concurrent_requests_share_micro_batches(self):
+        results = {}
+
+        def request(width):
+            results[width] = self.batcher.extract([f"DX51D 1,50 x {width}"])
+
+        threads = [threading.Thread(target=request, args=(width,)) for width in range(1000, 1008)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for width, records in results.items():
+            self.assertEqual(records, [{'MATERIAL_NAME': 'DX51D', 'DIMENSION': f'1,50x{width}'}])
+        stats = self.batcher.stats()
+        self.assertEqual(stats['requests'], 8)
+        self.assertLess(stats['batches'], 8)
+        self.assertEqual(sum(int(size) * count for size, count in stats['batch_sizes'].items()), 8)
+        self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+
+    def test_batches_are_bounded(self):
+        records = self.batcher.extract([f"DX51D {i}x{i}" for i in range(40)])
+
+        self.assertEqual(len(records), 40)
+        self.assertEqual(self.batcher.stats()['batch_sizes'], {'40': 1})
+
+    def check_endpoints(self, connect):
+        connection = connect()
+        connection.request('POST', '/extract', json.dumps({'text': 'DX51D 2 x 1500'}))
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(response.read()), {'entities': {'MATERIAL_NAME': 'DX51D', 'DIMENSION': '2x1500'}})
+
+        connection.request('POST', '/extract', json.dumps({'texts': ['DX51D', 'S235JR']}))
+        self.assertEqual(json.loads(connection.getresponse().read()), {'entities': [{'MATERIAL_NAME': 'DX51D'}, {}]})
+
+        connection.request('POST', '/extract', json.dumps({'texts': 'DX51D'}))
+        response = connection.getresponse()
+        response.read()
+        self.assertEqual(response.status, 400)
+
+        connection.request('GET', '/stats')
+        self.assertEqual(json.loads(connection.getresponse().read())['requests'], 2)
+        connection.close()
+
+    def serve(self, server):
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+    def test_http_endpoints(self):
+        server = create_server(self.batcher, port=0)
+        self.serve(server)
+
+        self.check_endpoints(lambda: http.client.HTTPConnection('127.0.0.1', server.server_address[1]))
+
+    def test_unix_socket_endpoints(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        socket_path = os.path.join(tmp_dir.name, 'ner.sock')
+        server = create_server(self.batcher, socket_path=socket_path)
+        self.serve(server)
+
+        self.check_endpoints(lambda: UnixHTTPConnection(socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import random
+import tempfile
+import unittest
+from unittest import mock
+import spacy
+from spacy.training.example import Example
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.utils import get_training_data
+from supplier_data_standardization.ner_model import length_bucketed_batches, train_ner_model
+
+
+class TestTraining(unittest.TestCase):
+
+    def test_batches_are_length_buckets(self):
+        nlp = spacy.blank("en")
+        examples = [Example(nlp.make_doc(text), nlp.make_doc(text)) for text, _ in get_training_data() * 3]
+        random.seed(1)
+        batches = length_bucketed_batches(examples)
+
+        self.assertEqual(sorted(map(id, sum(batches, []))), sorted(map(id, examples)))
+        lengths = [[len(example.predicted) for example in batch] for batch in batches]
+        ordered = sum(sorted(lengths), [])
+        self.assertEqual(ordered, sorted(ordered))
+
+    def test_one_update_per_minibatch(self):
+        data = get_training_data()[:8]
+        original_update = spacy.Language.update
+        batches = []
+
+        def update(nlp, examples, **kwargs):
+            batches.append([example.reference.text for example in examples])
+            return original_update(nlp, examples, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)
+            try:
+                with mock.patch.object(spacy.Language, 'update', autospec=True, side_effect=update):
+                    nlp = train_ner_model(list(data), profile='fast', output_dir=os.path.join(tmp_dir, 'model'))
+            finally:
+                os.chdir(cwd)
+
+        self.assertIsNotNone(nlp)
+        texts = sorted(text for text, _ in data)
+        epochs, batch = [], []
+        for batch_texts in batches:
+            self.assertEqual(len(batch_texts), len(set(batch_texts)))
+            batch += batch_texts
+            if len(batch) == len(texts):
+                epochs.append(sorted(batch))
+                batch = []
+        self.assertEqual(batch, [])
+        self.assertTrue(all(epoch == texts for epoch in epochs))
+
+
+if __name__ == '__main__':
+    unittest.main()
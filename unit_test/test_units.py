@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from supplier_data_standardization.units import convert_units, convert_weight_to_kg, WEIGHT_UNITS_TO_KG, \
+    LENGTH_UNITS_TO_MM
+
+
+class TestUnitConversion(unittest.TestCase):
+
+    def test_convert_weight_to_kg(self):
+        df = pd.DataFrame({
+            'weight': [1000, 1000000, 2.20462, 1, 2, 5],
+            'Unit': ['g', 'MG', 'lbs', 'KG', 't', 'EA']
+        })
+        weights, error_mask = convert_weight_to_kg(df)
+
+        expected = pd.Series([1.0, 1.0, 1.0, 1.0, 2000.0, 0.0])
+        pd.testing.assert_series_equal(weights, expected, check_names=False, atol=1e-4)
+        self.assertFalse(error_mask.any())
+
+    def test_unknown_units_are_masked(self):
+        df = pd.DataFrame({'weight': [1, 2, 3], 'Unit': ['kg', 'unknown', None]})
+        weights, error_mask = convert_weight_to_kg(df)
+
+        self.assertEqual(error_mask.tolist(), [False, True, True])
+        self.assertEqual(weights[0], 1.0)
+        self.assertTrue(weights[error_mask].isna().all())
+
+    def test_convert_length_units(self):
+        values = pd.Series([1, 1, 1, 1])
+        units = pd.Series(['mm', 'cm', ' m ', 'inch'])
+        lengths, error_mask = convert_units(values, units, LENGTH_UNITS_TO_MM)
+
+        self.assertEqual(lengths.tolist(), [1.0, 10.0, 1000.0, 25.4])
+        self.assertFalse(error_mask.any())
+
+    def test_weight_table_covers_supplier_units(self):
+        for unit in ['g', 'mg', 'lbs', 'kg', 't', 'ea']:
+            self.assertIn(unit, WEIGHT_UNITS_TO_KG)
+
+
+if __name__ == '__main__':
+    unittest.main()